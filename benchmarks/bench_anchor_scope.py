@@ -0,0 +1,100 @@
+"""Benchmark: inferring plan schemas without id-based outer references.
+
+Builds, in place, wide plans (a balanced tree of cross joins over 64 and 512
+filtered tables) and deep plans (a chain of 100 and 1000 filters), each filter
+testing a conjunction of eight comparisons. Times ``infer_plan_schema`` on each
+plan as is, and with a projection on top holding one ``rel_reference``, which
+makes inference index every ``rel_anchor`` in the plan (the whole-plan walk,
+including the expressions searched for subqueries). Without a reference the
+index is never built.
+
+Run from a development install with ``python benchmarks/bench_anchor_scope.py``.
+"""
+
+import time
+
+import substrait.plan_pb2 as stp
+import substrait.type_pb2 as stt
+
+from substrait.type_inference import infer_plan_schema
+
+BOOLEAN = stt.Type(bool=stt.Type.Boolean(nullability=stt.Type.NULLABILITY_NULLABLE))
+
+
+def _condition(expression):
+    # (c0 = 0) and (c0 = 1) and ... as left-nested scalar functions.
+    for i in range(8):
+        function = expression.scalar_function
+        function.output_type.CopyFrom(BOOLEAN)
+        comparison = function.arguments.add().value.scalar_function
+        comparison.output_type.CopyFrom(BOOLEAN)
+        field = comparison.arguments.add().value.selection
+        field.root_reference.SetInParent()
+        field.direct_reference.struct_field.field = 0
+        comparison.arguments.add().value.literal.i64 = i
+        expression = function.arguments.add().value
+    expression.literal.boolean = True
+
+
+def _table(rel, depth=1):
+    for _ in range(depth):
+        _condition(rel.filter.condition)
+        rel = rel.filter.input
+    rel.read.named_table.names.append("table")
+    rel.read.base_schema.names.append("c0")
+    rel.read.base_schema.struct.types.add().i64.nullability = (
+        stt.Type.NULLABILITY_REQUIRED
+    )
+
+
+def _wide(rel, leaves):
+    if leaves == 1:
+        _table(rel)
+    else:
+        _wide(rel.cross.left, leaves // 2)
+        _wide(rel.cross.right, leaves // 2)
+
+
+def _plan(build, correlated):
+    plan = stp.Plan()
+    root = plan.relations.add().root
+    rel = root.input
+    if correlated:
+        project = rel.project
+        reference = project.expressions.add().selection
+        reference.outer_reference.rel_reference = 1
+        reference.direct_reference.struct_field.field = 0
+        rel = project.input
+    build(rel)
+    if correlated:
+        getattr(rel, rel.WhichOneof("rel_type")).common.rel_anchor = 1
+    return plan
+
+
+def _measure(plan, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        infer_plan_schema(plan)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    shapes = (
+        ("wide,   64 tables", lambda rel: _wide(rel, 64)),
+        ("wide,  512 tables", lambda rel: _wide(rel, 512)),
+        ("deep,  100 filters", lambda rel: _table(rel, 100)),
+        ("deep, 1000 filters", lambda rel: _table(rel, 1000)),
+    )
+    for label, build in shapes:
+        plain = _measure(_plan(build, correlated=False))
+        correlated = _measure(_plan(build, correlated=True))
+        print(
+            f"{label}: no reference {plain * 1e3:7.2f} ms   "
+            f"one rel_reference {correlated * 1e3:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark: ``covers`` and ``types_equal`` throughput.
+
+Checks concrete argument types against parsed signature elements of the kinds
+that dominate the bundled extensions: scalar types (matching and not),
+parameterized types, type variables and nested types. Also times uncached
+resolution of ``add``, which calls ``covers`` for each candidate overload.
+
+Run from a development install with ``python benchmarks/bench_covers.py``.
+"""
+
+import timeit
+
+from substrait.builders.type import decimal, i8, i32, string
+from substrait.builders.type import list as list_
+from substrait.derivation_expression import parse
+from substrait.extension_registry import ExtensionRegistry, covers, types_equal
+
+CASES = [
+    ("scalar match", i32(nullable=False), "i32"),
+    ("scalar mismatch", string(nullable=True), "i64"),
+    ("nullable scalar", i8(nullable=True), "i8?"),
+    ("decimal", decimal(2, 10, nullable=False), "decimal<P1, S1>"),
+    ("type variable", string(nullable=False), "any1"),
+    ("list", list_(i32(nullable=False), nullable=False), "list<i32>"),
+]
+
+
+def _rate(fn, number: int = 20_000) -> float:
+    return number / min(timeit.repeat(fn, number=number, repeat=5))
+
+
+def main() -> None:
+    for label, covered, signature in CASES:
+        covering = parse(signature)
+        rate = _rate(lambda: covers(covered, covering, {}, True))
+        print(f"covers {label:16} {rate / 1e3:9.0f} k/s")
+    a, b = i32(nullable=False), i32(nullable=True)
+    print(f"types_equal            {_rate(lambda: types_equal(a, b)) / 1e3:9.0f} k/s")
+    registry = ExtensionRegistry(resolution_cache_size=0)
+    signature = [i32(nullable=True), i32(nullable=False)]
+    rate = _rate(lambda: registry.find_function("add", signature), number=2_000)
+    print(f"resolve add (uncached) {rate / 1e3:9.1f} k/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark: inferring, walking and printing very deep plans and expressions.
+
+Builds, in place, a chain of alternating filters and fetches over one table, a
+filter whose condition is a left-deep ``and`` chain, and a ladder of ``CASE WHEN
+flag THEN <previous> ELSE 0 END``, at depths 100, 400, 10000 and 100000. Times
+``infer_plan_schema``, a full ``iter_plan_rels`` walk and ``PlanPrinter`` (with
+no indentation, so the output stays linear in the depth) on the plans, and
+``infer_expression_type`` on the ladder. Runs at the default recursion limit
+and reports ``RecursionError`` where a recursive implementation gives up; run
+it against an older checkout to compare.
+
+Run from a development install with ``python benchmarks/bench_deep_traversal.py``.
+"""
+
+import time
+
+import substrait.algebra_pb2 as stalg
+import substrait.plan_pb2 as stp
+import substrait.type_pb2 as stt
+
+from substrait.type_inference import infer_expression_type, infer_plan_schema
+from substrait.utils import iter_plan_rels
+from substrait.utils.display import PlanPrinter
+
+DEPTHS = (100, 400, 10_000, 100_000)
+
+
+def _plan(build_root):
+    plan = stp.Plan()
+    root = plan.relations.add().root
+    root.names.append("id")
+    read = build_root(root.input)
+    read.named_table.names.append("table")
+    read.base_schema.names.append("id")
+    read.base_schema.struct.types.add().i64.nullability = stt.Type.NULLABILITY_REQUIRED
+    return plan
+
+
+def _relation_chain(depth):
+    def build(rel):
+        for i in range(depth):
+            if i % 2:
+                rel.fetch.count_expr.literal.i64 = 10
+                rel = rel.fetch.input
+            else:
+                rel.filter.condition.literal.boolean = True
+                rel = rel.filter.input
+        return rel.read
+
+    return _plan(build)
+
+
+def _and_chain(depth):
+    def build(rel):
+        condition = rel.filter.condition
+        for _ in range(depth):
+            function = condition.scalar_function
+            function.output_type.bool.nullability = stt.Type.NULLABILITY_NULLABLE
+            argument = function.arguments.add()
+            function.arguments.add().value.literal.boolean = True
+            condition = argument.value
+        condition.literal.boolean = True
+        return rel.filter.input.read
+
+    return _plan(build)
+
+
+def _case_ladder(depth):
+    expression = stalg.Expression()
+    current = expression
+    for _ in range(depth):
+        clause = current.if_then.ifs.add()
+        getattr(clause, "if").selection.direct_reference.struct_field.field = 1
+        getattr(current.if_then, "else").literal.i64 = 0
+        current = clause.then
+    current.literal.i64 = 1
+    return expression
+
+
+SCHEMA = stt.Type.Struct(
+    types=[
+        stt.Type(i64=stt.Type.I64(nullability=stt.Type.NULLABILITY_REQUIRED)),
+        stt.Type(bool=stt.Type.Boolean(nullability=stt.Type.NULLABILITY_NULLABLE)),
+    ],
+    nullability=stt.Type.NULLABILITY_REQUIRED,
+)
+
+CASES = (
+    ("relation chain", _relation_chain, "infer", infer_plan_schema),
+    (
+        "relation chain",
+        _relation_chain,
+        "walk",
+        lambda p: sum(1 for _ in iter_plan_rels(p)),
+    ),
+    (
+        "relation chain",
+        _relation_chain,
+        "print",
+        lambda p: PlanPrinter(indent_size=0, use_colors=False).stringify_plan(p),
+    ),
+    ("and chain", _and_chain, "walk", lambda p: sum(1 for _ in iter_plan_rels(p))),
+    (
+        "and chain",
+        _and_chain,
+        "print",
+        lambda p: PlanPrinter(indent_size=0, use_colors=False).stringify_plan(p),
+    ),
+    ("case ladder", _case_ladder, "infer", lambda e: infer_expression_type(e, SCHEMA)),
+)
+
+
+def main() -> None:
+    built = {}
+    for shape, build, label, operation in CASES:
+        line = f"{shape:14} {label:5}:"
+        for depth in DEPTHS:
+            if (shape, depth) not in built:
+                built[shape, depth] = build(depth)
+            start = time.perf_counter()
+            try:
+                operation(built[shape, depth])
+            except RecursionError:
+                line += f"   {depth:>6}: {'RecursionError':>14}"
+                continue
+            seconds = time.perf_counter() - start
+            line += f"   {depth:>6}: {seconds / depth * 1e6:6.2f} us/level"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark: native recursive-descent parser vs. the ANTLR fallback.
+
+Parses every distinct type string from the bundled extension YAMLs with both
+backends (bypassing the parse cache) and times default registry construction
+under each backend.
+
+Run from a development install with
+``python benchmarks/bench_derivation_parser.py``.
+"""
+
+import time
+from importlib.resources import files
+
+import yaml
+
+from substrait import derivation_expression, derivation_parser
+from substrait.extension_registry import ExtensionRegistry
+
+
+def _type_strings() -> list:
+    strings = set()
+    for path in files("substrait_extensions.extensions").glob("functions*.yaml"):
+        with open(path) as f:
+            definitions = yaml.safe_load(f)
+        for key in ("scalar_functions", "aggregate_functions", "window_functions"):
+            for function in definitions.get(key) or []:
+                for impl in function["impls"]:
+                    strings.update(
+                        arg["value"] for arg in impl.get("args", []) if "value" in arg
+                    )
+                    strings.add(impl["return"])
+    return sorted(strings)
+
+
+def _time(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    strings = _type_strings()
+    native = _time(lambda: [derivation_parser.parse(s) for s in strings])
+    antlr = _time(lambda: [derivation_expression._parse_uncached(s) for s in strings])
+    print(f"{len(strings)} distinct type strings")
+    print(f"native parse: {native * 1e3:8.2f} ms")
+    print(f"antlr parse:  {antlr * 1e3:8.2f} ms  ({antlr / native:.0f}x slower)")
+
+    for backend in derivation_expression.PARSER_BACKENDS:
+        derivation_expression.set_parser_backend(backend)
+        derivation_expression.clear_parse_cache()
+        elapsed = _time(ExtensionRegistry, repeat=1)
+        print(f"ExtensionRegistry() with {backend} backend: {elapsed * 1e3:8.1f} ms")
+    derivation_expression.set_parser_backend("native")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: import time of the package's entry points.
+
+Imports each module in a fresh interpreter under ``python -X importtime`` and
+reports its cumulative import time (best of five), that time as a multiple of
+importing the generated protobuf modules every entry point needs anyway, and
+whether it pulled in the registry or any of the dependencies that are meant to
+be deferred. Modules over their budget, in those multiples, are flagged.
+
+Run from a development install with ``python benchmarks/bench_import_time.py``.
+"""
+
+import subprocess
+import sys
+
+BASELINE = "substrait.plan_pb2, substrait.extended_expression_pb2"
+
+# Module -> budget, in multiples of the baseline, or None.
+MODULES = {
+    "substrait.plan_pb2": None,
+    "substrait.utils": None,
+    "substrait.extension_registry": 0.3,
+    "substrait.type_inference": 2,
+    "substrait.dataframe": 1.5,
+    "substrait.builders.extended_expression": 2.5,
+    "substrait.builders.plan": 3,
+    "substrait.narwhals": 3,
+    "substrait.sql.sql_to_substrait": 3,
+    "substrait.extension_registry.registry": 4,
+}
+
+WATCHED = [
+    "substrait.extension_registry.registry",
+    "yaml",
+    "antlr4",
+    "sqloxide",
+    "deepdiff",
+    "importlib.metadata",
+]
+
+
+def _profile(module: str) -> dict:
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    baseline_modules = [name.strip() for name in BASELINE.split(",")]
+    baseline = min(
+        sum(_profile(BASELINE)[name] for name in baseline_modules) for _ in range(5)
+    )
+    print(f"{'baseline (protobuf modules)':40} {baseline / 1e3:7.1f} ms")
+    for module, budget in MODULES.items():
+        profiles = [_profile(module) for _ in range(5)]
+        best = min(profile[module] for profile in profiles)
+        ratio = best / baseline
+        flag = " OVER BUDGET" if budget is not None and ratio > budget else ""
+        loaded = [name for name in WATCHED if name in profiles[0]]
+        print(
+            f"{module:40} {best / 1e3:7.1f} ms {ratio:5.2f}x{flag}   "
+            f"{', '.join(loaded)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
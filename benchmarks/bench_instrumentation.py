@@ -0,0 +1,43 @@
+"""Benchmark: the cost of resolution instrumentation, disabled and enabled.
+
+Times cached and uncached ``add`` lookups on a default registry with
+instrumentation disabled, enabled, and enabled with a callback.
+
+Run from a development install with ``python benchmarks/bench_instrumentation.py``.
+"""
+
+import timeit
+
+from substrait.builders.type import i32
+from substrait.extension_registry import ExtensionRegistry
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+
+
+def _per_call(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    signature = [i32(nullable=False)] * 2
+    cached = ExtensionRegistry()
+    uncached = ExtensionRegistry(resolution_cache_size=0)
+    modes = [
+        ("disabled", lambda r: r.disable_instrumentation()),
+        ("enabled", lambda r: r.enable_instrumentation()),
+        ("callback", lambda r: r.enable_instrumentation(lambda *args: None)),
+    ]
+    for label, configure in modes:
+        configure(cached)
+        configure(uncached)
+        hit = _per_call(
+            lambda: cached.lookup_function(ARITHMETIC, "add", signature), 20_000
+        )
+        miss = _per_call(
+            lambda: uncached.lookup_function(ARITHMETIC, "add", signature), 2_000
+        )
+        print(f"{label:9}  cached {hit * 1e6:6.2f} us   uncached {miss * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
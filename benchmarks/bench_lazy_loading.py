@@ -0,0 +1,59 @@
+"""Benchmark: cold start of a lazy default registry vs. an eager one.
+
+Times imports plus construction, alone and followed by the handful of
+single-URN lookups a short-lived worker typically makes, each in a fresh
+interpreter so that parse caches and imports start cold.
+
+Run from a development install with ``python benchmarks/bench_lazy_loading.py``.
+"""
+
+import subprocess
+import sys
+import time
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+from substrait.builders.type import boolean, i32, string
+from substrait.extension_registry import ExtensionRegistry
+registry = ExtensionRegistry(lazy={lazy})
+built = time.perf_counter()
+urn = "extension:io.substrait:functions_"
+pair = [i32(nullable=False), i32(nullable=False)]
+registry.lookup_function(urn + "arithmetic", "add", pair)
+registry.lookup_function(urn + "comparison", "equal", pair)
+registry.lookup_function(urn + "boolean", "and", [boolean(nullable=False)] * 2)
+registry.lookup_function(urn + "string", "upper", [string(nullable=False)])
+done = time.perf_counter()
+print(built - start, done - start)
+"""
+
+
+def _cold(lazy: bool, repeat: int = 5) -> tuple:
+    best_built, best_done = float("inf"), float("inf")
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(lazy=lazy)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        built, done = map(float, out.split())
+        best_built, best_done = min(best_built, built), min(best_done, done)
+    return best_built, best_done
+
+
+def main() -> None:
+    start = time.perf_counter()
+    for lazy in (False, True):
+        built, done = _cold(lazy)
+        mode = "lazy " if lazy else "eager"
+        print(
+            f"{mode}: construct {built * 1e3:8.1f} ms   "
+            f"construct + 4 lookups {done * 1e3:8.1f} ms"
+        )
+    print(f"(total wall time {time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
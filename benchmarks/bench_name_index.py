@@ -0,0 +1,53 @@
+"""Benchmark: searching every URN for a name with and without the name index.
+
+Registers the default extensions plus a number of custom extension packs (none
+of which define ``add``) and resolves ``add`` across all URNs with the
+resolution cache disabled: once through the ``name -> urns`` index (``urns=None``)
+and once visiting every registered URN, as the registry used to.
+
+Run from a development install with ``python benchmarks/bench_name_index.py``.
+"""
+
+import time
+
+from substrait.builders.type import i64
+from substrait.extension_registry import ExtensionRegistry
+
+
+def _pack(number: int) -> dict:
+    impl = {"args": [{"name": "a", "value": "i8"}], "return": "i8"}
+    return {
+        "urn": f"extension:bench:pack{number}",
+        "scalar_functions": [
+            {"name": f"custom_{number}_{i}", "impls": [impl]} for i in range(20)
+        ],
+    }
+
+
+def _time(fn, repeat: int = 500) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main() -> None:
+    signature = [i64(nullable=False), i64(nullable=False)]
+    for packs in (0, 50, 500):
+        registry = ExtensionRegistry(resolution_cache_size=0)
+        for number in range(packs):
+            registry.register_extension_dict(_pack(number))
+        every_urn = list(registry._tables.functions)
+        indexed = _time(lambda: registry.find_function("add", signature))
+        scan = _time(lambda: registry.find_function("add", signature, every_urn))
+        print(
+            f"{len(every_urn):4} URNs: every URN {scan * 1e6:8.1f} us   "
+            f"name index {indexed * 1e6:8.1f} us  ({scan / indexed:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark: uncached overload resolution with and without the overload index.
+
+Resolves a few calls to heavily overloaded functions with the resolution cache
+disabled: by calling ``satisfies_signature`` on every overload, as the registry
+used to, and on the candidates of the per-``(urn, name)`` arity/kind index.
+
+Run from a development install with ``python benchmarks/bench_overload_index.py``.
+"""
+
+import time
+
+from substrait.builders.type import decimal, fp64, i64, precision_timestamp, string
+from substrait.extension_registry import ExtensionRegistry
+
+PREFIX = "extension:io.substrait:functions_"
+
+CALLS = [
+    ("arithmetic", "add", [i64(nullable=False), i64(nullable=False)]),
+    ("arithmetic", "multiply", [fp64(nullable=True), fp64(nullable=False)]),
+    ("arithmetic_decimal", "add", [decimal(2, 10, nullable=False)] * 2),
+    ("comparison", "equal", [string(nullable=False)] * 2),
+    ("comparison", "is_null", [string(nullable=False)]),
+    ("datetime", "lt", [precision_timestamp(6, nullable=False)] * 2),
+    ("string", "concat", [string(nullable=False)] * 3),
+]
+
+
+def _first_match(entries, signature):
+    for entry in entries:
+        output = entry.satisfies_signature(signature)
+        if output is not None:
+            return entry, output
+    return None
+
+
+def _time(fn, repeat: int = 200) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main() -> None:
+    registry = ExtensionRegistry(resolution_cache_size=0)
+    for suffix, name, signature in CALLS:
+        urn = PREFIX + suffix
+        overloads = len(registry._tables.functions[urn][name])
+        candidates = len(
+            registry._tables.overload_indexes[urn, name].candidates(signature)
+        )
+        entries = registry._tables.functions[urn][name]
+        index = registry._tables.overload_indexes[urn, name]
+        scan = _time(lambda: _first_match(entries, signature))
+        indexed = _time(lambda: _first_match(index.candidates(signature), signature))
+        print(
+            f"{suffix + '.' + name:28} overloads {overloads:3}  candidates "
+            f"{candidates:3}  full scan {scan * 1e6:7.1f} us  "
+            f"indexed {indexed * 1e6:7.1f} us  ({scan / indexed:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
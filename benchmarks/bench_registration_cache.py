@@ -0,0 +1,54 @@
+"""Benchmark: registering the same extension content repeatedly.
+
+Registers the bundled function files (as bytes, the way a service receiving
+extensions over the network would) into a fresh registry per round, with the
+content-addressed registration cache cold and warm, validated and trusted.
+
+Run from a development install with ``python benchmarks/bench_registration_cache.py``.
+"""
+
+import time
+
+from substrait.extension_registry import (
+    ExtensionRegistry,
+    clear_registration_cache,
+    set_registration_cache_size,
+)
+from substrait.extension_registry.registry import (
+    DEFAULT_REGISTRATION_CACHE_SIZE,
+    default_extension_paths,
+)
+
+
+def _time(contents: list, trusted: bool, warm: bool) -> float:
+    best = float("inf")
+    for _ in range(5):
+        if not warm:
+            clear_registration_cache()
+        registry = ExtensionRegistry(load_default_extensions=False)
+        start = time.perf_counter()
+        for content in contents:
+            registry.register_extension_bytes(content, trusted=trusted)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    contents = [path.read_bytes() for path in default_extension_paths()]
+    print(f"{len(contents)} files, {sum(map(len, contents)) // 1024} KiB")
+    for trusted in (False, True):
+        cold = _time(contents, trusted, warm=False)
+        warm = _time(contents, trusted, warm=True)
+        label = "trusted  " if trusted else "validated"
+        print(
+            f"{label} cold {cold * 1e3:8.1f} ms   warm {warm * 1e3:8.2f} ms"
+            f"   ({cold / warm:.0f}x)"
+        )
+    set_registration_cache_size(0)
+    disabled = _time(contents, True, warm=True)
+    set_registration_cache_size(DEFAULT_REGISTRATION_CACHE_SIZE)
+    print(f"trusted, cache disabled {disabled * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
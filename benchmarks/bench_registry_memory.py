@@ -0,0 +1,36 @@
+"""Benchmark: memory retained per registered overload.
+
+Builds a registry with the default extensions (after a warm-up build, so the
+shared parse cache and imports are excluded) and reports the memory it keeps
+alive, as measured by :mod:`tracemalloc`, per registered overload.
+
+Run from a development install with ``python benchmarks/bench_registry_memory.py``.
+"""
+
+import gc
+import tracemalloc
+
+from substrait.extension_registry import ExtensionRegistry
+
+
+def main() -> None:
+    ExtensionRegistry()  # warm the parse cache and imports
+    gc.collect()
+    tracemalloc.start()
+    registry = ExtensionRegistry()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    overloads = sum(
+        len(entries)
+        for names in registry._tables.functions.values()
+        for entries in names.values()
+    )
+    print(f"overloads              {overloads:10d}")
+    print(f"retained               {retained / 2**20:10.2f} MiB")
+    print(f"bytes per overload     {retained / overloads:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark: restoring the default registry from a snapshot vs. building it.
+
+Each measurement runs in a fresh interpreter, so imports and parse caches start
+cold, and reports imports plus construction.
+
+Run from a development install with ``python benchmarks/bench_registry_snapshot.py``.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SCRIPT = """
+import sys, time
+start = time.perf_counter()
+from substrait.extension_registry import ExtensionRegistry
+registry = {construct}
+print(time.perf_counter() - start, "yaml" in sys.modules, "antlr4" in sys.modules)
+"""
+
+
+def _cold(construct: str, repeat: int = 5) -> tuple:
+    best = float("inf")
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(construct=construct)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        best = min(best, float(out[0]))
+    return best, out[1] == "True", out[2] == "True"
+
+
+def main() -> None:
+    from substrait.extension_registry import ExtensionRegistry
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "registry.snapshot"
+        ExtensionRegistry().save_snapshot(path)
+        print(f"snapshot size: {path.stat().st_size / 1024:.0f} KiB")
+        for label, construct in (
+            ("yaml    ", "ExtensionRegistry()"),
+            ("snapshot", f"ExtensionRegistry.from_snapshot({str(path)!r})"),
+        ):
+            seconds, yaml_loaded, antlr_loaded = _cold(construct)
+            print(
+                f"{label}: {seconds * 1e3:8.1f} ms  "
+                f"(yaml imported: {yaml_loaded}, antlr4 imported: {antlr_loaded})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Stress benchmark: many threads resolving signatures from one shared registry
+while another thread keeps registering extensions.
+
+Every result is checked against a single-threaded resolution. Pass the total
+number of lookups as the first argument (default one million).
+
+Run from a development install with
+``python benchmarks/bench_registry_threads.py [LOOKUPS]``.
+"""
+
+import sys
+import threading
+import time
+
+from substrait.builders.type import boolean, fp64, i8, i32, string
+from substrait.extension_registry import ExtensionRegistry
+
+PREFIX = "extension:io.substrait:functions_"
+
+CALLS = [
+    (PREFIX + "arithmetic", "add", [i32(nullable=False), i32(nullable=False)]),
+    (PREFIX + "arithmetic", "multiply", [fp64(nullable=True), fp64(nullable=False)]),
+    (PREFIX + "comparison", "equal", [string(nullable=False)] * 2),
+    (PREFIX + "comparison", "coalesce", [i8(nullable=False), i8(nullable=True)]),
+    (PREFIX + "boolean", "and", [boolean(nullable=False)] * 3),
+    (PREFIX + "string", "upper", [string(nullable=True)]),
+]
+
+THREADS = 8
+
+
+def _key(result):
+    entry, output = result
+    return entry.urn, entry.anchor, output.SerializeToString()
+
+
+def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_thread = total // THREADS
+    registry = ExtensionRegistry(lazy=True)
+    expected = [
+        _key(ExtensionRegistry(lazy=True).lookup_function(*call)) for call in CALLS
+    ]
+    stop = threading.Event()
+    failures = []
+    registered = [0]
+
+    def read(offset):
+        for i in range(per_thread):
+            index = (i + offset) % len(CALLS)
+            if _key(registry.lookup_function(*CALLS[index])) != expected[index]:
+                failures.append(CALLS[index])
+
+    def write():
+        impl = {"args": [{"name": "a", "value": "i8"}], "return": "i8"}
+        while not stop.is_set():
+            number = registered[0]
+            registry.register_extension_dict(
+                {
+                    "urn": f"extension:bench:threads{number}",
+                    "scalar_functions": [{"name": "add", "impls": [impl]}],
+                }
+            )
+            registered[0] += 1
+            time.sleep(0.01)
+
+    readers = [threading.Thread(target=read, args=(n,)) for n in range(THREADS)]
+    writer = threading.Thread(target=write)
+    start = time.perf_counter()
+    writer.start()
+    for thread in readers:
+        thread.start()
+    for thread in readers:
+        thread.join()
+    stop.set()
+    writer.join()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{per_thread * THREADS:,} lookups from {THREADS} threads in {elapsed:.1f} s "
+        f"({per_thread * THREADS / elapsed:,.0f}/s) while registering "
+        f"{registered[0]} extensions; {len(failures)} wrong results"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: binding a wide select's function lookups one by one vs in a batch.
+
+Builds 5,000 ``(urn, name, signature)`` lookups drawn from 40 distinct ones, as
+a wide projection of arithmetic and comparison calls over a handful of column
+types produces, and resolves them with a per-call ``lookup_function`` loop and
+with a single ``resolve_many``, with the resolution cache cold each time.
+
+Run from a development install with ``python benchmarks/bench_resolve_many.py``.
+"""
+
+import itertools
+import time
+
+from substrait.builders.type import fp64, i32, i64, string
+from substrait.extension_registry import ExtensionRegistry
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+COMPARISON = "extension:io.substrait:functions_comparison"
+
+
+def _requests(count: int) -> list:
+    calls = [
+        (ARITHMETIC, name) for name in ("add", "subtract", "multiply", "divide")
+    ] + [(COMPARISON, name) for name in ("equal", "lt", "gt", "not_equal")]
+    types = [i32, i64, fp64, string]
+    distinct = [
+        (urn, name, [typ(nullable=nullable)] * 2)
+        for (urn, name), typ, nullable in itertools.product(calls, types, (False, True))
+    ][:40]
+    return [distinct[i % len(distinct)] for i in range(count)]
+
+
+def _time(fn, registry: ExtensionRegistry) -> float:
+    best = float("inf")
+    for _ in range(5):
+        registry.clear_resolution_cache()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    registry = ExtensionRegistry()
+    requests = _requests(5_000)
+
+    loop = _time(
+        lambda: [registry.lookup_function(*request) for request in requests],
+        registry,
+    )
+    batch = _time(lambda: registry.resolve_many(requests), registry)
+    print(f"lookup_function loop  {loop * 1e3:8.2f} ms")
+    print(f"resolve_many          {batch * 1e3:8.2f} ms  ({loop / batch:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Microbenchmark: re-parsing vs. compiled return-type derivations.
+
+Times the return-type programs of the decimal arithmetic overloads evaluated
+through ``evaluate`` (parse, compile and run on every call; parsing is served
+from the process-wide parse cache) against the same programs compiled once with
+``compile_expression``, and a full decimal ``add`` resolution through a registry
+without a resolution cache.
+
+Run from a development install with
+``python benchmarks/bench_return_type_derivation.py``.
+"""
+
+import timeit
+from importlib.resources import files
+
+import yaml
+
+from substrait.builders.type import decimal
+from substrait.derivation_expression import compile_expression, evaluate
+from substrait.extension_registry import ExtensionRegistry
+
+DECIMAL_URN = "extension:io.substrait:functions_arithmetic_decimal"
+PARAMETERS = {"P1": 10, "S1": 2, "P2": 12, "S2": 4}
+
+
+def _decimal_return_programs() -> dict:
+    path = (
+        files("substrait_extensions.extensions") / "functions_arithmetic_decimal.yaml"
+    )
+    with open(path) as f:
+        definitions = yaml.safe_load(f)
+    programs = {}
+    for function in definitions["scalar_functions"]:
+        for impl in function["impls"]:
+            if len(impl["args"]) == 2:
+                programs[function["name"]] = impl["return"]
+    return programs
+
+
+def _per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    print(
+        f"{'function':<10} {'evaluate (us)':>14} {'compiled (us)':>14} {'speedup':>8}"
+    )
+    for name, source in _decimal_return_programs().items():
+        program = compile_expression(source)
+        parsed = _per_call_us(lambda: evaluate(source, dict(PARAMETERS)), 50)
+        compiled = _per_call_us(lambda: program(dict(PARAMETERS)), 5000)
+        print(
+            f"{name:<10} {parsed:>14.1f} {compiled:>14.1f} {parsed / compiled:>7.0f}x"
+        )
+
+    registry = ExtensionRegistry(resolution_cache_size=0)
+    signature = [decimal(2, 10, nullable=False), decimal(4, 12, nullable=False)]
+    lookup = _per_call_us(
+        lambda: registry.lookup_function(DECIMAL_URN, "add", signature), 200
+    )
+    print(f"\nuncached decimal add lookup: {lookup:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
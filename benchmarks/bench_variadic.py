@@ -0,0 +1,58 @@
+"""Benchmark: resolving variadic functions over long argument lists.
+
+Resolves ``and`` and ``or`` over 1,000 boolean arguments, and ``coalesce``
+over 1,000 ``i32`` arguments, with the resolution cache disabled. Compares
+``FunctionEntry.satisfies_signature``, which checks each distinct argument
+type once, against checking every argument with ``covers`` as it used to,
+both given precomputed type keys; ``lookup_function`` also computes them.
+
+Run from a development install with ``python benchmarks/bench_variadic.py``.
+"""
+
+import timeit
+
+from substrait.builders.type import boolean, i32
+from substrait.extension_registry import ExtensionRegistry, covers
+from substrait.utils.type_key import type_key
+
+URN = "extension:io.substrait:functions_"
+ARGUMENTS = 1_000
+
+
+def _per_argument(entry, signature, keys) -> bool:
+    """The former check: ``covers`` once per argument, with shared bindings."""
+    parameters = {}
+    return all(
+        covers(y, entry.arguments[0], parameters, False, key)
+        for y, key in zip(signature, keys)
+    )
+
+
+def _seconds(fn, number: int = 50) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    registry = ExtensionRegistry(resolution_cache_size=0)
+    mixed = [boolean(nullable=False), boolean(nullable=True)]
+    cases = [
+        ("and", URN + "boolean", [boolean(nullable=False)] * ARGUMENTS),
+        ("or", URN + "boolean", mixed * (ARGUMENTS // 2)),
+        ("coalesce", URN + "comparison", [i32(nullable=True)] * ARGUMENTS),
+    ]
+    print(f"{ARGUMENTS} arguments, resolution cache disabled")
+    for name, urn, signature in cases:
+        entry, _ = registry.lookup_function(urn, name, signature)
+        keys = [type_key(y) for y in signature]
+        before = _seconds(lambda: _per_argument(entry, signature, keys))
+        after = _seconds(lambda: entry.satisfies_signature(signature, keys))
+        lookup = _seconds(lambda: registry.lookup_function(urn, name, signature))
+        print(
+            f"{name:9} per-argument covers {before * 1e3:7.2f} ms   "
+            f"distinct types {after * 1e3:7.3f} ms ({before / after:4.0f}x)   "
+            f"lookup_function {lookup * 1e3:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
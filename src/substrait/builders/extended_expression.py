@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import calendar
 import contextlib
 import contextvars
@@ -5,15 +7,18 @@ import itertools
 import uuid as uuid_module
 from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Callable, Iterable, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Union
 
 import substrait.algebra_pb2 as stalg
 import substrait.extended_expression_pb2 as stee
 import substrait.extensions.extensions_pb2 as ste
 import substrait.type_pb2 as stp
 
-from substrait.extension_registry import ExtensionRegistry
-from substrait.type_inference import infer_extended_expression_schema, outer_schemas
+from substrait.type_inference import (
+    infer_extended_expression_schema,
+    infer_literal_type,
+    outer_schemas,
+)
 from substrait.utils import (
     inline_reference_rels,
     merge_extension_declarations,
@@ -22,6 +27,9 @@ from substrait.utils import (
     type_num_names,
 )
 
+if TYPE_CHECKING:
+    from substrait.extension_registry import ExtensionRegistry
+
 # Monotonic source of unique RelCommon.rel_anchor values within a single build.
 # Not reset between builds by default; reset at each top-level materialization
 # (see fresh_rel_anchors) so a plan built the same way twice numbers alike.
@@ -49,8 +57,13 @@ def fresh_rel_anchors():
         _rel_anchor_counter.reset(token)
 
 
+# The type of a predicate (SingularOrList, MultiOrList).
+_NULLABLE_BOOLEAN = stp.Type(
+    bool=stp.Type.Boolean(nullability=stp.Type.NULLABILITY_NULLABLE)
+)
+
 UnboundExtendedExpression = Callable[
-    [stp.NamedStruct, ExtensionRegistry], stee.ExtendedExpression
+    [stp.NamedStruct, "ExtensionRegistry"], stee.ExtendedExpression
 ]
 ExtendedExpressionOrUnbound = Union[stee.ExtendedExpression, UnboundExtendedExpression]
 
@@ -92,6 +105,59 @@ def resolve_expression(
     )
 
 
+TypedResolver = Callable[
+    [stp.NamedStruct, "ExtensionRegistry"], "tuple[stee.ExtendedExpression, list]"
+]
+
+
+def _typed_resolver(resolve_typed: TypedResolver) -> UnboundExtendedExpression:
+    """Turn ``resolve_typed``, which returns the bound expression together with
+    the output type of each of its referred expressions, into a plain resolver.
+
+    Builders know the type of the node they bind; keeping it (as the resolver's
+    ``typed`` attribute) lets a parent binding the resolver read it through
+    :func:`_bind_typed` instead of re-inferring it from the bound tree.
+    """
+
+    def resolve(
+        base_schema: stp.NamedStruct, registry: ExtensionRegistry
+    ) -> stee.ExtendedExpression:
+        return resolve_typed(base_schema, registry)[0]
+
+    resolve.typed = resolve_typed
+    return resolve
+
+
+def _bind_typed(
+    expression: ExtendedExpressionOrUnbound,
+    base_schema: stp.NamedStruct,
+    registry: ExtensionRegistry,
+) -> tuple[stee.ExtendedExpression, list]:
+    """Bind ``expression`` and return it with its output types, inferring them
+    only when ``expression`` does not come from a typed resolver."""
+    typed = getattr(expression, "typed", None)
+    if typed is not None:
+        return typed(base_schema, registry)
+    bound = resolve_expression(expression, base_schema, registry)
+    return bound, list(infer_extended_expression_schema(bound, registry=registry).types)
+
+
+def _single_expression(
+    output_names, base_schema, extension_urns=(), extensions=()
+) -> tuple[stee.ExtendedExpression, stalg.Expression]:
+    """An ExtendedExpression with one empty referred expression, for the caller to
+    fill in place. Sub-expressions are copied in with ``CopyFrom``: a message
+    passed to a constructor is copied by parsing it, which protobuf rejects
+    beyond its nesting limit, so deep expressions could not be built that way."""
+    bound = stee.ExtendedExpression(
+        referred_expr=[stee.ExpressionReference(output_names=output_names)],
+        base_schema=base_schema,
+        extension_urns=extension_urns,
+        extensions=extensions,
+    )
+    return bound, bound.referred_expr[0].expression
+
+
 def alias(
     expression: ExtendedExpressionOrUnbound,
     name: str,
@@ -110,7 +176,21 @@ def alias(
         bound_expression.referred_expr[0].output_names[0] = name
         return bound_expression
 
-    return resolve
+    typed = getattr(expression, "typed", None)
+    if typed is None:
+        return resolve
+
+    # Keep the types of a typed expression (an aggregate measure, for one, has
+    # none to infer).
+    @_typed_resolver
+    def resolve_typed(
+        base_schema: stp.NamedStruct, registry: ExtensionRegistry
+    ) -> tuple[stee.ExtendedExpression, list]:
+        bound_expression, types = typed(base_schema, registry)
+        bound_expression.referred_expr[0].output_names[0] = name
+        return bound_expression, types
+
+    return resolve_typed
 
 
 _EPOCH_DATE = date(1970, 1, 1)
@@ -373,18 +453,21 @@ def literal(
     for the accepted value representations of each type kind.
     """
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
-        return stee.ExtendedExpression(
+    ) -> tuple[stee.ExtendedExpression, list]:
+        bound_literal = _make_literal(value, type)
+        bound = stee.ExtendedExpression(
             referred_expr=[
                 stee.ExpressionReference(
-                    expression=stalg.Expression(literal=_make_literal(value, type)),
+                    expression=stalg.Expression(literal=bound_literal),
                     output_names=_alias_or_inferred(alias, "Literal", [str(value)]),
                 )
             ],
             base_schema=base_schema,
         )
+        return bound, [infer_literal_type(bound_literal)]
 
     return resolve
 
@@ -486,9 +569,10 @@ def column(field: Union[str, int], alias: Union[Iterable[str], str, None] = None
     """
     alias = [alias] if alias and isinstance(alias, str) else alias
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         lengths = [type_num_names(t) for t in base_schema.struct.types]
         flat_indices = [0] + list(itertools.accumulate(lengths))[:-1]
 
@@ -505,7 +589,7 @@ def column(field: Union[str, int], alias: Union[Iterable[str], str, None] = None
             else None
         )
 
-        return stee.ExtendedExpression(
+        bound = stee.ExtendedExpression(
             referred_expr=[
                 stee.ExpressionReference(
                     expression=stalg.Expression(
@@ -525,10 +609,76 @@ def column(field: Union[str, int], alias: Union[Iterable[str], str, None] = None
             ],
             base_schema=base_schema,
         )
+        return bound, [base_schema.struct.types[field_index]]
 
     return resolve
 
 
+def _bind_arguments(
+    expressions: Iterable[ExtendedExpressionOrUnbound],
+    base_schema: stp.NamedStruct,
+    registry: ExtensionRegistry,
+) -> tuple[list, list]:
+    """Bind a function's argument ``expressions`` and collect their signature."""
+    bound = [_bind_typed(e, base_schema, registry) for e in expressions]
+    bound_expressions = [expression for expression, _ in bound]
+    signature = [typ for _, types in bound for typ in types]
+    return bound_expressions, signature
+
+
+def _scalar_function_expression(
+    urn: str,
+    function: str,
+    bound_expressions: list,
+    func,
+    alias: Union[Iterable[str], str, None],
+    options: Union[dict, None],
+    base_schema: stp.NamedStruct,
+    registry: ExtensionRegistry,
+) -> stee.ExtendedExpression:
+    """The ExtendedExpression calling the resolved overload ``func`` (an
+    ``(entry, output_type)`` pair) on ``bound_expressions``."""
+    func_extension_urns = [
+        ste.SimpleExtensionURN(extension_urn_anchor=registry.lookup_urn(urn), urn=urn)
+    ]
+
+    func_extensions = [
+        ste.SimpleExtensionDeclaration(
+            extension_function=ste.SimpleExtensionDeclaration.ExtensionFunction(
+                extension_urn_reference=registry.lookup_urn(urn),
+                function_anchor=func[0].anchor,
+                name=str(func[0]),
+            )
+        )
+    ]
+
+    extension_urns = merge_extension_urns(
+        func_extension_urns, *[b.extension_urns for b in bound_expressions]
+    )
+
+    extensions = merge_extension_declarations(
+        func_extensions, *[b.extensions for b in bound_expressions]
+    )
+
+    bound, expression = _single_expression(
+        _alias_or_inferred(
+            alias,
+            function,
+            [e.referred_expr[0].output_names[0] for e in bound_expressions],
+        ),
+        base_schema,
+        extension_urns,
+        extensions,
+    )
+    scalar = expression.scalar_function
+    scalar.function_reference = func[0].anchor
+    for e in bound_expressions:
+        scalar.arguments.add().value.CopyFrom(e.referred_expr[0].expression)
+    scalar.options.extend(_function_options(options))
+    scalar.output_type.CopyFrom(func[1])
+    return bound
+
+
 def scalar_function(
     urn: str,
     function: str,
@@ -542,75 +692,84 @@ def scalar_function(
     function options (e.g. ``{"overflow": "ERROR"}``).
     """
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
-        bound_expressions = [
-            resolve_expression(e, base_schema, registry) for e in expressions
-        ]
-
-        expression_schemas = [
-            infer_extended_expression_schema(b, registry=registry)
-            for b in bound_expressions
-        ]
-
-        signature = [typ for es in expression_schemas for typ in es.types]
+    ) -> tuple[stee.ExtendedExpression, list]:
+        bound_expressions, signature = _bind_arguments(
+            expressions, base_schema, registry
+        )
 
         func = registry.lookup_function(urn, function, signature)
 
         if not func:
             raise Exception(f"Unknown function {function} for {signature}")
 
-        func_extension_urns = [
-            ste.SimpleExtensionURN(
-                extension_urn_anchor=registry.lookup_urn(urn), urn=urn
-            )
-        ]
+        bound = _scalar_function_expression(
+            urn,
+            function,
+            bound_expressions,
+            func,
+            alias,
+            options,
+            base_schema,
+            registry,
+        )
+        return bound, [func[1]]
 
-        func_extensions = [
-            ste.SimpleExtensionDeclaration(
-                extension_function=ste.SimpleExtensionDeclaration.ExtensionFunction(
-                    extension_urn_reference=registry.lookup_urn(urn),
-                    function_anchor=func[0].anchor,
-                    name=str(func[0]),
-                )
-            )
+    return resolve
+
+
+def scalar_functions(calls: Iterable[tuple]) -> UnboundExtendedExpression:
+    """Builds a resolver for ExtendedExpression containing one ScalarFunction
+    expression per call, in order.
+
+    Each call is a ``(urn, function, expressions)`` tuple, optionally followed by
+    ``alias`` and ``options`` as taken by :func:`scalar_function`. The overloads
+    of all calls are looked up with a single
+    :meth:`ExtensionRegistry.resolve_many`, so binding a wide select or project
+    resolves each distinct ``(urn, function, signature)`` once.
+    """
+    calls = [tuple(call) + (None,) * (5 - len(call)) for call in calls]
+
+    def resolve(
+        base_schema: stp.NamedStruct, registry: ExtensionRegistry
+    ) -> stee.ExtendedExpression:
+        bound = [
+            _bind_arguments(expressions, base_schema, registry)
+            for _, _, expressions, _, _ in calls
         ]
 
-        extension_urns = merge_extension_urns(
-            func_extension_urns, *[b.extension_urns for b in bound_expressions]
+        funcs = registry.resolve_many(
+            (urn, function, signature)
+            for (urn, function, *_), (_, signature) in zip(calls, bound)
         )
 
-        extensions = merge_extension_declarations(
-            func_extensions, *[b.extensions for b in bound_expressions]
-        )
+        parts = []
+        for (urn, function, _, alias, options), (
+            bound_expressions,
+            signature,
+        ), func in zip(calls, bound, funcs):
+            if not func:
+                raise Exception(f"Unknown function {function} for {signature}")
+            parts.append(
+                _scalar_function_expression(
+                    urn,
+                    function,
+                    bound_expressions,
+                    func,
+                    alias,
+                    options,
+                    base_schema,
+                    registry,
+                )
+            )
 
         return stee.ExtendedExpression(
-            referred_expr=[
-                stee.ExpressionReference(
-                    expression=stalg.Expression(
-                        scalar_function=stalg.Expression.ScalarFunction(
-                            function_reference=func[0].anchor,
-                            arguments=[
-                                stalg.FunctionArgument(
-                                    value=e.referred_expr[0].expression
-                                )
-                                for e in bound_expressions
-                            ],
-                            options=_function_options(options),
-                            output_type=func[1],
-                        )
-                    ),
-                    output_names=_alias_or_inferred(
-                        alias,
-                        function,
-                        [e.referred_expr[0].output_names[0] for e in bound_expressions],
-                    ),
-                )
-            ],
+            referred_expr=[r for p in parts for r in p.referred_expr],
             base_schema=base_schema,
-            extension_urns=extension_urns,
-            extensions=extensions,
+            extension_urns=merge_extension_urns(*[p.extension_urns for p in parts]),
+            extensions=merge_extension_declarations(*[p.extensions for p in parts]),
         )
 
     return resolve
@@ -638,21 +797,14 @@ def aggregate_function(
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
     ) -> stee.ExtendedExpression:
-        bound_expressions: Iterable[stee.ExtendedExpression] = [
-            resolve_expression(e, base_schema, registry) for e in expressions
-        ]
+        bound_expressions, signature = _bind_arguments(
+            expressions, base_schema, registry
+        )
         bound_sorts = [
             (resolve_expression(e, base_schema, registry), direction)
             for e, direction in sorts
         ]
 
-        expression_schemas = [
-            infer_extended_expression_schema(b, registry=registry)
-            for b in bound_expressions
-        ]
-
-        signature = [typ for es in expression_schemas for typ in es.types]
-
         func = registry.lookup_function(urn, function, signature)
 
         if not func:
@@ -736,21 +888,14 @@ def window_function(
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
     ) -> stee.ExtendedExpression:
-        bound_expressions: Iterable[stee.ExtendedExpression] = [
-            resolve_expression(e, base_schema, registry) for e in expressions
-        ]
+        bound_expressions, signature = _bind_arguments(
+            expressions, base_schema, registry
+        )
 
         bound_partitions = [
             resolve_expression(e, base_schema, registry) for e in partitions
         ]
 
-        expression_schemas = [
-            infer_extended_expression_schema(b, registry=registry)
-            for b in bound_expressions
-        ]
-
-        signature = [typ for es in expression_schemas for typ in es.types]
-
         func = registry.lookup_function(urn, function, signature)
 
         if not func:
@@ -825,13 +970,14 @@ def if_then(
 ):
     """Builds a resolver for ExtendedExpression containing an IfThen expression"""
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         bound_ifs = [
             (
                 resolve_expression(if_clause[0], base_schema, registry),
-                resolve_expression(if_clause[1], base_schema, registry),
+                _bind_typed(if_clause[1], base_schema, registry),
             )
             for if_clause in ifs
         ]
@@ -840,58 +986,42 @@ def if_then(
 
         extension_urns = merge_extension_urns(
             *[b[0].extension_urns for b in bound_ifs],
-            *[b[1].extension_urns for b in bound_ifs],
+            *[b[1][0].extension_urns for b in bound_ifs],
             bound_else.extension_urns,
         )
 
         extensions = merge_extension_declarations(
             *[b[0].extensions for b in bound_ifs],
-            *[b[1].extensions for b in bound_ifs],
+            *[b[1][0].extensions for b in bound_ifs],
             bound_else.extensions,
         )
 
-        return stee.ExtendedExpression(
-            referred_expr=[
-                stee.ExpressionReference(
-                    expression=stalg.Expression(
-                        if_then=stalg.Expression.IfThen(
-                            **{
-                                "ifs": [
-                                    stalg.Expression.IfThen.IfClause(
-                                        **{
-                                            "if": if_clause[0]
-                                            .referred_expr[0]
-                                            .expression,
-                                            "then": if_clause[1]
-                                            .referred_expr[0]
-                                            .expression,
-                                        }
-                                    )
-                                    for if_clause in bound_ifs
-                                ],
-                                "else": bound_else.referred_expr[0].expression,
-                            }
-                        )
-                    ),
-                    output_names=_alias_or_inferred(
-                        alias,
-                        "IfThen",
-                        [
-                            a
-                            for e in bound_ifs
-                            for a in [
-                                e[0].referred_expr[0].output_names[0],
-                                e[1].referred_expr[0].output_names[0],
-                            ]
-                        ]
-                        + [bound_else.referred_expr[0].output_names[0]],
-                    ),
-                )
-            ],
-            base_schema=base_schema,
-            extension_urns=extension_urns,
-            extensions=extensions,
+        bound, expression = _single_expression(
+            _alias_or_inferred(
+                alias,
+                "IfThen",
+                [
+                    a
+                    for condition, (then, _) in bound_ifs
+                    for a in [
+                        condition.referred_expr[0].output_names[0],
+                        then.referred_expr[0].output_names[0],
+                    ]
+                ]
+                + [bound_else.referred_expr[0].output_names[0]],
+            ),
+            base_schema,
+            extension_urns,
+            extensions,
         )
+        if_then = expression.if_then
+        for condition, (then, _) in bound_ifs:
+            clause = if_then.ifs.add()
+            getattr(clause, "if").CopyFrom(condition.referred_expr[0].expression)
+            clause.then.CopyFrom(then.referred_expr[0].expression)
+        getattr(if_then, "else").CopyFrom(bound_else.referred_expr[0].expression)
+        # An IfThen has the type of its first branch.
+        return bound, bound_ifs[0][1][1]
 
     return resolve
 
@@ -903,14 +1033,15 @@ def switch(
 ):
     """Builds a resolver for ExtendedExpression containing a switch expression"""
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         bound_match = resolve_expression(match, base_schema, registry)
         bound_ifs = [
             (
                 resolve_expression(a, base_schema, registry),
-                resolve_expression(b, base_schema, registry),
+                _bind_typed(b, base_schema, registry),
             )
             for a, b in ifs
         ]
@@ -918,41 +1049,33 @@ def switch(
 
         extension_urns = merge_extension_urns(
             bound_match.extension_urns,
-            *[b.extension_urns for _, b in bound_ifs],
+            *[b.extension_urns for _, (b, _) in bound_ifs],
             bound_else.extension_urns,
         )
 
         extensions = merge_extension_declarations(
             bound_match.extensions,
-            *[b.extensions for _, b in bound_ifs],
+            *[b.extensions for _, (b, _) in bound_ifs],
             bound_else.extensions,
         )
 
-        return stee.ExtendedExpression(
-            referred_expr=[
-                stee.ExpressionReference(
-                    expression=stalg.Expression(
-                        switch_expression=stalg.Expression.SwitchExpression(
-                            match=bound_match.referred_expr[0].expression,
-                            ifs=[
-                                stalg.Expression.SwitchExpression.IfValue(
-                                    **{
-                                        "if": i.referred_expr[0].expression.literal,
-                                        "then": t.referred_expr[0].expression,
-                                    }
-                                )
-                                for i, t in bound_ifs
-                            ],
-                            **{"else": bound_else.referred_expr[0].expression},
-                        )
-                    ),
-                    output_names=["switch"],  # TODO construct name from inputs
-                )
-            ],
-            base_schema=base_schema,
-            extension_urns=extension_urns,
-            extensions=extensions,
+        bound, expression = _single_expression(
+            ["switch"],  # TODO construct name from inputs
+            base_schema,
+            extension_urns,
+            extensions,
         )
+        switch_expression = expression.switch_expression
+        switch_expression.match.CopyFrom(bound_match.referred_expr[0].expression)
+        for i, (t, _) in bound_ifs:
+            value = switch_expression.ifs.add()
+            getattr(value, "if").CopyFrom(i.referred_expr[0].expression.literal)
+            value.then.CopyFrom(t.referred_expr[0].expression)
+        getattr(switch_expression, "else").CopyFrom(
+            bound_else.referred_expr[0].expression
+        )
+        # A switch has the type of its first branch.
+        return bound, bound_ifs[0][1][1]
 
     return resolve
 
@@ -962,9 +1085,10 @@ def singular_or_list(
 ):
     """Builds a resolver for ExtendedExpression containing a SingularOrList expression"""
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         bound_value = resolve_expression(value, base_schema, registry)
         bound_options = [resolve_expression(o, base_schema, registry) for o in options]
 
@@ -976,26 +1100,17 @@ def singular_or_list(
             bound_value.extensions, *[b.extensions for b in bound_options]
         )
 
-        return stee.ExtendedExpression(
-            referred_expr=[
-                stee.ExpressionReference(
-                    expression=stalg.Expression(
-                        singular_or_list=stalg.Expression.SingularOrList(
-                            value=bound_value.referred_expr[0].expression,
-                            options=[
-                                o.referred_expr[0].expression for o in bound_options
-                            ],
-                        )
-                    ),
-                    output_names=[
-                        "singular_or_list"
-                    ],  # TODO construct name from inputs
-                )
-            ],
-            base_schema=base_schema,
-            extension_urns=extension_urns,
-            extensions=extensions,
+        bound, expression = _single_expression(
+            ["singular_or_list"],  # TODO construct name from inputs
+            base_schema,
+            extension_urns,
+            extensions,
         )
+        singular_or_list = expression.singular_or_list
+        singular_or_list.value.CopyFrom(bound_value.referred_expr[0].expression)
+        for o in bound_options:
+            singular_or_list.options.add().CopyFrom(o.referred_expr[0].expression)
+        return bound, [_NULLABLE_BOOLEAN]
 
     return resolve
 
@@ -1006,9 +1121,10 @@ def multi_or_list(
 ):
     """Builds a resolver for ExtendedExpression containing a MultiOrList expression"""
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         bound_value = [resolve_expression(e, base_schema, registry) for e in value]
         bound_options = [
             [resolve_expression(e, base_schema, registry) for e in o] for o in options
@@ -1024,7 +1140,7 @@ def multi_or_list(
             *[e.extensions for b in bound_options for e in b],
         )
 
-        return stee.ExtendedExpression(
+        bound = stee.ExtendedExpression(
             referred_expr=[
                 stee.ExpressionReference(
                     expression=stalg.Expression(
@@ -1047,6 +1163,7 @@ def multi_or_list(
             extension_urns=extension_urns,
             extensions=extensions,
         )
+        return bound, [_NULLABLE_BOOLEAN]
 
     return resolve
 
@@ -1058,30 +1175,26 @@ def cast(
 ):
     """Builds a resolver for ExtendedExpression containing a cast expression"""
 
+    @_typed_resolver
     def resolve(
         base_schema: stp.NamedStruct, registry: ExtensionRegistry
-    ) -> stee.ExtendedExpression:
+    ) -> tuple[stee.ExtendedExpression, list]:
         bound_input = resolve_expression(input, base_schema, registry)
 
-        return stee.ExtendedExpression(
-            referred_expr=[
-                stee.ExpressionReference(
-                    expression=stalg.Expression(
-                        cast=stalg.Expression.Cast(
-                            input=bound_input.referred_expr[0].expression,
-                            type=type,
-                            failure_behavior=stalg.Expression.Cast.FAILURE_BEHAVIOR_RETURN_NULL,
-                        )
-                    ),
-                    output_names=_alias_or_inferred(
-                        alias, "cast", [bound_input.referred_expr[0].output_names[0]]
-                    ),
-                )
-            ],
-            base_schema=base_schema,
-            extension_urns=bound_input.extension_urns,
-            extensions=bound_input.extensions,
+        bound, expression = _single_expression(
+            _alias_or_inferred(
+                alias, "cast", [bound_input.referred_expr[0].output_names[0]]
+            ),
+            base_schema,
+            bound_input.extension_urns,
+            bound_input.extensions,
+        )
+        expression.cast.input.CopyFrom(bound_input.referred_expr[0].expression)
+        expression.cast.type.CopyFrom(type)
+        expression.cast.failure_behavior = (
+            stalg.Expression.Cast.FAILURE_BEHAVIOR_RETURN_NULL
         )
+        return bound, [type]
 
     return resolve
 
@@ -5,8 +5,13 @@ All builders return UnboundPlan objects that can be materialized to a Plan using
 See `examples/builder_example.py` for usage.
 """
 
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
 import re
-from typing import Callable, Iterable, Optional, Union
+from typing import TYPE_CHECKING, Callable, Iterable, Optional, Union
 
 import substrait.algebra_pb2 as stalg
 import substrait.extended_expression_pb2 as stee
@@ -20,39 +25,48 @@ from substrait.builders.extended_expression import (
     next_rel_anchor,
     resolve_expression,
 )
-from substrait.extension_registry import ExtensionRegistry
 from substrait.type_inference import (
-    _join_output_struct,
+    SchemaNotDerivableError,
     _join_struct_from_schemas,
     _outer_anchor_binding,
     infer_plan_schema,
     join_output_names,
 )
 from substrait.utils import (
+    _child_rel,
+    _iter_child_rels,
     merge_extension_declarations,
     merge_extension_urns,
     plan_subtrees,
     rebase_reference_ordinals,
 )
-from substrait.version import substrait_version
 
-UnboundPlan = Callable[[ExtensionRegistry], stp.Plan]
+if TYPE_CHECKING:
+    from substrait.extension_registry import ExtensionRegistry
+
+UnboundPlan = Callable[["ExtensionRegistry"], stp.Plan]
 
 PlanOrUnbound = Union[stp.Plan, UnboundPlan]
 
 
-def _create_default_version():
-    p = re.compile(r"(\d+)\.(\d+)\.(\d+)")
-    m = p.match(substrait_version)
-    global default_version
-    default_version = stp.Version(
+@functools.cache
+def _default_version() -> stp.Version:
+    """The plan version of the installed ``substrait-protobuf``, read from its
+    package metadata on first use."""
+    from substrait.version import substrait_version
+
+    m = re.match(r"(\d+)\.(\d+)\.(\d+)", substrait_version)
+    return stp.Version(
         major_number=int(m.group(1)),
         minor_number=int(m.group(2)),
         patch_number=int(m.group(3)),
     )
 
 
-_create_default_version()
+def __getattr__(name: str):
+    if name == "default_version":
+        return _default_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def _merge_plan_metadata(*objs):
@@ -125,6 +139,108 @@ def _merge_input_subtrees(bound_inputs):
     return subtree_planrels, rebased_root_inputs
 
 
+class _SchemaSession:
+    """The output schemas of the plans resolved while one top-level plan is built.
+
+    A builder infers its input's schema to bind expressions against it; inferring
+    it from scratch re-walks the whole input tree, which is quadratic over a long
+    builder chain. Instead ``_plan_from`` derives each output schema from its
+    inputs' (already known) schemas and records it here for the consuming builder.
+    Plans do not support weak references, so entries are keyed by ``id`` and keep
+    their plan alive; an input's entry is dropped once it has been consumed.
+    """
+
+    __slots__ = ("registry", "_schemas")
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._schemas: dict = {}  # id(plan) -> (plan, NamedStruct)
+
+    def get(self, plan: stp.Plan) -> Optional[stt.NamedStruct]:
+        entry = self._schemas.get(id(plan))
+        return entry[1] if entry is not None and entry[0] is plan else None
+
+    def put(self, plan: stp.Plan, schema: stt.NamedStruct) -> None:
+        self._schemas[id(plan)] = (plan, schema)
+
+    def take(self, plan: stp.Plan) -> Optional[stt.NamedStruct]:
+        """The schema of ``plan``, forgetting it (``plan`` has been consumed), or
+        None when it cannot be derived (builders that need it infer it
+        themselves and report why)."""
+        schema = self.get(plan)
+        if schema is None:
+            try:
+                return infer_plan_schema(plan, registry=self.registry)
+            except SchemaNotDerivableError:
+                return None
+        del self._schemas[id(plan)]
+        return schema
+
+
+_schema_session: contextvars.ContextVar = contextvars.ContextVar(
+    "schema_session", default=None
+)
+
+
+@contextlib.contextmanager
+def schema_session(registry: Optional[ExtensionRegistry] = None):
+    """Share the schemas of the plans built within the block.
+
+    Every builder's ``resolve`` opens one implicitly when called outside a session,
+    so a builder chain infers each relation's schema once however deep it is.
+    Wrapping several top-level builds in one session shares it across them too;
+    plans built within it must not be modified until it is closed.
+    """
+    token = _schema_session.set(_SchemaSession(registry))
+    try:
+        yield
+    finally:
+        _schema_session.reset(token)
+
+
+def _in_schema_session(resolve: UnboundPlan) -> UnboundPlan:
+    """Run a builder's ``resolve`` in a schema session for its registry."""
+
+    @functools.wraps(resolve)
+    def wrapper(registry: ExtensionRegistry) -> stp.Plan:
+        session = _schema_session.get()
+        if session is not None and session.registry is registry:
+            return resolve(registry)
+        with schema_session(registry):
+            return resolve(registry)
+
+    return wrapper
+
+
+def plan_schema(
+    plan: stp.Plan, registry: Optional[ExtensionRegistry] = None
+) -> stt.NamedStruct:
+    """The output schema of a bound ``plan``.
+
+    Inside a schema session a schema derived while ``plan`` was built is reused,
+    and one inferred here is remembered; otherwise this is ``infer_plan_schema``.
+    """
+    session = _schema_session.get()
+    if session is None or session.registry is not registry:
+        return infer_plan_schema(plan, registry=registry)
+    schema = session.get(plan)
+    if schema is None:
+        schema = infer_plan_schema(plan, registry=registry)
+        session.put(plan, schema)
+    return schema
+
+
+def _input_stub(index: int, struct: Optional[stt.Type.Struct]) -> stalg.Rel:
+    """A placeholder for input ``index`` of a relation under construction: a read
+    of the input's schema, tagged with its position."""
+    return stalg.Rel(
+        read=stalg.ReadRel(
+            base_schema=stt.NamedStruct(struct=struct),
+            named_table=stalg.ReadRel.NamedTable(names=[str(index)]),
+        )
+    )
+
+
 def _plan_from(
     bound_inputs, make_rel, names, metadata_sources, *, include_version=True
 ):
@@ -137,18 +253,51 @@ def _plan_from(
     declarations / execution behavior) is merged from ``metadata_sources`` (input
     plans and bound expressions). This is the single place the CTE subtree
     propagation and Plan assembly live, so every relational builder is one call.
+
+    ``make_rel`` is called with stubs standing in for the inputs, which are copied
+    into place last. Within a schema session the stubs carry the inputs' schemas,
+    so inferring the stubbed plan yields the output schema without walking the
+    inputs; it is recorded for the builder consuming this plan. When an input's
+    schema cannot be derived, none is recorded.
     """
     subtree_planrels, input_rels = _merge_input_subtrees(bound_inputs)
+    session = _schema_session.get()
+    schemas = (
+        [session.take(p) for p in bound_inputs]
+        if session is not None
+        else [None] * len(bound_inputs)
+    )
+    structs = [s.struct if s is not None else None for s in schemas]
     root = stp.PlanRel(
-        root=stalg.RelRoot(input=make_rel(input_rels), names=list(names))
+        root=stalg.RelRoot(
+            input=make_rel([_input_stub(i, s) for i, s in enumerate(structs)]),
+            names=list(names),
+        )
     )
     kwargs = {
         "relations": [*subtree_planrels, root],
         **_merge_plan_metadata(*metadata_sources),
     }
     if include_version:
-        kwargs["version"] = default_version
-    return stp.Plan(**kwargs)
+        kwargs["version"] = _default_version()
+    plan = stp.Plan(**kwargs)
+    schema = None
+    if session is not None and all(s is not None for s in schemas):
+        try:
+            schema = infer_plan_schema(plan, registry=session.registry)
+        except SchemaNotDerivableError:
+            # Not derivable from the node alone (e.g. a write, or an outer
+            # reference to an anchor inside an input); consumers infer the whole
+            # plan instead.
+            pass
+    # Copy the inputs in place rather than through a constructor, which parses
+    # the copy and so rejects plans nested beyond protobuf's recursion limit.
+    for container, key in _iter_child_rels(plan.relations[-1].root.input):
+        stub = _child_rel(container, key)
+        stub.CopyFrom(input_rels[int(stub.read.named_table.names[0])])
+    if schema is not None:
+        session.put(plan, schema)
+    return plan
 
 
 def with_execution_behavior(
@@ -165,6 +314,7 @@ def with_execution_behavior(
     at any point in a pipeline rather than only as the final step.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
 
@@ -186,6 +336,7 @@ def read_named_table(
     elif named_struct.struct.nullability is stt.Type.NULLABILITY_UNSPECIFIED:
         named_struct.struct.nullability = stt.Type.NULLABILITY_REQUIRED
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         _names = [names] if isinstance(names, str) else names
 
@@ -199,7 +350,7 @@ def read_named_table(
         )
 
         return stp.Plan(
-            version=default_version,
+            version=_default_version(),
             relations=[
                 stp.PlanRel(root=stalg.RelRoot(input=rel, names=named_struct.names))
             ],
@@ -219,7 +370,7 @@ def _require_schema(named_struct: stt.NamedStruct) -> stt.NamedStruct:
 
 def _read_plan(named_struct: stt.NamedStruct, read_rel: stalg.ReadRel) -> stp.Plan:
     return stp.Plan(
-        version=default_version,
+        version=_default_version(),
         relations=[
             stp.PlanRel(
                 root=stalg.RelRoot(
@@ -242,6 +393,7 @@ def virtual_table(
     """
     _require_schema(named_struct)
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         structs = [
             stalg.Expression.Nested.Struct(
@@ -273,6 +425,7 @@ def local_files(
     """A ReadRel over local/remote files; ``items`` are pre-built FileOrFiles."""
     _require_schema(named_struct)
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         read_rel = stalg.ReadRel(
             common=stalg.RelCommon(direct=stalg.RelCommon.Direct()),
@@ -293,6 +446,7 @@ def extension_table(
     """A ReadRel over a custom source; ``detail`` is a ``google.protobuf.Any``."""
     _require_schema(named_struct)
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         read_rel = stalg.ReadRel(
             common=stalg.RelCommon(direct=stalg.RelCommon.Direct()),
@@ -324,9 +478,10 @@ def project(
     :rtype: UnboundPlan
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         _plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(_plan, registry=registry)
+        ns = plan_schema(_plan, registry)
         bound_expressions: Iterable[stee.ExtendedExpression] = [
             resolve_expression(e, ns, registry) for e in expressions
         ]
@@ -374,9 +529,10 @@ def select(
     :rtype: UnboundPlan
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         _plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(_plan, registry=registry)
+        ns = plan_schema(_plan, registry)
         bound_expressions: Iterable[stee.ExtendedExpression] = [
             resolve_expression(e, ns, registry) for e in expressions
         ]
@@ -417,9 +573,10 @@ def filter(
     expression: ExtendedExpressionOrUnbound,
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_plan, registry=registry)
+        ns = plan_schema(bound_plan, registry)
         bound_expression: stee.ExtendedExpression = resolve_expression(
             expression, ns, registry
         )
@@ -450,9 +607,10 @@ def sort(
     ],
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_plan, registry=registry)
+        ns = plan_schema(bound_plan, registry)
 
         bound_expressions = [
             (e, stalg.SortField.SORT_DIRECTION_ASC_NULLS_LAST)
@@ -487,6 +645,7 @@ def sort(
 
 
 def set(inputs: Iterable[PlanOrUnbound], op: stalg.SetRel.SetOp) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_inputs = [i if isinstance(i, stp.Plan) else i(registry) for i in inputs]
         return _plan_from(
@@ -513,6 +672,7 @@ def reference(plan: PlanOrUnbound) -> UnboundPlan:
     for :meth:`substrait.dataframe.DataFrame.cache`.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound = plan if isinstance(plan, stp.Plan) else plan(registry)
         nested = [stp.PlanRel(rel=s) for s in plan_subtrees(bound)]
@@ -521,7 +681,7 @@ def reference(plan: PlanOrUnbound) -> UnboundPlan:
         names = list(bound.relations[-1].root.names)
         ref = stalg.Rel(reference=stalg.ReferenceRel(subtree_ordinal=ordinal))
         return stp.Plan(
-            version=default_version,
+            version=_default_version(),
             relations=[
                 *nested,
                 promoted,
@@ -539,9 +699,10 @@ def fetch(
     count: Optional[ExtendedExpressionOrUnbound],
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_plan, registry=registry)
+        ns = plan_schema(bound_plan, registry)
 
         bound_offset = resolve_expression(offset, ns, registry) if offset else None
         # count=None means "all remaining rows" (FetchRel leaves count_expr unset).
@@ -579,11 +740,12 @@ def join(
     post_join_filter: Optional[ExtendedExpressionOrUnbound] = None,
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_left = left if isinstance(left, stp.Plan) else left(registry)
         bound_right = right if isinstance(right, stp.Plan) else right(registry)
-        left_ns = infer_plan_schema(bound_left, registry=registry)
-        right_ns = infer_plan_schema(bound_right, registry=registry)
+        left_ns = plan_schema(bound_left, registry)
+        right_ns = plan_schema(bound_right, registry)
 
         # The join condition binds against the combined left+right schema.
         ns = stt.NamedStruct(
@@ -610,11 +772,8 @@ def join(
         if post_join_filter is not None:
             output_ns = stt.NamedStruct(
                 names=out_names,
-                struct=_join_output_struct(
-                    type_name,
-                    bound_left.relations[-1].root.input,
-                    bound_right.relations[-1].root.input,
-                    registry=registry,
+                struct=_join_struct_from_schemas(
+                    type_name, left_ns.struct, right_ns.struct
                 ),
             )
             bound_post = resolve_expression(post_join_filter, output_ns, registry)
@@ -663,9 +822,10 @@ def lateral_join(
     optional match condition over the combined left+right schema.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_left = left if isinstance(left, stp.Plan) else left(registry)
-        left_ns = infer_plan_schema(bound_left, registry=registry)
+        left_ns = plan_schema(bound_left, registry)
 
         anchor = next_rel_anchor()
         handle = LateralInput(anchor, left_ns)
@@ -679,7 +839,7 @@ def lateral_join(
                 if isinstance(unbound_right, stp.Plan)
                 else unbound_right(registry)
             )
-            right_ns = infer_plan_schema(bound_right, registry=registry)
+            right_ns = plan_schema(bound_right, registry)
 
             # The join condition binds against the combined left+right input row.
             ns = stt.NamedStruct(
@@ -746,11 +906,12 @@ def cross(
     right: PlanOrUnbound,
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_left = left if isinstance(left, stp.Plan) else left(registry)
         bound_right = right if isinstance(right, stp.Plan) else right(registry)
-        left_ns = infer_plan_schema(bound_left, registry=registry)
-        right_ns = infer_plan_schema(bound_right, registry=registry)
+        left_ns = plan_schema(bound_left, registry)
+        right_ns = plan_schema(bound_right, registry)
 
         ns = stt.NamedStruct(
             struct=stt.Type.Struct(
@@ -794,9 +955,10 @@ def aggregate(
     per-measure ``FILTER (WHERE ...)`` predicates (or ``None``).
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_input = input if isinstance(input, stp.Plan) else input(registry)
-        ns = infer_plan_schema(bound_input, registry=registry)
+        ns = plan_schema(bound_input, registry)
 
         bound_grouping_expressions = [
             resolve_expression(e, ns, registry) for e in grouping_expressions
@@ -864,9 +1026,10 @@ def write_named_table(
     op: Union[stalg.WriteRel.WriteOp.ValueType, None] = None,
     output_mode: Union[stalg.WriteRel.OutputMode.ValueType, None] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_input = input if isinstance(input, stp.Plan) else input(registry)
-        ns = infer_plan_schema(bound_input, registry=registry)
+        ns = plan_schema(bound_input, registry)
         _table_names = [table_names] if isinstance(table_names, str) else table_names
         _create_mode = create_mode or stalg.WriteRel.CREATE_MODE_ERROR_IF_EXISTS
         _op = op if op is not None else stalg.WriteRel.WRITE_OP_CTAS
@@ -908,6 +1071,7 @@ def ddl(
     """
     _names = [names] if isinstance(names, str) else list(names)
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         merge_sources = []
         bound_inputs = []
@@ -921,7 +1085,7 @@ def ddl(
             bound_inputs = [view_plan]
             merge_sources.append(view_plan)
             if schema is None:
-                schema = infer_plan_schema(view_plan, registry=registry)
+                schema = plan_schema(view_plan, registry)
 
         out_names = list(schema.names) if schema is not None else []
         return _plan_from(
@@ -953,6 +1117,7 @@ def update(
     """Build an UpdateRel: set ``(column_index -> expression)`` where ``condition``."""
     _names = [table_names] if isinstance(table_names, str) else list(table_names)
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_condition = (
             resolve_expression(condition, table_schema, registry)
@@ -983,7 +1148,7 @@ def update(
         update_rel.named_table.names.extend(_names)
 
         return stp.Plan(
-            version=default_version,
+            version=_default_version(),
             relations=[
                 stp.PlanRel(
                     root=stalg.RelRoot(
@@ -1010,9 +1175,10 @@ def consistent_partition_window(
     ] = (),
     extension: Optional[AdvancedExtension] = None,
 ) -> UnboundPlan:
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_plan, registry=registry)
+        ns = plan_schema(bound_plan, registry)
 
         bound_partitions = [
             resolve_expression(e, ns, registry) for e in partition_expressions
@@ -1104,9 +1270,10 @@ def expand(
     names -- one per field plus a trailing name for the i32 duplicate index.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_input = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_input, registry=registry)
+        ns = plan_schema(bound_input, registry)
 
         expand_fields = []
         merge_sources = [bound_input]
@@ -1154,11 +1321,12 @@ def nested_loop_join(
 ) -> UnboundPlan:
     """A NestedLoopJoinRel: join over the Cartesian product using ``expression``."""
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_left = left if isinstance(left, stp.Plan) else left(registry)
         bound_right = right if isinstance(right, stp.Plan) else right(registry)
-        left_ns = infer_plan_schema(bound_left, registry=registry)
-        right_ns = infer_plan_schema(bound_right, registry=registry)
+        left_ns = plan_schema(bound_left, registry)
+        right_ns = plan_schema(bound_right, registry)
 
         ns = stt.NamedStruct(
             struct=stt.Type.Struct(
@@ -1234,11 +1402,12 @@ def _physical_equi_join(rel_name, rel_cls):
         residual_expression: Optional[ExtendedExpressionOrUnbound] = None,
         extension: Optional[AdvancedExtension] = None,
     ) -> UnboundPlan:
+        @_in_schema_session
         def resolve(registry: ExtensionRegistry) -> stp.Plan:
             bound_left = left if isinstance(left, stp.Plan) else left(registry)
             bound_right = right if isinstance(right, stp.Plan) else right(registry)
-            left_ns = infer_plan_schema(bound_left, registry=registry)
-            right_ns = infer_plan_schema(bound_right, registry=registry)
+            left_ns = plan_schema(bound_left, registry)
+            right_ns = plan_schema(bound_right, registry)
             keys = _comparison_join_keys(
                 list(left_keys), list(right_keys), left_ns, right_ns, registry
             )
@@ -1256,11 +1425,8 @@ def _physical_equi_join(rel_name, rel_cls):
             if post_join_filter is not None:
                 output_ns = stt.NamedStruct(
                     names=names,
-                    struct=_join_output_struct(
-                        type_name,
-                        bound_left.relations[-1].root.input,
-                        bound_right.relations[-1].root.input,
-                        registry=registry,
+                    struct=_join_struct_from_schemas(
+                        type_name, left_ns.struct, right_ns.struct
                     ),
                 )
                 bound_post = resolve_expression(post_join_filter, output_ns, registry)
@@ -1324,6 +1490,7 @@ def extension_leaf(detail, names: Optional[Iterable[str]] = None) -> UnboundPlan
     raw ``Any`` is passed instead of a detail object).
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         out_names = (
             list(detail.derive_schema().names)
@@ -1334,7 +1501,7 @@ def extension_leaf(detail, names: Optional[Iterable[str]] = None) -> UnboundPlan
             extension_leaf=stalg.ExtensionLeafRel(detail=_detail_any(detail))
         )
         return stp.Plan(
-            version=default_version,
+            version=_default_version(),
             relations=[stp.PlanRel(root=stalg.RelRoot(input=rel, names=out_names))],
         )
 
@@ -1349,10 +1516,11 @@ def extension_single(plan: PlanOrUnbound, detail) -> UnboundPlan:
     through, since the detail is then opaque to inference).
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
         if hasattr(detail, "derive_schema"):
-            input_struct = infer_plan_schema(bound_plan, registry=registry).struct
+            input_struct = plan_schema(bound_plan, registry).struct
             names = list(detail.derive_schema(input_struct).names)
         else:
             names = list(bound_plan.relations[-1].root.names)
@@ -1373,11 +1541,10 @@ def extension_single(plan: PlanOrUnbound, detail) -> UnboundPlan:
 def extension_multi(inputs: Iterable[PlanOrUnbound], detail) -> UnboundPlan:
     """An ExtensionMultiRel over ``inputs`` from an ExtensionMultiDetail."""
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_inputs = [i if isinstance(i, stp.Plan) else i(registry) for i in inputs]
-        input_structs = [
-            infer_plan_schema(b, registry=registry).struct for b in bound_inputs
-        ]
+        input_structs = [plan_schema(b, registry).struct for b in bound_inputs]
         names = list(detail.derive_schema(input_structs).names)
         return _plan_from(
             bound_inputs,
@@ -1405,6 +1572,7 @@ def exchange(
     pass ``broadcast=True`` to broadcast every row to all partitions.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
         kind = (
@@ -1444,9 +1612,10 @@ def top_n(
     over the default ``FETCH_MODE_ROWS_ONLY``.
     """
 
+    @_in_schema_session
     def resolve(registry: ExtensionRegistry) -> stp.Plan:
         bound_plan = plan if isinstance(plan, stp.Plan) else plan(registry)
-        ns = infer_plan_schema(bound_plan, registry=registry)
+        ns = plan_schema(bound_plan, registry)
         bound_sorts = [
             (resolve_expression(e, ns, registry), direction) for e, direction in sorts
         ]
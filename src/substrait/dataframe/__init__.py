@@ -30,6 +30,8 @@ available and unchanged.
 
 from __future__ import annotations
 
+import importlib
+
 # Parametrized type builders (need arguments; kept as plain builder functions).
 from substrait.builders.type import (
     decimal,
@@ -65,48 +67,49 @@ from substrait.dataframe.dtypes import (
     string,
     uuid,
 )
-from substrait.dataframe.expr import (
-    Expr,
-    all_,
-    any_,
-    coalesce,
-    col,
-    current_date,
-    current_timestamp,
-    current_timezone,
-    exists,
-    infer_literal_type,
-    lit,
-    outer,
-    parameter,
-    scalar_subquery,
-    unique,
-    when,
-)
-from substrait.dataframe.extension_relations import (
-    ExtensionLeafDetail,
-    ExtensionMultiDetail,
-    ExtensionSingleDetail,
-)
-from substrait.dataframe.frame import (
-    DataFrame,
-    create_table,
-    create_view,
-    default_registry,
-    drop_table,
-    drop_view,
-    extension_leaf,
-    from_records,
-    read_arrow,
-    read_csv,
-    read_extension_table,
-    read_named_table,
-    read_orc,
-    read_parquet,
-    update_table,
-)
-from substrait.dataframe.functions import f, functions_for
-from substrait.extension_registry import ExtensionRegistry
+
+# Entry points, expressions, functions and the registry: imported from their
+# modules on first access (see __getattr__), so importing the package stays
+# cheap until a plan is actually built.
+_LAZY = {
+    "Expr": "substrait.dataframe.expr",
+    "all_": "substrait.dataframe.expr",
+    "any_": "substrait.dataframe.expr",
+    "coalesce": "substrait.dataframe.expr",
+    "col": "substrait.dataframe.expr",
+    "current_date": "substrait.dataframe.expr",
+    "current_timestamp": "substrait.dataframe.expr",
+    "current_timezone": "substrait.dataframe.expr",
+    "exists": "substrait.dataframe.expr",
+    "infer_literal_type": "substrait.dataframe.expr",
+    "lit": "substrait.dataframe.expr",
+    "outer": "substrait.dataframe.expr",
+    "parameter": "substrait.dataframe.expr",
+    "scalar_subquery": "substrait.dataframe.expr",
+    "unique": "substrait.dataframe.expr",
+    "when": "substrait.dataframe.expr",
+    "ExtensionLeafDetail": "substrait.dataframe.extension_relations",
+    "ExtensionMultiDetail": "substrait.dataframe.extension_relations",
+    "ExtensionSingleDetail": "substrait.dataframe.extension_relations",
+    "DataFrame": "substrait.dataframe.frame",
+    "create_table": "substrait.dataframe.frame",
+    "create_view": "substrait.dataframe.frame",
+    "default_registry": "substrait.dataframe.frame",
+    "drop_table": "substrait.dataframe.frame",
+    "drop_view": "substrait.dataframe.frame",
+    "extension_leaf": "substrait.dataframe.frame",
+    "from_records": "substrait.dataframe.frame",
+    "read_arrow": "substrait.dataframe.frame",
+    "read_csv": "substrait.dataframe.frame",
+    "read_extension_table": "substrait.dataframe.frame",
+    "read_named_table": "substrait.dataframe.frame",
+    "read_orc": "substrait.dataframe.frame",
+    "read_parquet": "substrait.dataframe.frame",
+    "update_table": "substrait.dataframe.frame",
+    "f": "substrait.dataframe.functions",
+    "functions_for": "substrait.dataframe.functions",
+    "ExtensionRegistry": "substrait.extension_registry",
+}
 
 __all__ = [
     # entry points
@@ -177,3 +180,16 @@ __all__ = [
     "infer_literal_type",
     "parameter",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,204 @@
+"""Default extension functions: the catalog read by ``sub.f``.
+
+Generated by ``python -m substrait.dataframe.function_catalog``; do not
+edit.
+"""
+
+CATALOG_FORMAT = 1
+EXTENSIONS_DIGEST = "262b3389cd2c907015ca0916229027acacc63f29c025516341b5b91975dc7176"
+
+URNS = (
+    "extension:io.substrait:functions_aggregate_approx",
+    "extension:io.substrait:functions_aggregate_decimal_output",
+    "extension:io.substrait:functions_aggregate_generic",
+    "extension:io.substrait:functions_arithmetic",
+    "extension:io.substrait:functions_arithmetic_decimal",
+    "extension:io.substrait:functions_boolean",
+    "extension:io.substrait:functions_comparison",
+    "extension:io.substrait:functions_datetime",
+    "extension:io.substrait:functions_geometry",
+    "extension:io.substrait:functions_list",
+    "extension:io.substrait:functions_logarithmic",
+    "extension:io.substrait:functions_rounding",
+    "extension:io.substrait:functions_rounding_decimal",
+    "extension:io.substrait:functions_set",
+    "extension:io.substrait:functions_string",
+)
+
+# (name, function type, indexes into URNS in resolution order)
+FUNCTIONS = (
+    ("abs", "scalar", (3, 4)),
+    ("acos", "scalar", (3,)),
+    ("acosh", "scalar", (3,)),
+    ("add", "scalar", (3, 7, 4)),
+    ("add_intervals", "scalar", (7,)),
+    ("all_match", "scalar", (9,)),
+    ("and", "scalar", (5,)),
+    ("and_not", "scalar", (5,)),
+    ("any_match", "scalar", (9,)),
+    ("any_value", "aggregate", (2,)),
+    ("approx_count_distinct", "aggregate", (1, 0)),
+    ("asin", "scalar", (3,)),
+    ("asinh", "scalar", (3,)),
+    ("assume_timezone", "scalar", (7,)),
+    ("atan", "scalar", (3,)),
+    ("atan2", "scalar", (3,)),
+    ("atanh", "scalar", (3,)),
+    ("avg", "aggregate", (3, 4)),
+    ("between", "scalar", (6,)),
+    ("bit_length", "scalar", (14,)),
+    ("bitwise_and", "scalar", (3, 4)),
+    ("bitwise_not", "scalar", (3,)),
+    ("bitwise_or", "scalar", (3, 4)),
+    ("bitwise_xor", "scalar", (3, 4)),
+    ("bool_and", "aggregate", (5,)),
+    ("bool_or", "aggregate", (5,)),
+    ("buffer", "scalar", (8,)),
+    ("capitalize", "scalar", (14,)),
+    ("cardinality", "scalar", (9,)),
+    ("ceil", "scalar", (11, 12)),
+    ("center", "scalar", (14,)),
+    ("centroid", "scalar", (8,)),
+    ("char_length", "scalar", (14,)),
+    ("coalesce", "scalar", (6,)),
+    ("collection_extract", "scalar", (8,)),
+    ("concat", "scalar", (14,)),
+    ("concat_ws", "scalar", (14,)),
+    ("contains", "scalar", (14,)),
+    ("corr", "aggregate", (3,)),
+    ("cos", "scalar", (3,)),
+    ("cosh", "scalar", (3,)),
+    ("count", "aggregate", (2, 1)),
+    ("count_substring", "scalar", (14,)),
+    ("cume_dist", "window", (3,)),
+    ("degrees", "scalar", (3,)),
+    ("dense_rank", "window", (3,)),
+    ("dimension", "scalar", (8,)),
+    ("divide", "scalar", (3, 4)),
+    ("ends_with", "scalar", (14,)),
+    ("envelope", "scalar", (8,)),
+    ("equal", "scalar", (6,)),
+    ("exp", "scalar", (3,)),
+    ("extract", "scalar", (7,)),
+    ("extract_boolean", "scalar", (7,)),
+    ("factorial", "scalar", (3, 4)),
+    ("filter", "scalar", (9,)),
+    ("first_value", "window", (3,)),
+    ("flip_coordinates", "scalar", (8,)),
+    ("floor", "scalar", (11, 12)),
+    ("geometry_type", "scalar", (8,)),
+    ("greatest", "scalar", (6,)),
+    ("greatest_skip_null", "scalar", (6,)),
+    ("gt", "scalar", (6, 7)),
+    ("gte", "scalar", (6, 7)),
+    ("index_in", "scalar", (13,)),
+    ("initcap", "scalar", (14,)),
+    ("is_closed", "scalar", (8,)),
+    ("is_distinct_from", "scalar", (6,)),
+    ("is_empty", "scalar", (8,)),
+    ("is_false", "scalar", (6,)),
+    ("is_finite", "scalar", (6,)),
+    ("is_infinite", "scalar", (6,)),
+    ("is_nan", "scalar", (6,)),
+    ("is_not_distinct_from", "scalar", (6,)),
+    ("is_not_false", "scalar", (6,)),
+    ("is_not_null", "scalar", (6,)),
+    ("is_not_true", "scalar", (6,)),
+    ("is_null", "scalar", (6,)),
+    ("is_ring", "scalar", (8,)),
+    ("is_simple", "scalar", (8,)),
+    ("is_true", "scalar", (6,)),
+    ("is_valid", "scalar", (8,)),
+    ("lag", "window", (3,)),
+    ("last_value", "window", (3,)),
+    ("lead", "window", (3,)),
+    ("least", "scalar", (6,)),
+    ("least_skip_null", "scalar", (6,)),
+    ("left", "scalar", (14,)),
+    ("like", "scalar", (14,)),
+    ("ln", "scalar", (10,)),
+    ("local_timestamp", "scalar", (7,)),
+    ("log10", "scalar", (10,)),
+    ("log1p", "scalar", (10,)),
+    ("log2", "scalar", (10,)),
+    ("logb", "scalar", (10,)),
+    ("lower", "scalar", (14,)),
+    ("lpad", "scalar", (14,)),
+    ("lt", "scalar", (6, 7)),
+    ("lte", "scalar", (6, 7)),
+    ("ltrim", "scalar", (14,)),
+    ("make_line", "scalar", (8,)),
+    ("max", "aggregate", (3, 7, 4)),
+    ("median", "aggregate", (3,)),
+    ("min", "aggregate", (3, 7, 4)),
+    ("minimum_bounding_circle", "scalar", (8,)),
+    ("mode", "aggregate", (3,)),
+    ("modulus", "scalar", (3, 4)),
+    ("multiply", "scalar", (3, 7, 4)),
+    ("negate", "scalar", (3,)),
+    ("not", "scalar", (5,)),
+    ("not_equal", "scalar", (6,)),
+    ("nth_value", "window", (3,)),
+    ("ntile", "window", (3,)),
+    ("nullif", "scalar", (6,)),
+    ("num_points", "scalar", (8,)),
+    ("octet_length", "scalar", (14,)),
+    ("or", "scalar", (5,)),
+    ("percent_rank", "window", (3,)),
+    ("point", "scalar", (8,)),
+    ("power", "scalar", (3, 4)),
+    ("product", "aggregate", (3,)),
+    ("quantile", "aggregate", (3,)),
+    ("radians", "scalar", (3,)),
+    ("rank", "window", (3,)),
+    ("regexp_count_substring", "scalar", (14,)),
+    ("regexp_match_substring", "scalar", (14,)),
+    ("regexp_match_substring_all", "scalar", (14,)),
+    ("regexp_replace", "scalar", (14,)),
+    ("regexp_string_split", "scalar", (14,)),
+    ("regexp_strpos", "scalar", (14,)),
+    ("remove_repeated_points", "scalar", (8,)),
+    ("repeat", "scalar", (14,)),
+    ("replace", "scalar", (14,)),
+    ("replace_slice", "scalar", (14,)),
+    ("reverse", "scalar", (14,)),
+    ("right", "scalar", (14,)),
+    ("round", "scalar", (11, 12)),
+    ("round_calendar", "scalar", (7,)),
+    ("round_temporal", "scalar", (7,)),
+    ("row_number", "window", (3,)),
+    ("rpad", "scalar", (14,)),
+    ("rtrim", "scalar", (14,)),
+    ("shift_left", "scalar", (3,)),
+    ("shift_right", "scalar", (3,)),
+    ("shift_right_unsigned", "scalar", (3,)),
+    ("sign", "scalar", (3,)),
+    ("sin", "scalar", (3,)),
+    ("sinh", "scalar", (3,)),
+    ("sort", "scalar", (9,)),
+    ("sqrt", "scalar", (3, 4)),
+    ("starts_with", "scalar", (14,)),
+    ("std_dev", "aggregate", (3,)),
+    ("strftime", "scalar", (7,)),
+    ("string_agg", "aggregate", (14,)),
+    ("string_split", "scalar", (14,)),
+    ("strpos", "scalar", (14,)),
+    ("strptime_date", "scalar", (7,)),
+    ("strptime_time", "scalar", (7,)),
+    ("strptime_timestamp", "scalar", (7,)),
+    ("substring", "scalar", (14,)),
+    ("subtract", "scalar", (3, 7, 4)),
+    ("sum", "aggregate", (3, 4)),
+    ("sum0", "aggregate", (3, 4)),
+    ("swapcase", "scalar", (14,)),
+    ("tan", "scalar", (3,)),
+    ("tanh", "scalar", (3,)),
+    ("title", "scalar", (14,)),
+    ("transform", "scalar", (9,)),
+    ("trim", "scalar", (14,)),
+    ("upper", "scalar", (14,)),
+    ("variance", "aggregate", (3,)),
+    ("x_coordinate", "scalar", (8,)),
+    ("xor", "scalar", (5,)),
+    ("y_coordinate", "scalar", (8,)),
+)
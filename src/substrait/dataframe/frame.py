@@ -29,7 +29,7 @@ native frame; the two layers compose rather than compete.
 from __future__ import annotations
 
 from itertools import combinations
-from typing import Any, Callable, Iterable, Optional, Union
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Union
 
 import substrait.algebra_pb2 as stalg
 import substrait.plan_pb2 as stplan
@@ -39,10 +39,11 @@ from substrait.builders import plan as _plan
 from substrait.builders import type as _type
 from substrait.builders.extended_expression import LateralInput, fresh_rel_anchors
 from substrait.dataframe.expr import Expr, Measure, col, lit, sort_direction
-from substrait.extension_registry import ExtensionRegistry
-from substrait.type_inference import infer_plan_schema
 from substrait.utils import to_id_based_outer_references
 
+if TYPE_CHECKING:
+    from substrait.extension_registry import ExtensionRegistry
+
 # All 13 JoinRel.JoinType variants (SET_OP_UNSPECIFIED excluded). "single"
 # returns at most one right match per left row (runtime error on multiple);
 # "mark" appends a nullable-boolean column flagging whether a partner exists.
@@ -146,6 +147,8 @@ def default_registry() -> ExtensionRegistry:
     """A lazily-created registry preloaded with the standard extensions."""
     global _default_registry
     if _default_registry is None:
+        from substrait.extension_registry import ExtensionRegistry
+
         _default_registry = ExtensionRegistry(load_default_extensions=True)
     return _default_registry
 
@@ -250,7 +253,7 @@ class DataFrame:
 
         def resolve(registry: ExtensionRegistry):
             bound = inner(registry)
-            names = list(infer_plan_schema(bound, registry=registry).names)
+            names = list(_plan.plan_schema(bound, registry).names)
             unknown = set(mapping) - set(names)
             if unknown:
                 raise ValueError(f"rename got unknown columns: {sorted(unknown)}")
@@ -269,7 +272,7 @@ class DataFrame:
 
         def resolve(registry: ExtensionRegistry):
             bound = inner(registry)
-            names = list(infer_plan_schema(bound, registry=registry).names)
+            names = list(_plan.plan_schema(bound, registry).names)
             unknown = drop_set - set(names)
             if unknown:
                 raise ValueError(f"drop got unknown columns: {sorted(unknown)}")
@@ -804,8 +807,9 @@ class DataFrame:
         lateral join's builder assigns them directly, and any offset-based
         ``steps_out`` a correlated subquery produced is rewritten here. Building
         under ``fresh_rel_anchors`` numbers lateral-join anchors from 1 per
-        materialization, so building the same frame twice yields identical plans."""
-        with fresh_rel_anchors():
+        materialization, so building the same frame twice yields identical plans.
+        The whole build shares one schema session (see ``plan.schema_session``)."""
+        with fresh_rel_anchors(), _plan.schema_session(registry):
             plan = self._plan(registry)
         return to_id_based_outer_references(plan)
 
@@ -0,0 +1,111 @@
+"""A generated catalog of the default extensions' function names.
+
+``sub.f`` needs only the name, type and candidate URNs of each default
+function to create its helpers; the overloads themselves are resolved when a
+plan is built. The catalog (``_default_functions``) lists those, so ``sub.f``
+does not have to construct and load a registry first. It records a digest of
+the extension files it was generated from and is ignored, in favour of the
+default registry, when the installed files differ.
+
+Regenerate it after upgrading ``substrait-extensions`` with
+``python -m substrait.dataframe.function_catalog``.
+"""
+
+import hashlib
+import sys
+from importlib.resources import files as importlib_files
+from pathlib import Path
+from typing import Optional
+
+# Bumped whenever the layout of the generated module changes.
+CATALOG_FORMAT = 1
+
+CATALOG_PATH = Path(__file__).with_name("_default_functions.py")
+
+
+def extensions_digest() -> str:
+    """A digest of the names and contents of the default extension files."""
+    # The files of registry.default_extension_paths, listed without importing
+    # the registry.
+    extensions = importlib_files("substrait_extensions.extensions")
+    paths = extensions.glob("functions*.yaml")  # type: ignore
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=lambda path: path.name):
+        digest.update(path.name.encode() + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def catalog_functions() -> Optional[list]:
+    """``(name, urns, function type value)`` of every default function, with
+    ``urns`` in resolution order, or None if the catalog is missing or was
+    generated from other extension files."""
+    try:
+        from substrait.dataframe import _default_functions as catalog
+    except ImportError:
+        return None
+    if (
+        catalog.CATALOG_FORMAT != CATALOG_FORMAT
+        or catalog.EXTENSIONS_DIGEST != extensions_digest()
+    ):
+        return None
+    urns = catalog.URNS
+    return [
+        (name, [urns[i] for i in indexes], ftype)
+        for name, ftype, indexes in catalog.FUNCTIONS
+    ]
+
+
+def generate_catalog(registry=None) -> str:
+    """The source of the catalog module for the functions of ``registry``
+    (a default registry if None)."""
+    from substrait.dataframe.functions import _registry_functions
+
+    if registry is None:
+        from substrait.extension_registry import ExtensionRegistry
+
+        registry = ExtensionRegistry()
+    functions = sorted(_registry_functions(registry))
+    urns = sorted({urn for _, function_urns, _ in functions for urn in function_urns})
+    position = {urn: i for i, urn in enumerate(urns)}
+    lines = [
+        '"""Default extension functions: the catalog read by ``sub.f``.',
+        "",
+        "Generated by ``python -m substrait.dataframe.function_catalog``; do not",
+        "edit.",
+        '"""',
+        "",
+        f"CATALOG_FORMAT = {CATALOG_FORMAT}",
+        f'EXTENSIONS_DIGEST = "{extensions_digest()}"',
+        "",
+        "URNS = (",
+        *(f'    "{urn}",' for urn in urns),
+        ")",
+        "",
+        "# (name, function type, indexes into URNS in resolution order)",
+        "FUNCTIONS = (",
+    ]
+    for name, function_urns, ftype in functions:
+        indexes = ", ".join(str(position[urn]) for urn in function_urns)
+        if len(function_urns) == 1:
+            indexes += ","
+        lines.append(f'    ("{name}", "{ftype}", ({indexes})),')
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) > 1:
+        print(
+            "usage: python -m substrait.dataframe.function_catalog [PATH]",
+            file=sys.stderr,
+        )
+        return 2
+    path = Path(args[0]) if args else CATALOG_PATH
+    path.write_text(generate_catalog())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
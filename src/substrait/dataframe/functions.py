@@ -12,9 +12,11 @@ ships is reachable by name and hides the extension-URN / signature plumbing::
     sub.f.row_number()
 
 Each helper returns an :class:`~substrait.dataframe.expr.Expr`. The namespace is
-built lazily on first attribute access from
-:func:`substrait.dataframe.frame.default_registry`,
-and supports ``dir(sub.f)`` for discovery/tab-completion.
+built lazily on first attribute access from the generated catalog of default
+functions (see :mod:`substrait.dataframe.function_catalog`), so no registry is
+constructed until a plan is resolved, or from
+:func:`substrait.dataframe.frame.default_registry` when the catalog is stale.
+It supports ``dir(sub.f)`` for discovery/tab-completion.
 
 Some function names appear in more than one extension (e.g. ``add`` in
 ``functions_arithmetic``, ``functions_arithmetic_decimal`` and
@@ -32,8 +34,7 @@ column's type; the explicit ``f.*`` helpers do not, so pass typed operands
 from __future__ import annotations
 
 import keyword
-from collections import defaultdict
-from typing import Any
+from typing import Any, Iterable
 
 from substrait.builders.extended_expression import (
     aggregate_function,
@@ -42,12 +43,12 @@ from substrait.builders.extended_expression import (
     window_function,
 )
 from substrait.dataframe.expr import Expr, _resolve_over_urns
-from substrait.extension_registry.function_entry import FunctionType
 
+# Keyed by FunctionType value, so the registry modules are not imported.
 _BUILDERS = {
-    FunctionType.SCALAR: scalar_function,
-    FunctionType.AGGREGATE: aggregate_function,
-    FunctionType.WINDOW: window_function,
+    "scalar": scalar_function,
+    "aggregate": aggregate_function,
+    "window": window_function,
 }
 
 
@@ -93,24 +94,27 @@ def _multi_urn_helper(builder, urns: list[str], name: str):
     return helper
 
 
-def _build_functions(registry) -> dict:
-    grouped: dict = defaultdict(lambda: [None, []])  # name -> [function_type, urns]
-    for urn, name, ftype in registry.iter_functions():
-        grouped[name][0] = ftype
-        grouped[name][1].append(urn)
+def _registry_functions(registry) -> list:
+    """``(name, urns, function type value)`` of every function name on
+    ``registry``, with ``urns`` in resolution order."""
+    functions = []
+    for name, urns, ftype in registry.iter_function_names():
+        urns = sorted(urns, key=lambda u: (_urn_priority(u), urns.index(u)))
+        functions.append((name, urns, ftype.value))
+    return functions
+
 
+def _build_functions(functions: Iterable) -> dict:
     fns: dict = {}
-    for name, (ftype, urns) in grouped.items():
+    for name, urns, ftype in functions:
         builder = _BUILDERS[ftype]
-        urns = sorted(urns, key=lambda u: (_urn_priority(u), urns.index(u)))
         if len(urns) == 1:
             helper = _single_urn_helper(builder, urns[0], name)
         else:
             helper = _multi_urn_helper(builder, urns, name)
         helper.__name__ = _safe_name(name)
         helper.__doc__ = (
-            f"Substrait {ftype.value} function '{name}' "
-            f"(extensions: {', '.join(urns)})."
+            f"Substrait {ftype} function '{name}' (extensions: {', '.join(urns)})."
         )
         key = _safe_name(name)
         fns[key] = helper
@@ -133,11 +137,18 @@ class _FunctionNamespace:
     def _ensure(self) -> dict:
         if self._fns is None:
             registry = self._registry
+            functions = None
             if registry is None:
-                from substrait.dataframe.frame import default_registry
+                from substrait.dataframe.function_catalog import catalog_functions
+
+                functions = catalog_functions()
+                if functions is None:
+                    from substrait.dataframe.frame import default_registry
 
-                registry = default_registry()
-            object.__setattr__(self, "_fns", _build_functions(registry))
+                    registry = default_registry()
+            if functions is None:
+                functions = _registry_functions(registry)
+            object.__setattr__(self, "_fns", _build_functions(functions))
         return self._fns
 
     def __getattr__(self, item: str):
@@ -0,0 +1,188 @@
+"""The ANTLR-generated ``SubstraitTypeParser`` backend of
+:mod:`substrait.derivation_expression`.
+
+Kept in its own module so that the ANTLR runtime is imported only when this
+fallback parser is selected or a caller hands over an ANTLR parse tree.
+"""
+
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.error.ErrorListener import ErrorListener
+from substrait_antlr.substrait_type.SubstraitTypeLexer import SubstraitTypeLexer
+from substrait_antlr.substrait_type.SubstraitTypeParser import SubstraitTypeParser
+
+from substrait import derivation_parser as dp
+from substrait.derivation_parser import DerivationExpressionParseError
+
+
+class _RaisingErrorListener(ErrorListener):
+    """ANTLR error listener that raises instead of recovering.
+
+    ANTLR's default behaviour on a syntax error is to print a warning to
+    stderr and continue with a partial (possibly ``None``-containing) parse
+    tree.  We want the parse to fail loudly with a message naming the offending
+    input instead.
+    """
+
+    def __init__(self, expression: str):
+        super().__init__()
+        self._expression = expression
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise DerivationExpressionParseError(
+            f"Could not parse derivation expression {self._expression!r} "
+            f"at line {line}:{column}: {msg}"
+        ) from e
+
+
+_BINARY_CONTEXTS = (
+    SubstraitTypeParser.MulDivContext,
+    SubstraitTypeParser.AddSubContext,
+    SubstraitTypeParser.ComparisonContext,
+    SubstraitTypeParser.EqualityContext,
+    SubstraitTypeParser.AndContext,
+    SubstraitTypeParser.OrContext,
+)
+
+_SCALAR_CONTEXTS = {
+    SubstraitTypeParser.I8Context: "i8",
+    SubstraitTypeParser.I16Context: "i16",
+    SubstraitTypeParser.I32Context: "i32",
+    SubstraitTypeParser.I64Context: "i64",
+    SubstraitTypeParser.Fp32Context: "fp32",
+    SubstraitTypeParser.Fp64Context: "fp64",
+    SubstraitTypeParser.BooleanContext: "bool",
+    SubstraitTypeParser.StringContext: "string",
+    SubstraitTypeParser.BinaryContext: "binary",
+    SubstraitTypeParser.DateContext: "date",
+    SubstraitTypeParser.IntervalYearContext: "interval_year",
+    SubstraitTypeParser.UuidContext: "uuid",
+}
+
+_PARAMETERIZED_CONTEXTS = {
+    SubstraitTypeParser.DecimalContext: "decimal",
+    SubstraitTypeParser.VarCharContext: "varchar",
+    SubstraitTypeParser.FixedCharContext: "fixed_char",
+    SubstraitTypeParser.FixedBinaryContext: "fixed_binary",
+    SubstraitTypeParser.PrecisionTimeContext: "precision_time",
+    SubstraitTypeParser.PrecisionTimestampContext: "precision_timestamp",
+    SubstraitTypeParser.PrecisionTimestampTZContext: "precision_timestamp_tz",
+    SubstraitTypeParser.PrecisionIntervalDayContext: "interval_day",
+    SubstraitTypeParser.PrecisionIntervalCompoundContext: "interval_compound",
+}
+
+
+def to_node(x) -> dp.Node:
+    """Convert an ANTLR ``SubstraitTypeParser`` parse tree into the equivalent
+    :mod:`substrait.derivation_parser` node tree."""
+    if isinstance(x, _BINARY_CONTEXTS):
+        return dp.BinaryOp(x.op.text.lower(), to_node(x.left), to_node(x.right))
+    elif isinstance(x, SubstraitTypeParser.NotExprContext):
+        return dp.Not(to_node(x.expr()))
+    elif isinstance(
+        x, (SubstraitTypeParser.IfExprContext, SubstraitTypeParser.TernaryContext)
+    ):
+        return dp.Conditional(
+            to_node(x.ifExpr), to_node(x.thenExpr), to_node(x.elseExpr)
+        )
+    elif isinstance(
+        x,
+        (
+            SubstraitTypeParser.LiteralNumberContext,
+            SubstraitTypeParser.NumericLiteralContext,
+        ),
+    ):
+        return dp.Number(int(x.Number().symbol.text))
+    elif isinstance(x, SubstraitTypeParser.ParameterNameContext):
+        return dp.ParameterName(x.Identifier().symbol.text, x.isnull is not None)
+    elif isinstance(x, SubstraitTypeParser.NumericParameterNameContext):
+        return dp.ParameterName(x.Identifier().symbol.text, False)
+    elif isinstance(
+        x,
+        (
+            SubstraitTypeParser.ParenExpressionContext,
+            SubstraitTypeParser.NumericExpressionContext,
+        ),
+    ):
+        return to_node(x.expr())
+    elif isinstance(x, SubstraitTypeParser.FunctionCallContext):
+        return dp.FunctionCall(
+            x.Identifier().symbol.text, tuple(to_node(e) for e in x.expr())
+        )
+    elif isinstance(x, SubstraitTypeParser.MultilineDefinitionContext):
+        return dp.Program(
+            tuple(
+                (i.symbol.text, to_node(e)) for i, e in zip(x.Identifier(), x.expr())
+            ),
+            to_node(x.finalType),
+        )
+    elif isinstance(x, SubstraitTypeParser.TypeLiteralContext):
+        return to_node(x.typeDef())
+    elif isinstance(x, SubstraitTypeParser.TypeDefContext):
+        if x.scalarType():
+            return dp.ScalarType(
+                _SCALAR_CONTEXTS[type(x.scalarType())], x.isnull is not None
+            )
+        elif x.parameterizedType():
+            return _parameterizedto_node(x.parameterizedType())
+        any_type = x.anyType()
+        any_var = any_type.AnyVar()
+        return dp.AnyType(
+            any_var.symbol.text if any_var else None, any_type.isnull is not None
+        )
+    raise TypeError(f"Unknown parse tree node {type(x).__name__}")
+
+
+def _parameterizedto_node(x) -> dp.Node:
+    nullable = x.isnull is not None
+    if type(x) in _PARAMETERIZED_CONTEXTS:
+        kind = _PARAMETERIZED_CONTEXTS[type(x)]
+        return dp.ParameterizedType(
+            kind,
+            nullable,
+            tuple(to_node(getattr(x, name)) for name in dp.PARAMETER_NAMES[kind]),
+        )
+    elif isinstance(x, SubstraitTypeParser.StructContext):
+        return dp.StructType(nullable, tuple(to_node(e) for e in x.expr()))
+    elif isinstance(x, SubstraitTypeParser.NStructContext):
+        return dp.NamedStructType(
+            nullable,
+            tuple(i.symbol.text for i in x.Identifier()),
+            tuple(to_node(e) for e in x.expr()),
+        )
+    elif isinstance(x, SubstraitTypeParser.ListContext):
+        return dp.ListType(nullable, to_node(x.expr()))
+    elif isinstance(x, SubstraitTypeParser.MapContext):
+        return dp.MapType(nullable, to_node(x.key), to_node(x.value))
+    elif isinstance(x, SubstraitTypeParser.FuncContext):
+        params = x.params.expr()
+        if not isinstance(params, list):
+            params = [params]
+        return dp.FuncType(
+            nullable, tuple(to_node(e) for e in params), to_node(x.returnType)
+        )
+    elif isinstance(x, SubstraitTypeParser.UserDefinedContext):
+        return dp.UserDefinedType(
+            x.Identifier()[-1].symbol.text,
+            nullable,
+            tuple(to_node(e) for e in x.expr()),
+            x.dependencyAlias.text if x.dependencyAlias else None,
+        )
+    raise TypeError(f"Unknown parse tree node {type(x).__name__}")
+
+
+def parse(x: str):
+    """Parse ``x`` into an ANTLR parse tree, raising
+    :class:`DerivationExpressionParseError` on a syntax error."""
+    error_listener = _RaisingErrorListener(x)
+
+    lexer = SubstraitTypeLexer(InputStream(x))
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(error_listener)
+
+    stream = CommonTokenStream(lexer)
+
+    parser = SubstraitTypeParser(stream)
+    parser.removeErrorListeners()
+    parser.addErrorListener(error_listener)
+
+    return parser.expr()
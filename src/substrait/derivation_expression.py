@@ -1,38 +1,30 @@
-import operator
-from typing import Optional
-
-from antlr4 import CommonTokenStream, InputStream
-from antlr4.error.ErrorListener import ErrorListener
-from substrait.type_pb2 import NamedStruct, Type
-from substrait_antlr.substrait_type.SubstraitTypeLexer import SubstraitTypeLexer
-from substrait_antlr.substrait_type.SubstraitTypeParser import SubstraitTypeParser
+"""Evaluation of Substrait type and derivation expressions.
 
+Expressions are parsed into :mod:`substrait.derivation_parser` node trees, either
+by the hand-written parser (the default ``"native"`` backend) or by the
+ANTLR-generated ``SubstraitTypeParser`` (the ``"antlr"`` fallback, see
+:func:`set_parser_backend`), and compiled into reusable closures. The ANTLR
+runtime is only imported once the fallback is actually used.
+"""
 
-class DerivationExpressionParseError(Exception):
-    """Raised when a derivation expression cannot be parsed."""
+import operator
+from typing import Any, Callable, Optional
 
+from substrait.type_pb2 import NamedStruct, Type
 
-class _RaisingErrorListener(ErrorListener):
-    """ANTLR error listener that raises instead of recovering.
+from substrait import derivation_parser as dp
+from substrait.derivation_parser import DerivationExpressionParseError  # noqa: F401
+from substrait.utils.lru import CacheInfo, LRUCache
 
-    ANTLR's default behaviour on a syntax error is to print a warning to
-    stderr and continue with a partial (possibly ``None``-containing) parse
-    tree.  We want the parse to fail loudly with a message naming the offending
-    input instead.
-    """
+# Number of distinct expression strings whose parse trees are kept process-wide.
+DEFAULT_PARSE_CACHE_SIZE = 1024
 
-    def __init__(self, expression: str):
-        super().__init__()
-        self._expression = expression
+PARSER_BACKENDS = ("native", "antlr")
 
-    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
-        raise DerivationExpressionParseError(
-            f"Could not parse derivation expression {self._expression!r} "
-            f"at line {line}:{column}: {msg}"
-        ) from e
+_parser_backend = "native"
 
 
-# Binary operators keyed by the token text the grammar attaches to `op`.
+# Binary operators keyed by their node text.
 # (Integer division: type parameters like precision/scale are integers.)
 _BINARY_OPS = {
     "*": operator.mul,
@@ -47,244 +39,284 @@ _BINARY_OPS = {
     "!=": operator.ne,
 }
 
-# The 0.95 grammar split the single BinaryExpr rule into these per-operator rules.
-_BINARY_CONTEXTS = (
-    SubstraitTypeParser.MulDivContext,
-    SubstraitTypeParser.AddSubContext,
-    SubstraitTypeParser.ComparisonContext,
-    SubstraitTypeParser.EqualityContext,
-)
+# ScalarType kind -> Type message class.
+_SCALAR_MESSAGES = {
+    "i8": Type.I8,
+    "i16": Type.I16,
+    "i32": Type.I32,
+    "i64": Type.I64,
+    "fp32": Type.FP32,
+    "fp64": Type.FP64,
+    "bool": Type.Boolean,
+    "string": Type.String,
+    "binary": Type.Binary,
+    "date": Type.Date,
+    "interval_year": Type.IntervalYear,
+    "uuid": Type.UUID,
+}
 
+# ParameterizedType kind -> Type message class.
+_PARAMETERIZED_MESSAGES = {
+    "decimal": Type.Decimal,
+    "varchar": Type.VarChar,
+    "fixed_char": Type.FixedChar,
+    "fixed_binary": Type.FixedBinary,
+    "precision_time": Type.PrecisionTime,
+    "precision_timestamp": Type.PrecisionTimestamp,
+    "precision_timestamp_tz": Type.PrecisionTimestampTZ,
+    "interval_day": Type.IntervalDay,
+    "interval_compound": Type.IntervalCompound,
+}
 
-def _evaluate(x, values: dict):
-    if isinstance(x, _BINARY_CONTEXTS):
-        left = _evaluate(x.left, values)
-        right = _evaluate(x.right, values)
-        return _BINARY_OPS[x.op.text](left, right)
-    elif isinstance(x, SubstraitTypeParser.AndContext):
-        return _evaluate(x.left, values) and _evaluate(x.right, values)
-    elif isinstance(x, SubstraitTypeParser.OrContext):
-        return _evaluate(x.left, values) or _evaluate(x.right, values)
-    elif isinstance(x, SubstraitTypeParser.NotExprContext):
-        return not _evaluate(x.expr(), values)
-    elif isinstance(
-        x, (SubstraitTypeParser.IfExprContext, SubstraitTypeParser.TernaryContext)
-    ):
-        return (
-            _evaluate(x.thenExpr, values)
-            if _evaluate(x.ifExpr, values)
-            else _evaluate(x.elseExpr, values)
-        )
-    elif isinstance(x, SubstraitTypeParser.LiteralNumberContext):
-        return int(x.Number().symbol.text)
-    elif isinstance(x, SubstraitTypeParser.ParameterNameContext):
-        return values[x.Identifier().symbol.text]
-    elif isinstance(x, SubstraitTypeParser.NumericParameterNameContext):
-        return values[x.Identifier().symbol.text]
-    elif isinstance(x, SubstraitTypeParser.ParenExpressionContext):
-        return _evaluate(x.expr(), values)
-    elif isinstance(x, SubstraitTypeParser.FunctionCallContext):
-        exprs = [_evaluate(e, values) for e in x.expr()]
-        func = x.Identifier().symbol.text
-        if func == "min":
-            return min(*exprs)
-        elif func == "max":
-            return max(*exprs)
+Program = Callable[[Optional[dict]], Any]
+
+
+def _fail(error: Exception) -> Program:
+    """A program that raises ``error`` when run, deferring errors that only
+    surface once an expression is actually evaluated."""
+
+    def run(values):
+        raise error
+
+    return run
+
+
+def _constant_type(template: Type) -> Program:
+    def run(values):
+        result = Type()
+        result.CopyFrom(template)
+        return result
+
+    return run
+
+
+def _bound_value(name: str) -> Program:
+    def run(values):
+        value = values[name]
+        if isinstance(value, Type):
+            # A bound argument type: never hand out the caller's message.
+            copied = Type()
+            copied.CopyFrom(value)
+            return copied
+        return value
+
+    return run
+
+
+def _nullability(nullable: bool) -> "Type.Nullability.ValueType":
+    return Type.NULLABILITY_NULLABLE if nullable else Type.NULLABILITY_REQUIRED
+
+
+def _compile(x) -> Program:
+    """Compile a parsed expression into a reusable program ``values -> result``.
+
+    ``x`` is a :mod:`substrait.derivation_parser` node (an ANTLR parse tree is
+    converted first). The tree is walked once, here; running the returned closure
+    only performs the parameter arithmetic and builds the resulting value, so a
+    return-type derivation parsed at registration costs no parsing per evaluation.
+    """
+    if not isinstance(x, dp.Node):
+        x = _to_node(x)
+    if isinstance(x, dp.Number):
+        number = x.value
+        return lambda values: number
+    elif isinstance(x, dp.ParameterName):
+        return _bound_value(x.name)
+    elif isinstance(x, dp.BinaryOp):
+        left = _compile(x.left)
+        right = _compile(x.right)
+        if x.op == "and":
+            return lambda values: left(values) and right(values)
+        elif x.op == "or":
+            return lambda values: left(values) or right(values)
+        op = _BINARY_OPS[x.op]
+        return lambda values: op(left(values), right(values))
+    elif isinstance(x, dp.Not):
+        operand = _compile(x.operand)
+        return lambda values: not operand(values)
+    elif isinstance(x, dp.Conditional):
+        condition = _compile(x.condition)
+        then = _compile(x.then)
+        otherwise = _compile(x.otherwise)
+        return lambda values: then(values) if condition(values) else otherwise(values)
+    elif isinstance(x, dp.FunctionCall):
+        args = [_compile(e) for e in x.args]
+        if x.name == "min":
+            return lambda values: min(*[arg(values) for arg in args])
+        elif x.name == "max":
+            return lambda values: max(*[arg(values) for arg in args])
         else:
-            raise Exception(f"Unknown function {func}")
-    elif isinstance(x, SubstraitTypeParser.TypeDefContext):
-        scalar_type = x.scalarType()
-        parametrized_type = x.parameterizedType()
-        any_type = x.anyType()
-        if scalar_type:
-            nullability = (
-                Type.NULLABILITY_NULLABLE if x.isnull else Type.NULLABILITY_REQUIRED
-            )
-            if isinstance(scalar_type, SubstraitTypeParser.I8Context):
-                return Type(i8=Type.I8(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.I16Context):
-                return Type(i16=Type.I16(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.I32Context):
-                return Type(i32=Type.I32(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.I64Context):
-                return Type(i64=Type.I64(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.Fp32Context):
-                return Type(fp32=Type.FP32(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.Fp64Context):
-                return Type(fp64=Type.FP64(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.BooleanContext):
-                return Type(bool=Type.Boolean(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.StringContext):
-                return Type(string=Type.String(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.DateContext):
-                return Type(date=Type.Date(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.IntervalYearContext):
-                return Type(interval_year=Type.IntervalYear(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.UuidContext):
-                return Type(uuid=Type.UUID(nullability=nullability))
-            elif isinstance(scalar_type, SubstraitTypeParser.BinaryContext):
-                return Type(binary=Type.Binary(nullability=nullability))
-            else:
-                raise Exception(f"Unknown scalar type {type(scalar_type)}")
-        elif parametrized_type:
-            nullability = (
-                Type.NULLABILITY_NULLABLE
-                if parametrized_type.isnull
-                else Type.NULLABILITY_REQUIRED
-            )
-            if isinstance(parametrized_type, SubstraitTypeParser.DecimalContext):
-                precision = _evaluate(parametrized_type.precision, values)
-                scale = _evaluate(parametrized_type.scale, values)
-                return Type(
-                    decimal=Type.Decimal(
-                        precision=precision, scale=scale, nullability=nullability
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.VarCharContext):
-                length = _evaluate(parametrized_type.length, values)
-                return Type(
-                    varchar=Type.VarChar(
-                        length=length,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.FixedCharContext):
-                length = _evaluate(parametrized_type.length, values)
-                return Type(
-                    fixed_char=Type.FixedChar(
-                        length=length,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.FixedBinaryContext):
-                length = _evaluate(parametrized_type.length, values)
-                return Type(
-                    fixed_binary=Type.FixedBinary(
-                        length=length,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(
-                parametrized_type, SubstraitTypeParser.PrecisionTimestampContext
-            ):
-                precision = _evaluate(parametrized_type.precision, values)
-                return Type(
-                    precision_timestamp=Type.PrecisionTimestamp(
-                        precision=precision,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(
-                parametrized_type, SubstraitTypeParser.PrecisionTimestampTZContext
-            ):
-                precision = _evaluate(parametrized_type.precision, values)
-                return Type(
-                    precision_timestamp_tz=Type.PrecisionTimestampTZ(
-                        precision=precision,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.IntervalYearContext):
-                return Type(
-                    interval_year=Type.IntervalYear(
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(
-                parametrized_type, SubstraitTypeParser.PrecisionIntervalDayContext
-            ):
-                precision = _evaluate(parametrized_type.precision, values)
-                return Type(
-                    interval_day=Type.IntervalDay(
-                        precision=precision,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.StructContext):
-                types = list(
-                    map(lambda x: _evaluate(x, values), parametrized_type.expr())
-                )
-                return Type(
-                    struct=Type.Struct(
-                        types=types,
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.ListContext):
-                list_type = _evaluate(parametrized_type.expr(), values)
-                return Type(
-                    list=Type.List(
-                        type=list_type,
-                        nullability=nullability,
-                    )
-                )
+            return _fail(Exception(f"Unknown function {x.name}"))
+    elif isinstance(x, dp.Program):
+        assignments = [(name, _compile(e)) for name, e in x.assignments]
+        final_type = _compile(x.final)
 
-            elif isinstance(parametrized_type, SubstraitTypeParser.MapContext):
-                return Type(
-                    map=Type.Map(
-                        key=_evaluate(parametrized_type.key, values),
-                        value=_evaluate(parametrized_type.value, values),
-                        nullability=nullability,
-                    )
-                )
-            elif isinstance(parametrized_type, SubstraitTypeParser.NStructContext):
-                names = list(map(lambda k: k.getText(), parametrized_type.Identifier()))
-                struct = Type.Struct(
-                    types=list(
-                        map(lambda k: _evaluate(k, values), parametrized_type.expr())
-                    ),
+        def run(values):
+            for identifier, expr in assignments:
+                values[identifier] = expr(values)
+            return final_type(values)
+
+        return run
+    elif isinstance(x, dp.TYPE_NODES):
+        return _compile_type(x)
+    else:
+        return _fail(Exception(f"Unknown token type {type(x)}"))
+
+
+def _compile_type(x: dp.Node) -> Program:
+    if isinstance(x, dp.ScalarType):
+        message = _SCALAR_MESSAGES[x.kind]
+        return _constant_type(
+            Type(**{x.kind: message(nullability=_nullability(x.nullable))})
+        )
+    elif isinstance(x, dp.ParameterizedType):
+        field, message = x.kind, _PARAMETERIZED_MESSAGES[x.kind]
+        nullability = _nullability(x.nullable)
+        parameters = [
+            (name, _compile(e))
+            for name, e in zip(dp.PARAMETER_NAMES[x.kind], x.parameters)
+        ]
+        return lambda values: Type(
+            **{
+                field: message(
                     nullability=nullability,
+                    **{name: parameter(values) for name, parameter in parameters},
                 )
-                return NamedStruct(
-                    names=names,
-                    struct=struct,
-                )
-
-            raise Exception(f"Unknown parametrized type {type(parametrized_type)}")
-        elif any_type:
-            any_var = any_type.AnyVar()
-            if any_var:
-                return values[any_var.symbol.text]
-            else:
-                raise Exception()
-        else:
-            raise Exception(
-                "either scalar_type, parametrized_type or any_type is required"
+            }
+        )
+    elif isinstance(x, dp.StructType):
+        nullability = _nullability(x.nullable)
+        types = [_compile(e) for e in x.types]
+        return lambda values: Type(
+            struct=Type.Struct(
+                types=[t(values) for t in types],
+                nullability=nullability,
             )
-    elif isinstance(x, SubstraitTypeParser.NumericExpressionContext):
-        return _evaluate(x.expr(), values)
-    elif isinstance(x, SubstraitTypeParser.MultilineDefinitionContext):
-        lines = zip(x.Identifier(), x.expr())
-
-        for i, e in lines:
-            identifier = i.symbol.text
-            expr_eval = _evaluate(e, values)
-            values[identifier] = expr_eval
-
-        return _evaluate(x.finalType, values)
-    elif isinstance(x, SubstraitTypeParser.TypeLiteralContext):
-        return _evaluate(x.typeDef(), values)
-    elif isinstance(x, SubstraitTypeParser.NumericLiteralContext):
-        return int(str(x.Number()))
-    else:
-        raise Exception(f"Unknown token type {type(x)}")
+        )
+    elif isinstance(x, dp.NamedStructType):
+        nullability = _nullability(x.nullable)
+        names = list(x.names)
+        types = [_compile(e) for e in x.types]
+        return lambda values: NamedStruct(
+            names=names,
+            struct=Type.Struct(
+                types=[t(values) for t in types], nullability=nullability
+            ),
+        )
+    elif isinstance(x, dp.ListType):
+        nullability = _nullability(x.nullable)
+        element = _compile(x.element)
+        return lambda values: Type(
+            list=Type.List(type=element(values), nullability=nullability)
+        )
+    elif isinstance(x, dp.MapType):
+        nullability = _nullability(x.nullable)
+        key = _compile(x.key)
+        value = _compile(x.value)
+        return lambda values: Type(
+            map=Type.Map(key=key(values), value=value(values), nullability=nullability)
+        )
+    elif isinstance(x, dp.AnyType):
+        if x.name is not None:
+            return _bound_value(x.name)
+        else:
+            return _fail(Exception())
+    return _fail(Exception(f"Unknown parametrized type {type(x).__name__}"))
+
+
+def _evaluate(x, values: dict):
+    return _compile(x)(values)
+
+
+_parse_cache = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+
+
+def _cached(key, build):
+    tree = _parse_cache.get(key)
+    if tree is None:
+        tree = build()
+        _parse_cache.put(key, tree)
+    return tree
+
+
+def parse(x: str) -> dp.Node:
+    """Parse ``x`` into a :mod:`substrait.derivation_parser` node tree using the
+    selected backend, reusing the tree of an earlier parse of the same string.
+
+    Trees are immutable and shared by every caller in the process. Strings that
+    fail to parse are not cached.
+    """
+    backend = _parser_backend
+    if backend == "native":
+        return _cached((backend, x), lambda: dp.parse(x))
+    return _cached((backend, x), lambda: _to_node(_parse(x)))
+
+
+def _to_node(x) -> dp.Node:
+    """Convert an ANTLR parse tree into the equivalent node tree."""
+    from substrait import derivation_antlr
+
+    return derivation_antlr.to_node(x)
+
+
+def _parse_uncached(x: str):
+    from substrait import derivation_antlr
+
+    return derivation_antlr.parse(x)
 
 
 def _parse(x: str):
-    error_listener = _RaisingErrorListener(x)
+    """Parse ``x`` with the ANTLR parser, reusing the tree of an earlier parse.
+
+    Trees are shared by every caller in the process and must be treated as
+    read-only. Strings that fail to parse are not cached.
+    """
+    return _cached(x, lambda: _parse_uncached(x))
+
+
+def set_parser_backend(backend: str) -> None:
+    """Select the parser used by :func:`parse`, :func:`evaluate` and the
+    extension registry: ``"native"`` (the default, a hand-written
+    recursive-descent parser) or ``"antlr"`` (the generated ANTLR parser)."""
+    global _parser_backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(
+            f"Unknown parser backend {backend!r}, expected one of {PARSER_BACKENDS}"
+        )
+    _parser_backend = backend
 
-    lexer = SubstraitTypeLexer(InputStream(x))
-    lexer.removeErrorListeners()
-    lexer.addErrorListener(error_listener)
 
-    stream = CommonTokenStream(lexer)
+def get_parser_backend() -> str:
+    """The name of the parser backend currently in use."""
+    return _parser_backend
 
-    parser = SubstraitTypeParser(stream)
-    parser.removeErrorListeners()
-    parser.addErrorListener(error_listener)
 
-    return parser.expr()
+def set_parse_cache_size(maxsize: Optional[int]) -> None:
+    """Set the capacity of the process-wide parse cache.
+
+    ``None`` makes it unbounded and ``0`` disables caching.
+    """
+    _parse_cache.resize(maxsize)
+
+
+def parse_cache_info() -> CacheInfo:
+    """Hit/miss counters and occupancy of the process-wide parse cache."""
+    return _parse_cache.info()
+
+
+def clear_parse_cache() -> None:
+    """Drop every cached parse tree and reset the hit/miss counters."""
+    _parse_cache.clear(reset_stats=True)
+
+
+def compile_expression(x: str) -> Program:
+    """Parse a derivation expression once and return a reusable program.
+
+    Calling the program with a parameter binding (``program(values)``) gives the
+    same result as ``evaluate(x, values)`` without re-parsing ``x``.
+    """
+    return _compile(parse(x))
 
 
 def evaluate(x: str, values: Optional[dict] = None):
-    return _evaluate(_parse(x), values)
+    return _evaluate(parse(x), values)
@@ -0,0 +1,566 @@
+"""
+Hand-written parser for Substrait type and derivation expressions.
+
+A dependency-free recursive-descent implementation of the ``SubstraitType``
+grammar used by simple extension YAMLs: scalar and parameterized types,
+``any``/``anyN``, ``?`` nullability, arithmetic, comparison and boolean
+operators, ternaries, ``if``/``then``/``else``, ``min``/``max`` calls and
+multi-line programs (``name = expr`` lines followed by a final type).
+
+Parsing produces a tree of small immutable :class:`Node` objects that compare
+and hash structurally. :mod:`substrait.derivation_expression` evaluates these
+trees and can produce the same trees from the ANTLR-generated parser, which is
+kept as a selectable fallback.
+"""
+
+import re
+from typing import Optional
+
+
+class DerivationExpressionParseError(Exception):
+    """Raised when a derivation expression cannot be parsed."""
+
+
+class Node:
+    """Base class of parsed expression nodes: immutable, compared by value."""
+
+    __slots__ = ()
+
+    def __init__(self, *args) -> None:
+        for slot, value in zip(self.__slots__, args, strict=True):
+            object.__setattr__(self, slot, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self._fields() == other._fields()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__,) + self._fields())
+
+    def __repr__(self) -> str:
+        args = ", ".join(repr(field) for field in self._fields())
+        return f"{type(self).__name__}({args})"
+
+    def __reduce__(self):
+        return (type(self), self._fields())
+
+
+class Number(Node):
+    """An integer literal."""
+
+    __slots__ = ("value",)
+
+
+class ParameterName(Node):
+    """A reference to a bound parameter, e.g. ``P1`` or ``T?``."""
+
+    __slots__ = ("name", "nullable")
+
+
+class BinaryOp(Node):
+    """``left op right``; ``op`` is the operator text, ``and``/``or`` lowercased."""
+
+    __slots__ = ("op", "left", "right")
+
+
+class Not(Node):
+    __slots__ = ("operand",)
+
+
+class Conditional(Node):
+    """``condition ? then : otherwise`` or ``if condition then ... else ...``."""
+
+    __slots__ = ("condition", "then", "otherwise")
+
+
+class FunctionCall(Node):
+    __slots__ = ("name", "args")
+
+
+class Program(Node):
+    """A multi-line program: ``(name, expr)`` assignments, then a final type."""
+
+    __slots__ = ("assignments", "final")
+
+
+class ScalarType(Node):
+    """A non-parameterized type; ``kind`` is its ``Type`` oneof field name."""
+
+    __slots__ = ("kind", "nullable")
+
+
+class ParameterizedType(Node):
+    """A type with integer parameters (decimal, varchar, precision_timestamp, ...).
+
+    ``kind`` is the ``Type`` oneof field name and ``parameters`` holds one
+    expression per entry of ``PARAMETER_NAMES[kind]``, in that order.
+    """
+
+    __slots__ = ("kind", "nullable", "parameters")
+
+
+class StructType(Node):
+    __slots__ = ("nullable", "types")
+
+
+class NamedStructType(Node):
+    __slots__ = ("nullable", "names", "types")
+
+
+class ListType(Node):
+    __slots__ = ("nullable", "element")
+
+
+class MapType(Node):
+    __slots__ = ("nullable", "key", "value")
+
+
+class FuncType(Node):
+    __slots__ = ("nullable", "parameters", "return_type")
+
+
+class UserDefinedType(Node):
+    """``[alias.]u!name[?][<params>]``."""
+
+    __slots__ = ("name", "nullable", "parameters", "alias")
+
+
+class AnyType(Node):
+    """``any`` (``name`` is None) or a named ``anyN`` type variable."""
+
+    __slots__ = ("name", "nullable")
+
+
+TYPE_NODES = (
+    ScalarType,
+    ParameterizedType,
+    StructType,
+    NamedStructType,
+    ListType,
+    MapType,
+    FuncType,
+    UserDefinedType,
+    AnyType,
+)
+
+# Integer parameters of each ParameterizedType kind, in declaration order.
+PARAMETER_NAMES = {
+    "decimal": ("precision", "scale"),
+    "varchar": ("length",),
+    "fixed_char": ("length",),
+    "fixed_binary": ("length",),
+    "precision_time": ("precision",),
+    "precision_timestamp": ("precision",),
+    "precision_timestamp_tz": ("precision",),
+    "interval_day": ("precision",),
+    "interval_compound": ("precision",),
+}
+
+# Keyword (lowercased) -> ScalarType kind.
+_SCALAR_KEYWORDS = {
+    "boolean": "bool",
+    "i8": "i8",
+    "i16": "i16",
+    "i32": "i32",
+    "i64": "i64",
+    "fp32": "fp32",
+    "fp64": "fp64",
+    "string": "string",
+    "binary": "binary",
+    "date": "date",
+    "interval_year": "interval_year",
+    "uuid": "uuid",
+}
+
+# Keyword (lowercased) -> ParameterizedType kind.
+_PARAMETERIZED_KEYWORDS = {
+    "decimal": "decimal",
+    "varchar": "varchar",
+    "fixedchar": "fixed_char",
+    "fixedbinary": "fixed_binary",
+    "precision_time": "precision_time",
+    "precision_timestamp": "precision_timestamp",
+    "precision_timestamp_tz": "precision_timestamp_tz",
+    "interval_day": "interval_day",
+    "interval_compound": "interval_compound",
+}
+
+_NESTED_KEYWORDS = ("struct", "nstruct", "list", "map", "func")
+
+# Short aliases the grammar reserves as keywords but accepts nowhere.
+_RESERVED_KEYWORDS = frozenset(
+    "bool str vbin iyear iday icompound dec pt pts ptstz fchar vchar fbin".split()
+)
+
+_KEYWORDS = frozenset(
+    [*_SCALAR_KEYWORDS, *_PARAMETERIZED_KEYWORDS, *_NESTED_KEYWORDS]
+    + ["if", "then", "else", "and", "or", "any"]
+)
+
+# Token kinds. Keywords use their lowercased text, operators their own text.
+_NUMBER = "number"
+_IDENTIFIER = "identifier"
+_ANY_VAR = "any_var"
+_USER_DEFINED = "u!"
+_NEWLINE = "newline"
+_RESERVED = "reserved"
+_EOF = "eof"
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<newline>\r?\n)
+  | (?P<skip>[ \t\r]+|//[^\r\n]*|/\*.*?\*/)
+  | (?P<number>-?(?:0|[1-9][0-9]*))
+  | (?P<user_defined>[uU]!)
+  | (?P<word>[a-zA-Z_$][a-zA-Z0-9_$]*)
+  | (?P<op>:=|->|::|!=|>=|<=|[-+*/%=<>!()\[\],:?\#.])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_ANY_VAR_PATTERN = re.compile(r"any[0-9]", re.IGNORECASE)
+
+# Binary operators: token kind -> precedence. Operators are
+# left-associative; the right operand is parsed one level tighter.
+_BINARY_OPERATORS = {
+    "*": 9,
+    "/": 9,
+    "+": 8,
+    "-": 8,
+    "<": 7,
+    ">": 7,
+    "<=": 7,
+    ">=": 7,
+    "=": 6,
+    "!=": 6,
+    "and": 5,
+    "or": 4,
+}
+_TERNARY_PRECEDENCE = 1
+
+# Token kinds that can begin an expression. None of them can follow a complete
+# expression, which is how ``T?``/``i8?`` nullability is told apart from a
+# ternary and a closing ``>`` from a comparison.
+_EXPRESSION_START = frozenset(
+    [
+        "(",
+        "!",
+        "if",
+        "any",
+        _NUMBER,
+        _IDENTIFIER,
+        _ANY_VAR,
+        _USER_DEFINED,
+        *_SCALAR_KEYWORDS,
+        *_PARAMETERIZED_KEYWORDS,
+        *_NESTED_KEYWORDS,
+    ]
+)
+
+
+# Token kinds that can begin a type.
+_TYPE_START = _EXPRESSION_START - {"(", "!", "if", _NUMBER}
+
+
+class _Token:
+    __slots__ = ("kind", "text", "line", "column")
+
+    def __init__(self, kind: str, text: str, line: int, column: int) -> None:
+        self.kind = kind
+        self.text = text
+        self.line = line
+        self.column = column
+
+
+def _tokenize(expression: str) -> list:
+    tokens = []
+    line, line_start, pos = 1, 0, 0
+    while pos < len(expression):
+        match = _TOKEN_PATTERN.match(expression, pos)
+        column = pos - line_start
+        if match is None:
+            raise _error(
+                expression,
+                line,
+                column,
+                f"token recognition error at: {expression[pos]!r}",
+            )
+        group, text = match.lastgroup, match.group()
+        if group == "newline":
+            tokens.append(_Token(_NEWLINE, text, line, column))
+            line, line_start = line + 1, match.end()
+        elif group == "word":
+            lowered = text.lower()
+            if lowered in _KEYWORDS:
+                kind = lowered
+            elif lowered in _RESERVED_KEYWORDS:
+                kind = _RESERVED
+            elif _ANY_VAR_PATTERN.fullmatch(text):
+                kind = _ANY_VAR
+            else:
+                kind = _IDENTIFIER
+            tokens.append(_Token(kind, text, line, column))
+        elif group == "number":
+            tokens.append(_Token(_NUMBER, text, line, column))
+        elif group == "user_defined":
+            tokens.append(_Token(_USER_DEFINED, text, line, column))
+        elif group == "op":
+            tokens.append(_Token(text, text, line, column))
+        elif "\n" in text:  # a block comment spanning lines
+            line += text.count("\n")
+            line_start = pos + text.rfind("\n") + 1
+        pos = match.end()
+    tokens.append(_Token(_EOF, "<EOF>", line, pos - line_start))
+    return tokens
+
+
+def _error(expression: str, line: int, column: int, message: str):
+    return DerivationExpressionParseError(
+        f"Could not parse derivation expression {expression!r} "
+        f"at line {line}:{column}: {message}"
+    )
+
+
+class _Parser:
+    def __init__(self, expression: str) -> None:
+        self._expression = expression
+        self._tokens = _tokenize(expression)
+        self._pos = 0
+        self._program_error: Optional[DerivationExpressionParseError] = None
+
+    def parse(self) -> Node:
+        try:
+            node = self._expr(0)
+            self._skip_newlines()
+            self._expect(_EOF)
+        except DerivationExpressionParseError:
+            if self._program_error is not None:
+                raise self._program_error from None
+            raise
+        return node
+
+    # -- token helpers -------------------------------------------------------
+
+    def _peek(self, offset: int = 0) -> str:
+        index = min(self._pos + offset, len(self._tokens) - 1)
+        return self._tokens[index].kind
+
+    def _next(self) -> _Token:
+        token = self._tokens[self._pos]
+        if token.kind != _EOF:
+            self._pos += 1
+        return token
+
+    def _expect(self, kind: str) -> _Token:
+        if self._peek() != kind:
+            raise self._unexpected(f"expecting {kind!r}")
+        return self._next()
+
+    def _unexpected(self, detail: str):
+        token = self._tokens[self._pos]
+        return _error(
+            self._expression,
+            token.line,
+            token.column,
+            f"mismatched input {token.text!r} {detail}",
+        )
+
+    def _nullable_marker(self) -> bool:
+        """Consume a ``?`` that marks nullability rather than opening a ternary."""
+        if self._peek() == "?" and self._peek(1) not in _EXPRESSION_START:
+            self._pos += 1
+            return True
+        return False
+
+    def _comma_separated(self, closing: str) -> tuple:
+        items = [self._expr(0)]
+        while self._peek() == ",":
+            self._pos += 1
+            items.append(self._expr(0))
+        self._expect(closing)
+        return tuple(items)
+
+    # -- expressions ---------------------------------------------------------
+
+    def _expr(self, precedence: int) -> Node:
+        node = self._primary()
+        while True:
+            kind = self._peek()
+            level = _BINARY_OPERATORS.get(kind)
+            if level is not None and level >= precedence:
+                if kind == ">" and self._peek(1) not in _EXPRESSION_START:
+                    return node  # closes a type parameter list
+                op = self._next().text.lower()
+                node = BinaryOp(op, node, self._expr(level + 1))
+            elif kind == "?" and precedence <= _TERNARY_PRECEDENCE:
+                self._pos += 1
+                then = self._expr(0)
+                self._expect(":")
+                node = Conditional(node, then, self._expr(2))
+            else:
+                return node
+
+    def _primary(self) -> Node:
+        kind = self._peek()
+        if kind == "(":
+            self._pos += 1
+            node = self._expr(0)
+            self._expect(")")
+            return node
+        if kind == _IDENTIFIER:
+            following = self._peek(1)
+            if following == "=":
+                program = self._program()
+                if program is not None:
+                    return program
+            elif following == "(":
+                name = self._next().text
+                self._pos += 1
+                if self._peek() == ")":
+                    self._pos += 1
+                    return FunctionCall(name, ())
+                return FunctionCall(name, self._comma_separated(")"))
+            elif following == ".":
+                return self._type()
+            name = self._next().text
+            return ParameterName(name, self._nullable_marker())
+        if kind == _NUMBER:
+            return Number(int(self._next().text))
+        if kind == "if":
+            self._pos += 1
+            condition = self._expr(0)
+            self._expect("then")
+            then = self._expr(0)
+            self._expect("else")
+            return Conditional(condition, then, self._expr(3))
+        if kind == "!":
+            self._pos += 1
+            return Not(self._expr(2))
+        if kind in _EXPRESSION_START:
+            return self._type()
+        raise self._unexpected("expecting an expression")
+
+    def _program(self) -> Optional[Program]:
+        """Parse ``name = expr`` lines and a final type, or return None (without
+        consuming input) when the identifier starts an equality instead."""
+        start = self._pos
+        assignments = []
+        try:
+            while self._peek() == _IDENTIFIER and self._peek(1) == "=":
+                name = self._next().text
+                self._pos += 1
+                assignments.append((name, self._expr(0)))
+                self._expect(_NEWLINE)
+                self._skip_newlines()
+            final = self._type()
+        except DerivationExpressionParseError as e:
+            # Not a program after all; keep the error in case the equality
+            # reading fails too, as it is then the more helpful one.
+            self._program_error = self._program_error or e
+            self._pos = start
+            return None
+        self._skip_newlines()
+        return Program(tuple(assignments), final)
+
+    def _skip_newlines(self) -> None:
+        while self._peek() == _NEWLINE:
+            self._pos += 1
+
+    # -- types ---------------------------------------------------------------
+
+    def _type(self) -> Node:
+        if self._peek() not in _TYPE_START:
+            raise self._unexpected("expecting a type")
+        token = self._next()
+        kind = token.kind
+        if kind in _SCALAR_KEYWORDS:
+            return ScalarType(_SCALAR_KEYWORDS[kind], self._nullable_marker())
+        if kind == "any":
+            return AnyType(None, self._nullable_marker())
+        if kind == _ANY_VAR:
+            return AnyType(token.text, self._nullable_marker())
+        if kind == _USER_DEFINED or kind == _IDENTIFIER:
+            return self._user_defined(token)
+
+        nullable = self._peek() == "?"
+        if nullable:
+            self._pos += 1
+        self._expect("<")
+        if kind in _PARAMETERIZED_KEYWORDS:
+            type_kind = _PARAMETERIZED_KEYWORDS[kind]
+            parameters = self._comma_separated(">")
+            if len(parameters) != len(PARAMETER_NAMES[type_kind]):
+                self._pos -= 1
+                raise self._unexpected(f"in {token.text} parameters")
+            return ParameterizedType(type_kind, nullable, parameters)
+        if kind == "struct":
+            return StructType(nullable, self._comma_separated(">"))
+        if kind == "nstruct":
+            names, types = [], []
+            while True:
+                names.append(self._expect(_IDENTIFIER).text)
+                self._expect(":")
+                types.append(self._expr(0))
+                if self._peek() != ",":
+                    break
+                self._pos += 1
+            self._expect(">")
+            return NamedStructType(nullable, tuple(names), tuple(types))
+        if kind == "list":
+            element = self._expr(0)
+            self._expect(">")
+            return ListType(nullable, element)
+        if kind == "map":
+            key = self._expr(0)
+            self._expect(",")
+            value = self._expr(0)
+            self._expect(">")
+            return MapType(nullable, key, value)
+        parameters = self._func_parameters()  # func
+        self._expect("->")
+        return_type = self._expr(0)
+        self._expect(">")
+        return FuncType(nullable, parameters, return_type)
+
+    def _func_parameters(self) -> tuple:
+        if self._peek() == "(":
+            start = self._pos
+            self._pos += 1
+            try:
+                parameters = self._comma_separated(")")
+            except DerivationExpressionParseError:
+                parameters = None
+            if parameters is not None and self._peek() == "->":
+                return parameters
+            self._pos = start
+        return (self._expr(0),)
+
+    def _user_defined(self, token: _Token) -> Node:
+        alias = None
+        if token.kind == _IDENTIFIER:
+            alias = token.text
+            self._expect(".")
+            self._expect(_USER_DEFINED)
+        name = self._expect(_IDENTIFIER).text
+        nullable = self._nullable_marker()
+        parameters: tuple = ()
+        if self._peek() == "<":
+            self._pos += 1
+            parameters = self._comma_separated(">")
+        return UserDefinedType(name, nullable, parameters, alias)
+
+
+def parse(expression: str) -> Node:
+    """Parse a type or derivation expression into an immutable node tree.
+
+    Raises:
+        DerivationExpressionParseError: If ``expression`` is not valid. Unlike
+            the ANTLR fallback, which silently ignores unparseable trailing input,
+            anything but trailing newlines after a complete expression is an error.
+    """
+    return _Parser(expression).parse()
@@ -1,20 +1,38 @@
-"""Extension Registry module."""
-
-from .exceptions import UnhandledParameterizedTypeError, UnrecognizedSubstraitTypeError
-from .function_entry import FunctionEntry, FunctionType
-from .registry import ExtensionRegistry
-from .signature_checker_helpers import (
-    _bind_type_parameter,
-    _check_integer_constraint,
-    covers,
-    normalize_substrait_type_names,
-    types_equal,
-)
+"""Extension Registry module.
+
+Names are imported from their submodules on first access, so importing the
+package (e.g. for ``FunctionType``) does not load the registry, the extension
+models or the type parsers until they are used.
+"""
+
+import importlib
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    "FrozenRegistryError": "exceptions",
+    "UnhandledParameterizedTypeError": "exceptions",
+    "UnrecognizedSubstraitTypeError": "exceptions",
+    "FunctionEntry": "function_entry",
+    "FunctionType": "function_entry",
+    "ReturnKind": "function_entry",
+    "FunctionStats": "instrumentation",
+    "RegistryInstrumentation": "instrumentation",
+    "ExtensionRegistry": "registry",
+    "clear_registration_cache": "registry",
+    "registration_cache_info": "registry",
+    "set_registration_cache_size": "registry",
+    "_bind_type_parameter": "signature_checker_helpers",
+    "_check_integer_constraint": "signature_checker_helpers",
+    "covers": "signature_checker_helpers",
+    "normalize_substrait_type_names": "signature_checker_helpers",
+    "types_equal": "signature_checker_helpers",
+}
 
 __all__ = [
     "ExtensionRegistry",
     "FunctionEntry",
     "FunctionType",
+    "ReturnKind",
     "normalize_substrait_type_names",
     "_check_integer_constraint",
     "types_equal",
@@ -22,4 +40,23 @@ __all__ = [
     "covers",
     "UnrecognizedSubstraitTypeError",
     "UnhandledParameterizedTypeError",
+    "FrozenRegistryError",
+    "FunctionStats",
+    "RegistryInstrumentation",
+    "clear_registration_cache",
+    "registration_cache_info",
+    "set_registration_cache_size",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
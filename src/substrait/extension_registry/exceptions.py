@@ -7,6 +7,12 @@ class UnrecognizedSubstraitTypeError(Exception):
 
 
 class UnhandledParameterizedTypeError(Exception):
-    """Raised when an unhandled ANTLR parameterized type context is encountered."""
+    """Raised when an unhandled parameterized type is encountered."""
+
+    pass
+
+
+class FrozenRegistryError(Exception):
+    """Raised when registering with a frozen ExtensionRegistry."""
 
     pass
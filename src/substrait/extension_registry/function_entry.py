@@ -1,12 +1,21 @@
 """Function entry class for extension registry."""
 
+import sys
 from enum import Enum
-from typing import Optional, Union
+from typing import Callable, Optional, Sequence, Union
 
 from substrait.type_pb2 import Type
 from substrait_extensions.extensions import simple_extensions as se
 
-from substrait.derivation_expression import _parse, evaluate
+from substrait import derivation_parser as dp
+from substrait.derivation_expression import _compile, parse
+from substrait.simple_extension_utils import (
+    build_aggregate_function,
+    build_scalar_function,
+    build_window_function,
+)
+from substrait.utils.lru import LRUCache
+from substrait.utils.type_key import type_key
 
 from .signature_checker_helpers import covers, normalize_substrait_type_names
 
@@ -17,7 +26,138 @@ class FunctionType(Enum):
     WINDOW = "window"
 
 
+class ReturnKind(Enum):
+    """How an overload's output type is computed from a matched signature."""
+
+    CONSTANT = "constant"
+    """Always the same type, copied from a precomputed template."""
+    MIRRORED = "mirrored"
+    """A fixed type whose nullability mirrors the arguments': one of two
+    precomputed templates."""
+    DERIVED = "derived"
+    """Evaluated from the bound type parameters."""
+
+
+# How many return-type derivations the caches below remember; entries keep
+# their own references, so an evicted one only stops being shared with
+# overloads registered later.
+DEFAULT_RETURN_CACHE_SIZE = 1024
+
+# Compiled return-type programs, shared by every overload with the same
+# (immutable, structurally compared) derivation.
+_return_programs = LRUCache(DEFAULT_RETURN_CACHE_SIZE)
+
+_FUNCTION_BUILDERS = {
+    "scalar_functions": build_scalar_function,
+    "aggregate_functions": build_aggregate_function,
+    "window_functions": build_window_function,
+}
+
+
+# (return type node, mirrored) -> precomputed output types, see _return_templates.
+_templates = LRUCache(DEFAULT_RETURN_CACHE_SIZE)
+
+# Slots rebuilt from the return node instead of being pickled.
+_DERIVED_SLOTS = ("return_kind", "_return_program", "_return_templates")
+
+
+def _is_constant_type(node) -> bool:
+    """Whether the type ``node`` describes involves no parameters."""
+    if isinstance(node, dp.ScalarType):
+        return True
+    if isinstance(node, dp.ParameterizedType):
+        return all(isinstance(p, dp.Number) for p in node.parameters)
+    if isinstance(node, dp.StructType):
+        return all(_is_constant_type(t) for t in node.types)
+    if isinstance(node, dp.ListType):
+        return _is_constant_type(node.element)
+    if isinstance(node, dp.MapType):
+        return _is_constant_type(node.key) and _is_constant_type(node.value)
+    return False
+
+
+def _return_templates(node, mirrored: bool) -> tuple:
+    """The output types of a constant return ``node``: the declared one, or
+    the required and nullable variants (indexed by "any argument nullable")
+    when ``mirrored``. Shared between entries; only ever copied from."""
+    templates = _templates.get((node, mirrored))
+    if templates is None:
+        declared = _return_program(node)({})
+        if mirrored:
+            templates = tuple(
+                _with_nullability(declared, nullability)
+                for nullability in (
+                    Type.NULLABILITY_REQUIRED,
+                    Type.NULLABILITY_NULLABLE,
+                )
+            )
+        else:
+            templates = (declared,)
+        _templates.put((node, mirrored), templates)
+    return templates
+
+
+def _with_nullability(typ: Type, nullability) -> Type:
+    result = Type()
+    result.CopyFrom(typ)
+    getattr(result, result.WhichOneof("kind")).nullability = nullability
+    return result
+
+
+def _return_program(node):
+    program = _return_programs.get(node)
+    if program is None:
+        program = _compile(node)
+        _return_programs.put(node, program)
+    return program
+
+
+def _variadic(minimum, maximum, consistency) -> tuple:
+    """The ``(min, max, consistent)`` of a variadic behavior, as stored on
+    entries; ``max`` is None when unbounded."""
+    if isinstance(consistency, se.ParameterConsistency):
+        consistency = consistency.value
+    return (
+        int(minimum or 0),
+        None if maximum is None else int(maximum),
+        consistency != "INCONSISTENT",
+    )
+
+
+def _load_impl(function: dict, attribute: str, impl_index: int):
+    """Rebuild an impl model from the parsed definition of its function."""
+    return _FUNCTION_BUILDERS[attribute](function).impls[impl_index]
+
+
 class FunctionEntry:
+    """One overload of a registered extension function.
+
+    Entries keep only what resolution needs: the parsed argument types (shared
+    with the parse cache), the compiled return-type program (shared between
+    overloads with the same derivation) and interned names. When constructed
+    with an ``impl_source``, the full ``impl`` model is not kept either; it is
+    rebuilt from the parsed definition each time :attr:`impl` is read.
+    """
+
+    __slots__ = (
+        "name",
+        "urn",
+        "anchor",
+        "function_type",
+        "arguments",
+        "normalized_inputs",
+        "nullability",
+        "variadic_min",
+        "variadic_max",
+        "variadic_consistent",
+        "return_kind",
+        "_return_node",
+        "_return_program",
+        "_return_templates",
+        "_impl",
+        "_impl_source",
+    )
+
     def __init__(
         self,
         urn: str,
@@ -25,73 +165,277 @@ class FunctionEntry:
         impl: Union[se.Impl, se.Impl1, se.Impl2],
         anchor: int,
         function_type: FunctionType = FunctionType.SCALAR,
+        impl_source: Optional[tuple] = None,
     ) -> None:
-        self.name = name
-        self.impl = impl
-        self.normalized_inputs: list = []
-        self.urn: str = urn
+        """
+        Args:
+            impl_source: ``(function, attribute, impl index)`` locating
+                ``impl`` in the parsed definition of its function, where
+                ``attribute`` is e.g. ``"scalar_functions"``. The definition
+                must not be modified afterwards. When given, ``impl`` is not
+                retained.
+        """
+        args = []
+        for arg in impl.args or ():
+            if isinstance(arg, se.ValueArg):
+                args.append((arg.value, None))
+            elif isinstance(arg, se.EnumerationArg):
+                args.append((None, arg.options))
+        self._setup(
+            urn,
+            name,
+            anchor,
+            function_type,
+            args,
+            impl.nullability or se.NullabilityHandling.MIRROR,
+            _variadic(
+                impl.variadic.min,
+                impl.variadic.max,
+                impl.variadic.parameterConsistency,
+            )
+            if impl.variadic
+            else None,
+            impl.return_,
+        )
+        self._impl = impl if impl_source is None else None
+        self._impl_source = impl_source
+
+    @classmethod
+    def from_dict(
+        cls,
+        urn: str,
+        name: str,
+        impl: dict,
+        anchor: int,
+        function_type: FunctionType,
+        impl_source: tuple,
+    ) -> "FunctionEntry":
+        """An entry built straight from an impl of a parsed extension YAML,
+        without validating it against the simple extensions schema first; for
+        trusted extension files."""
+        entry = cls.__new__(cls)
+        args = []
+        for arg in impl.get("args") or ():
+            if "value" in arg:
+                args.append((arg["value"], None))
+            elif "options" in arg:
+                args.append((None, arg["options"]))
+        variadic = impl.get("variadic")
+        entry._setup(
+            urn,
+            name,
+            anchor,
+            function_type,
+            args,
+            se.NullabilityHandling(impl.get("nullability", "MIRROR")),
+            _variadic(
+                variadic.get("min"),
+                variadic.get("max"),
+                variadic.get("parameterConsistency"),
+            )
+            if variadic is not None
+            else None,
+            impl["return"],
+        )
+        entry._impl = None
+        entry._impl_source = impl_source
+        return entry
+
+    def _setup(
+        self,
+        urn: str,
+        name: str,
+        anchor: int,
+        function_type: FunctionType,
+        args: list,
+        nullability: se.NullabilityHandling,
+        variadic: Optional[tuple],
+        return_: str,
+    ) -> None:
+        """Set the resolution fields from ``(value type, enum options)`` pairs,
+        one per value or enumeration argument, and ``variadic``, the
+        ``(min, max, consistent)`` of a variadic last argument."""
+        self.name = sys.intern(name)
+        self.urn = sys.intern(urn)
         self.anchor = anchor
         self.function_type = function_type
-        self.arguments = []
-        self.nullability = (
-            impl.nullability if impl.nullability else se.NullabilityHandling.MIRROR
-        )
-        if impl.args:
-            for arg in impl.args:
-                if isinstance(arg, se.ValueArg):
-                    self.arguments.append(_parse(arg.value))
-                    self.normalized_inputs.append(
-                        normalize_substrait_type_names(arg.value)
-                    )
-                elif isinstance(arg, se.EnumerationArg):
-                    self.arguments.append(arg.options)
-                    self.normalized_inputs.append("req")
+        arguments = []
+        normalized_inputs = []
+        for value, options in args:
+            if value is not None:
+                arguments.append(parse(value))
+                normalized_inputs.append(
+                    sys.intern(normalize_substrait_type_names(value))
+                )
+            else:
+                arguments.append(tuple(sys.intern(o) for o in options))
+                normalized_inputs.append("req")
+        self.arguments = tuple(arguments)
+        self.normalized_inputs = tuple(normalized_inputs)
+        self.nullability = nullability
+        if variadic is None:
+            variadic = (None, None, True)
+        self.variadic_min, self.variadic_max, self.variadic_consistent = variadic
+        # The return-type derivation, parsed once and compiled to a closure.
+        self._return_node = parse(return_)
+        self._set_return()
+
+    def _set_return(self) -> None:
+        """Compile the return type, or precompute it if it is constant."""
+        self._return_program = _return_program(self._return_node)
+        if not _is_constant_type(self._return_node):
+            self.return_kind = ReturnKind.DERIVED
+            self._return_templates = None
+        elif self.nullability == se.NullabilityHandling.MIRROR:
+            self.return_kind = ReturnKind.MIRRORED
+            self._return_templates = _return_templates(self._return_node, True)
+        else:
+            self.return_kind = ReturnKind.CONSTANT
+            self._return_templates = _return_templates(self._return_node, False)
+
+    @property
+    def impl(self) -> Union[se.Impl, se.Impl1, se.Impl2]:
+        """The overload's full model from the simple extensions schema."""
+        if self._impl is not None:
+            return self._impl
+        return _load_impl(*self._impl_source)
+
+    def __getstate__(self) -> dict:
+        # Compiled closures cannot be pickled; they are rebuilt from the node.
+        return {
+            slot: getattr(self, slot)
+            for slot in self.__slots__
+            if slot not in _DERIVED_SLOTS
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self.name = sys.intern(self.name)
+        self.urn = sys.intern(self.urn)
+        self._set_return()
+
+    def with_anchor(self, anchor: int) -> "FunctionEntry":
+        """A copy of this entry under another anchor, sharing everything else."""
+        entry = FunctionEntry.__new__(FunctionEntry)
+        for slot in self.__slots__:
+            setattr(entry, slot, getattr(self, slot))
+        entry.anchor = anchor
+        return entry
 
     def __repr__(self) -> str:
         return f"{self.name}:{'_'.join(self.normalized_inputs)}"
 
-    def satisfies_signature(self, signature: tuple | list) -> Optional[str]:
-        if self.impl.variadic:
-            min_args_allowed = self.impl.variadic.min or 0
-            if len(signature) < min_args_allowed:
+    def satisfies_signature(
+        self,
+        signature: tuple | list,
+        keys: Optional[Sequence] = None,
+        check: Callable[..., bool] = covers,
+    ) -> Optional[str]:
+        """The output type of this overload for ``signature``, or None if it
+        does not match.
+
+        ``keys`` holds the :func:`~substrait.utils.type_key.type_key` of each
+        type in ``signature`` (anything for its other entries), so a caller
+        trying several overloads computes them only once. ``check`` is the
+        argument check, :func:`covers` unless instrumentation counts calls.
+        """
+        if keys is None:
+            keys = [type_key(y) if isinstance(y, Type) else None for y in signature]
+        check_nullability = self.nullability == se.NullabilityHandling.DISCRETE
+        parameters = {}
+        arguments = self.arguments
+        if self.variadic_min is None:
+            if len(arguments) != len(signature):
                 return None
-            inputs = [self.arguments[0]] * len(signature)
         else:
-            inputs = self.arguments
-        if len(inputs) != len(signature):
+            arguments = arguments[:-1]
+            count = len(signature) - len(arguments)
+            if count < self.variadic_min or (
+                self.variadic_max is not None and count > self.variadic_max
+            ):
+                return None
+        for x, y, key in zip(arguments, signature, keys):
+            if not _matches(x, y, key, parameters, check, check_nullability):
+                return None
+        if self.variadic_min is not None and not self._check_variadic(
+            signature, keys, parameters, check, check_nullability
+        ):
             return None
-        zipped_args = list(zip(inputs, signature))
-        parameters = {}
-        for x, y in zipped_args:
-            if isinstance(y, str):
-                if y not in x:
-                    return None
-            else:
-                if not covers(
-                    y,
-                    x,
-                    parameters,
-                    check_nullability=self.nullability
-                    == se.NullabilityHandling.DISCRETE,
-                ):
-                    return None
-        output_type = evaluate(self.impl.return_, parameters)
+        kind = self.return_kind
+        if kind is not ReturnKind.DERIVED:
+            output_type = Type()
+            output_type.CopyFrom(
+                self._return_templates[_any_nullable(signature, keys)]
+                if kind is ReturnKind.MIRRORED
+                else self._return_templates[0]
+            )
+            return output_type
+        output_type = self._return_program(parameters)
         if self.nullability == se.NullabilityHandling.MIRROR and isinstance(
             output_type, Type
         ):
-            sig_contains_nullable = any(
-                [
-                    p.__getattribute__(p.WhichOneof("kind")).nullability
-                    == Type.NULLABILITY_NULLABLE
-                    for p in signature
-                    if isinstance(p, Type)
-                ]
-            )
             kind = output_type.WhichOneof("kind")
             if kind is not None:
                 output_type.__getattribute__(kind).nullability = (
                     Type.NULLABILITY_NULLABLE
-                    if sig_contains_nullable
+                    if _any_nullable(signature, keys)
                     else Type.NULLABILITY_REQUIRED
                 )
         return output_type
+
+    def _check_variadic(
+        self,
+        signature: Sequence,
+        keys: Sequence,
+        parameters: dict,
+        check: Callable[..., bool],
+        check_nullability: bool,
+    ) -> bool:
+        """Check the arguments bound to the variadic last parameter, updating
+        ``parameters``.
+
+        Each distinct argument type is checked once: checking a type again
+        against the parameters it bound cannot fail. Consistent parameters are
+        bound across all arguments; inconsistent ones per argument, keeping
+        the bindings of the first for the return type.
+        """
+        x = self.arguments[-1]
+        start = len(self.arguments) - 1
+        # Distinct arguments in order of first appearance, by key.
+        distinct = dict(zip(keys[start:], signature[start:]))
+        if None in distinct:  # keys not given for enumeration options
+            distinct = {
+                y if key is None else key: y
+                for key, y in zip(keys[start:], signature[start:])
+            }
+        bound = None
+        for key, y in distinct.items():
+            if self.variadic_consistent:
+                if not _matches(x, y, key, parameters, check, check_nullability):
+                    return False
+            else:
+                own = dict(parameters)
+                if not _matches(x, y, key, own, check, check_nullability):
+                    return False
+                if bound is None:
+                    bound = own
+        if bound is not None:
+            parameters.update(bound)
+        return True
+
+
+def _any_nullable(signature: Sequence, keys: Sequence) -> bool:
+    return any(
+        key.nullability == Type.NULLABILITY_NULLABLE
+        for y, key in zip(signature, keys)
+        if isinstance(y, Type)
+    )
+
+
+def _matches(x, y, key, parameters: dict, check, check_nullability: bool) -> bool:
+    """Whether argument ``y`` (a type or an enumeration option) fits the
+    parameter ``x``."""
+    if isinstance(y, str):
+        return y in x
+    return check(y, x, parameters, check_nullability, key)
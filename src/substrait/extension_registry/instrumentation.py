@@ -0,0 +1,98 @@
+"""Opt-in counters and timings of overload resolution.
+
+Enabled per registry with :meth:`ExtensionRegistry.enable_instrumentation`.
+Statistics are kept per ``(urn, name)``, where ``urn`` is the URN a lookup was
+restricted to, or None for lookups spanning several URNs
+(``find_function``, ``list_functions_across_urns``).
+"""
+
+import threading
+from typing import Callable, NamedTuple, Optional
+
+from .signature_checker_helpers import covers
+
+
+class FunctionStats(NamedTuple):
+    """Resolution statistics of one ``(urn, name)``."""
+
+    lookups: int
+    """Signatures resolved, including cache hits."""
+    candidates: int
+    """Overloads whose signature was checked."""
+    covers_calls: int
+    """Argument checks (top-level ``covers`` calls) made."""
+    cache_hits: int
+    """Lookups answered by the resolution cache."""
+    seconds: float
+    """Cumulative wall-clock time spent resolving."""
+
+
+StatsCallback = Callable[[Optional[str], str, FunctionStats], None]
+
+
+class ResolutionCounters:
+    """Counters of one resolution call, filled in by the registry."""
+
+    __slots__ = ("cache_hits", "candidates", "covers_calls")
+
+    def __init__(self) -> None:
+        self.cache_hits = 0
+        self.candidates = 0
+        self.covers_calls = 0
+
+    def covers(self, *args) -> bool:
+        """:func:`covers`, counted."""
+        self.covers_calls += 1
+        return covers(*args)
+
+
+class RegistryInstrumentation:
+    """Accumulated :class:`FunctionStats` of one registry.
+
+    ``callback``, if given, is called as ``callback(urn, name, stats)`` after
+    every resolution call with the statistics of that call alone, e.g. to
+    forward them to a metrics pipeline. It runs on the resolving thread.
+    """
+
+    __slots__ = ("_stats", "_lock", "_callback")
+
+    def __init__(self, callback: Optional[StatsCallback] = None) -> None:
+        self._stats: dict = {}
+        self._lock = threading.Lock()
+        self._callback = callback
+
+    def record(
+        self,
+        urn: Optional[str],
+        name: str,
+        lookups: int,
+        counters: ResolutionCounters,
+        seconds: float,
+    ) -> None:
+        observed = FunctionStats(
+            lookups,
+            counters.candidates,
+            counters.covers_calls,
+            counters.cache_hits,
+            seconds,
+        )
+        key = (urn, name)
+        with self._lock:
+            previous = self._stats.get(key)
+            self._stats[key] = (
+                observed
+                if previous is None
+                else FunctionStats(*(a + b for a, b in zip(previous, observed)))
+            )
+        if self._callback is not None:
+            self._callback(urn, name, observed)
+
+    def snapshot(self) -> dict:
+        """A copy of the statistics: ``{(urn, name): FunctionStats}``."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset(self) -> None:
+        """Discard every statistic recorded so far."""
+        with self._lock:
+            self._stats.clear()
@@ -0,0 +1,94 @@
+"""Per-``(urn, name)`` index narrowing overloads to the plausible candidates."""
+
+from typing import Optional, Sequence
+
+from substrait.type_pb2 import Type
+
+from substrait import derivation_parser as dp
+
+from .function_entry import FunctionEntry
+
+# Type kinds of the nested type nodes, as named by the ``Type.kind`` oneof.
+_NESTED_KINDS = {
+    dp.ListType: "list",
+    dp.MapType: "map",
+    dp.StructType: "struct",
+    dp.FuncType: "func",
+}
+
+
+def leading_kind(entry: FunctionEntry) -> Optional[str]:
+    """The ``Type.kind`` an argument must have to match ``entry``'s first
+    parameter, or None if that parameter accepts several kinds (``any``, a
+    type parameter, an enumeration or a user-defined type)."""
+    if not entry.arguments:
+        return None
+    first = entry.arguments[0]
+    if isinstance(first, (dp.ScalarType, dp.ParameterizedType)):
+        return first.kind
+    return _NESTED_KINDS.get(type(first))
+
+
+class OverloadIndex:
+    """The overloads of one ``(urn, name)`` bucketed by arity and by the kind
+    of their leading parameter.
+
+    :meth:`candidates` returns, in registration order, every overload that a
+    signature could satisfy, skipping those that would fail
+    ``FunctionEntry.satisfies_signature`` on argument count or on the kind of
+    the first argument alone. Variadic overloads accept the arities their
+    ``min`` and ``max`` allow.
+    """
+
+    __slots__ = ("_fixed", "_variadic")
+
+    def __init__(self, entries: Sequence[FunctionEntry]) -> None:
+        # arity -> ((position, kind, entry), ...) and
+        # ((min arity, max arity, position, kind, entry), ...) for variadic
+        # overloads, with a max arity of None when unbounded.
+        fixed: dict[int, list] = {}
+        variadic = []
+        for position, entry in enumerate(entries):
+            kind = leading_kind(entry)
+            if entry.variadic_min is not None:
+                fixed_count = len(entry.arguments) - 1
+                variadic.append(
+                    (
+                        fixed_count + entry.variadic_min,
+                        None
+                        if entry.variadic_max is None
+                        else fixed_count + entry.variadic_max,
+                        position,
+                        kind,
+                        entry,
+                    )
+                )
+            else:
+                fixed.setdefault(len(entry.arguments), []).append(
+                    (position, kind, entry)
+                )
+        self._fixed = {arity: tuple(group) for arity, group in fixed.items()}
+        self._variadic = tuple(variadic)
+
+    def candidates(self, signature: Sequence) -> list[FunctionEntry]:
+        arity = len(signature)
+        pool = self._fixed.get(arity, ())
+        if self._variadic:
+            accepting = [
+                v[2:]
+                for v in self._variadic
+                if v[0] <= arity and (v[1] is None or arity <= v[1])
+            ]
+            if accepting:
+                pool = sorted(pool + tuple(accepting), key=lambda c: c[0])
+        kind = None
+        if arity and isinstance(signature[0], Type):
+            kind = signature[0].WhichOneof("kind")
+        if kind is None:
+            # Not a concrete type: leave the verdict to satisfies_signature.
+            return [entry for _, _, entry in pool]
+        return [
+            entry
+            for _, entry_kind, entry in pool
+            if entry_kind is None or entry_kind == kind
+        ]
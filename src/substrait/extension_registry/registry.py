@@ -1,51 +1,382 @@
 """Extension Registry class."""
 
-import itertools
+import copy
+import hashlib
+import json
 import re
-from collections import defaultdict
+import threading
+import time
+from concurrent.futures import Executor
 from importlib.resources import files as importlib_files
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Sequence, Union
 
-import yaml
+from google.protobuf.message import Message
 from substrait.type_pb2 import Type
 
-from substrait.simple_extension_utils import build_simple_extensions
+from substrait.simple_extension_utils import (
+    build_simple_extensions,
+    parse_extension_yaml,
+)
+from substrait.utils.lru import CacheInfo, LRUCache
+from substrait.utils.type_key import type_key
 
+from .exceptions import FrozenRegistryError
 from .function_entry import FunctionEntry, FunctionType
+from .instrumentation import (
+    RegistryInstrumentation,
+    ResolutionCounters,
+    StatsCallback,
+)
+from .overload_index import OverloadIndex
+from .signature_checker_helpers import covers
+from .snapshot import read_snapshot, write_snapshot
 
 # Format: extension:<organization>:<name>
 # Example: extension:io.substrait:functions_arithmetic
 URN_PATTERN = re.compile(r"^extension:[^:]+:[^:]+$")
 
+# Number of (urns, name, signature) resolutions remembered per registry.
+DEFAULT_RESOLUTION_CACHE_SIZE = 4096
+DEFAULT_REGISTRATION_CACHE_SIZE = 256
+
+# Function anchors of a lazy registry are allocated in fixed-size blocks per URN
+# anchor (block ``n`` holds ``n * LAZY_ANCHOR_BLOCK_SIZE + 1`` onwards), so an
+# extension's anchors do not depend on which extensions were loaded before it.
+LAZY_ANCHOR_BLOCK_SIZE = 100_000
+
+# The top-level ``urn:`` key of an extension YAML, read without parsing the file.
+_URN_LINE = re.compile(r"""^urn:[ \t]*["']?([^"'\s#]+)""", re.MULTILINE)
+
+_MISSING = object()
+
+_FUNCTION_KINDS = (
+    ("scalar_functions", FunctionType.SCALAR),
+    ("aggregate_functions", FunctionType.AGGREGATE),
+    ("window_functions", FunctionType.WINDOW),
+)
+
+
+class _Tables:
+    """Everything registered with an :class:`ExtensionRegistry`.
+
+    A published instance is never modified: registration fills in a
+    :meth:`copy` and swaps it in, so overlays can share their parent's tables.
+    Nested containers are replaced rather than mutated for the same reason.
+    """
+
+    __slots__ = (
+        "urn_anchors",  # URN -> anchor
+        "functions",  # URN -> {name: [FunctionEntry, ...]}, in search order
+        "overload_indexes",  # (urn, name) -> OverloadIndex over functions[urn][name]
+        "function_urns",  # name -> {urn: FunctionType}, in search order
+        "urn_positions",  # URN -> its place in the search order
+        "extension_relations",  # type_url -> extension-relation detail class
+        "pending",  # URN -> YAML files indexed but not yet loaded (lazy mode)
+        "anchor_blocks",  # URN anchor -> next free function anchor of its block
+        "next_urn_anchor",
+        "next_function_anchor",
+        # Bumped by every registration that can change a resolution; cached
+        # resolutions from another generation are ignored.
+        "generation",
+    )
+
+    def __init__(self) -> None:
+        self.urn_anchors: dict[str, int] = {}
+        self.functions: dict[str, dict[str, list[FunctionEntry]]] = {}
+        self.overload_indexes: dict[tuple[str, str], OverloadIndex] = {}
+        self.function_urns: dict[str, dict[str, FunctionType]] = {}
+        self.urn_positions: dict[str, int] = {}
+        self.extension_relations: dict = {}
+        self.pending: dict[str, tuple[Path, ...]] = {}
+        self.anchor_blocks: dict[int, int] = {}
+        self.next_urn_anchor = 1
+        self.next_function_anchor = 1
+        self.generation = 0
+
+    def copy(self) -> "_Tables":
+        tables = _Tables.__new__(_Tables)
+        for slot in self.__slots__:
+            value = getattr(self, slot)
+            setattr(tables, slot, value.copy() if isinstance(value, dict) else value)
+        return tables
+
+    def assign_urn_anchor(self, urn: str) -> None:
+        self.urn_anchors[urn] = self.next_urn_anchor
+        self.next_urn_anchor += 1
+        # The first registration fixes the URN's place in the search order.
+        if urn not in self.urn_positions:
+            self.urn_positions[urn] = len(self.urn_positions)
+            self.functions[urn] = {}
+
+    def allocate_function_anchor(self, urn: str, lazy: bool) -> int:
+        if not lazy:
+            anchor = self.next_function_anchor
+            self.next_function_anchor += 1
+            return anchor
+        urn_anchor = self.urn_anchors[urn]
+        anchor = self.anchor_blocks.get(
+            urn_anchor, urn_anchor * LAZY_ANCHOR_BLOCK_SIZE + 1
+        )
+        if anchor >= (urn_anchor + 1) * LAZY_ANCHOR_BLOCK_SIZE:
+            raise ValueError(
+                f"Extension {urn} defines more than {LAZY_ANCHOR_BLOCK_SIZE - 1} "
+                "overloads, exceeding its anchor block"
+            )
+        self.anchor_blocks[urn_anchor] = anchor + 1
+        return anchor
+
+    def add_functions(self, urn: str, functions: tuple, lazy: bool) -> set[str]:
+        """Register prepared ``functions`` (see :func:`_prepare_extension`)
+        under ``urn``, allocating their anchors, and return their names."""
+        names = dict(self.functions[urn])
+        for name, templates in functions:
+            entries = names.get(name, []) + [
+                template.with_anchor(self.allocate_function_anchor(urn, lazy))
+                for template in templates
+            ]
+            names[name] = entries
+            self.overload_indexes[urn, name] = OverloadIndex(entries)
+            self.index_function_urn(name, urn, entries[0].function_type)
+        self.functions[urn] = names
+        return set(names)
+
+    def index_function_urn(
+        self, name: str, urn: str, function_type: FunctionType
+    ) -> None:
+        """Record that ``urn`` defines ``name``, keeping the name's URNs in
+        search order even when a lazy registry loads them out of order."""
+        urns = self.function_urns.get(name, {})
+        if urn in urns:
+            return
+        positions = self.urn_positions
+        out_of_order = urns and positions[urn] < positions[next(reversed(urns))]
+        urns = {**urns, urn: function_type}
+        if out_of_order:
+            urns = dict(sorted(urns.items(), key=lambda item: positions[item[0]]))
+        self.function_urns[name] = urns
+
 
 class ExtensionRegistry:
-    def __init__(self, load_default_extensions=True) -> None:
-        self._urn_mapping: dict = defaultdict(dict)  # URN -> anchor ID
-        self._urn_id_generator = itertools.count(1)
-        self._function_mapping: dict = defaultdict(lambda: defaultdict(list))
-        self._id_generator = itertools.count(1)
-        # {type_url: detail class} for user-defined extension relations, so an
-        # extension relation's output schema can be derived during inference.
-        self._extension_relations: dict = {}
+    """Registered Substrait extensions and overload resolution over them.
+
+    Thread safety: a registry may be shared between threads. Lookups never
+    modify the registered tables; they read one consistent, immutable version
+    of them. Registration (and the lazy loading of indexed extensions) is
+    serialized by a per-registry lock and publishes a new version atomically,
+    so a concurrent lookup sees either all or none of a registration. Cached
+    resolutions made against an older version are never returned.
+    """
+
+    def __init__(
+        self,
+        load_default_extensions=True,
+        resolution_cache_size: Optional[int] = DEFAULT_RESOLUTION_CACHE_SIZE,
+        lazy: bool = False,
+        parent: Optional["ExtensionRegistry"] = None,
+    ) -> None:
+        """
+        Args:
+            load_default_extensions: Register the ``functions*.yaml`` files
+                shipped with ``substrait_extensions``. Ignored for overlays.
+            resolution_cache_size: Capacity of the overload-resolution cache
+                (``None`` for unbounded, ``0`` to disable it).
+            lazy: Only index the default extensions by URN at construction and
+                parse each file the first time a lookup needs its functions.
+                Function anchors are then allocated in per-URN blocks (see
+                ``LAZY_ANCHOR_BLOCK_SIZE``) and so do not depend on load order.
+                Overlays inherit their parent's mode.
+            parent: Make this registry an overlay of ``parent`` (see
+                :meth:`overlay`). ``parent`` is frozen.
+        """
+        self._parent = parent
+        self._frozen = False
+        # Serializes registration; reentrant as registering may load pending
+        # extensions first.
+        self._lock = threading.RLock()
+        # LRU of overload resolutions keyed on (urns, name, signature
+        # fingerprint); cleared whenever new functions are registered.
+        self._resolution_cache = LRUCache(resolution_cache_size)
+        self._instrumentation: Optional[RegistryInstrumentation] = None
+        if parent is not None:
+            parent.freeze()
+            self._lazy = parent._lazy
+            self._tables = parent._tables
+            # Names this overlay registered functions for; lookups of any other
+            # name are answered (and cached) by the parent.
+            self._overlay_names: frozenset = frozenset()
+            return
+        self._lazy = lazy
+        self._tables = _Tables()
         if load_default_extensions:
-            for fpath in importlib_files("substrait_extensions.extensions").glob(  # type: ignore
-                "functions*.yaml"
-            ):
-                self.register_extension_yaml(fpath)
+            if lazy:
+                for fpath in default_extension_paths():
+                    self._index_extension_yaml(fpath)
+            else:
+                self.register_extension_yamls(default_extension_paths(), trusted=True)
+
+    def overlay(
+        self, resolution_cache_size: Optional[int] = DEFAULT_RESOLUTION_CACHE_SIZE
+    ) -> "ExtensionRegistry":
+        """A cheap child registry layered over this one, which is frozen.
+
+        The overlay sees everything registered here and may register further
+        extensions and extension relations of its own, copying only the tables
+        it changes. Its anchors continue after this registry's, so they never
+        collide with the functions it inherits. Lookups of names the overlay
+        has not registered are delegated to this registry and share its
+        resolution cache, so creating an overlay per request is cheap.
+        """
+        return type(self)(resolution_cache_size=resolution_cache_size, parent=self)
+
+    def freeze(self) -> None:
+        """Make this registry read-only; later registrations raise
+        :class:`FrozenRegistryError`. Lazily indexed extensions are loaded
+        first, so a frozen registry's contents never change."""
+        with self._lock:
+            if not self._frozen:
+                self._load_pending()
+                self._frozen = True
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def parent(self) -> Optional["ExtensionRegistry"]:
+        """The registry this one overlays, or None."""
+        return self._parent
+
+    def _check_mutable(self) -> None:
+        if self._frozen:
+            raise FrozenRegistryError(
+                "This ExtensionRegistry is frozen; register extensions on an "
+                "overlay() of it instead"
+            )
+
+    def _publish(self, tables: _Tables, names=()) -> None:
+        """Make ``tables`` the current version; called with the lock held."""
+        self._tables = tables
+        if self._parent is not None and names:
+            self._overlay_names = self._overlay_names | names
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        path: Union[str, Path],
+        resolution_cache_size: Optional[int] = DEFAULT_RESOLUTION_CACHE_SIZE,
+    ) -> "ExtensionRegistry":
+        """Restore a registry written by :meth:`save_snapshot`.
+
+        Falls back to building the default registry from the bundled YAML
+        files when ``path`` does not exist or is stale, i.e. was written for a
+        different ``substrait`` or ``substrait-extensions`` version, snapshot
+        format or layout of the pickled classes. See
+        :mod:`substrait.extension_registry.snapshot`.
+        """
+        state = read_snapshot(path)
+        if state is None:
+            return cls(resolution_cache_size=resolution_cache_size)
+        registry = cls(
+            load_default_extensions=False,
+            resolution_cache_size=resolution_cache_size,
+            lazy=state["lazy"],
+        )
+        tables = _Tables()
+        tables.urn_anchors.update(state["urns"])
+        for urn, names in state["functions"].items():
+            tables.urn_positions[urn] = len(tables.urn_positions)
+            tables.functions[urn] = names
+            for name, entries in names.items():
+                tables.overload_indexes[urn, name] = OverloadIndex(entries)
+                tables.index_function_urn(name, urn, entries[0].function_type)
+        tables.next_urn_anchor = state["next_urn_anchor"]
+        tables.next_function_anchor = state["next_function_anchor"]
+        tables.anchor_blocks.update(state["anchor_blocks"])
+        registry._publish(tables)
+        return registry
+
+    def save_snapshot(self, path: Union[str, Path]) -> None:
+        """Write every registered extension to a snapshot at ``path``.
+
+        Lazily indexed extensions are loaded first. Registered extension
+        relations are not part of the snapshot.
+        """
+        self._load_pending()
+        tables = self._tables
+        state = {
+            "lazy": self._lazy,
+            "urns": tables.urn_anchors,
+            "functions": tables.functions,
+            "next_urn_anchor": tables.next_urn_anchor,
+            "next_function_anchor": tables.next_function_anchor,
+            "anchor_blocks": tables.anchor_blocks,
+        }
+        write_snapshot(state, path)
 
     def register_extension_yaml(
         self,
         fname: Union[str, Path],
+        trusted: bool = False,
     ) -> None:
         """Register extensions from a YAML file.
         Args:
             fname: Path to the YAML file
+            trusted: Skip validating the file against the simple extensions
+                schema, which is faster; only for files known to be valid
+        """
+        self.register_extension_yamls([fname], trusted)
+
+    def register_extension_yamls(
+        self,
+        fnames: Iterable[Union[str, Path]],
+        trusted: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Register extensions from several YAML files at once.
+
+        The files are parsed with ``executor`` (e.g. a thread or process pool)
+        when given, concurrently, and then registered in the order of
+        ``fnames``, so anchors do not depend on which parse finishes first.
+        All of them become visible to lookups together. Files whose content
+        was registered before are not parsed again (see
+        :func:`registration_cache_info`).
+
+        Args:
+            fnames: Paths to the YAML files
+            trusted: As for :meth:`register_extension_yaml`
+            executor: A :class:`concurrent.futures.Executor` to parse with
+        """
+        paths = [Path(fname).resolve() for fname in fnames]
+        contents = [path.read_bytes() for path in paths]
+        keys = [_content_key("yaml", content, trusted) for content in contents]
+        prepared = [_registration_cache.get(key) for key in keys]
+        missing = [i for i, extension in enumerate(prepared) if extension is None]
+        parse = map if executor is None else executor.map
+        parsed = parse(parse_extension_yaml, [contents[i] for i in missing])
+        for i, definitions in zip(missing, parsed):
+            prepared[i] = _prepare_extension(definitions, trusted)
+            _registration_cache.put(keys[i], prepared[i])
+        self._register_prepared(prepared)
+
+    def register_extension_bytes(
+        self, content: Union[bytes, str], trusted: bool = False
+    ) -> None:
+        """Register extensions from the content of a YAML file, e.g. fetched
+        from a database, without writing it to disk.
+        Args:
+            content: The YAML document
+            trusted: As for :meth:`register_extension_yaml`
         """
-        fname = Path(fname)
-        with open(fname) as f:  # type: ignore
-            extension_definitions = yaml.safe_load(f)
-        self.register_extension_dict(extension_definitions)
+        if isinstance(content, str):
+            content = content.encode()
+        key = _content_key("yaml", content, trusted)
+        extension = _registration_cache.get(key)
+        if extension is None:
+            definitions = parse_extension_yaml(content)
+            extension = _prepare_extension(definitions, trusted)
+            _registration_cache.put(key, extension)
+        self._register_prepared([extension])
 
     def register_extension_relation(self, detail_cls) -> None:
         """Register an extension-relation detail class (by its ``type_url``).
@@ -57,55 +388,95 @@ class ExtensionRegistry:
         this ``ExtensionRegistry`` instance, so inference must be given this same
         registry (as it is when a plan is built or re-inferred through it).
         """
-        self._extension_relations[detail_cls.type_url] = detail_cls
+        with self._lock:
+            self._check_mutable()
+            tables = self._tables.copy()
+            tables.extension_relations[detail_cls.type_url] = detail_cls
+            self._publish(tables)
 
     def lookup_extension_relation(self, type_url: str):
         """The extension-relation detail class registered for ``type_url``, or None."""
-        return self._extension_relations.get(type_url)
+        return self._tables.extension_relations.get(type_url)
 
-    def register_extension_dict(self, definitions: dict) -> None:
+    def register_extension_dict(self, definitions: dict, trusted: bool = False) -> None:
         """Register extensions from a dictionary (parsed YAML).
         Args:
-            definitions: The extension definitions dictionary
-        """
-        unverified_urn = definitions.get("urn")
-        if not unverified_urn:
-            raise ValueError("Extension definitions must contain a 'urn' field")
-        urn = validate_urn_format(unverified_urn)
-        self._urn_mapping[urn] = next(self._urn_id_generator)
-        simple_extensions = build_simple_extensions(definitions)
-
-        # Helper to register functions by type
-        def register_functions_by_type(
-            functions_list: list, func_type: FunctionType
-        ) -> None:
-            if not functions_list:
-                return
+            definitions: The extension definitions dictionary; registered
+                functions keep a copy of it
+            trusted: As for :meth:`register_extension_yaml`
+        """
+        key = _definitions_key(definitions, trusted)
+        extension = None if key is None else _registration_cache.get(key)
+        if extension is None:
+            # Entries are shared by every registration of the same content, so
+            # they must not refer to a dict the caller may still change.
+            extension = _prepare_extension(copy.deepcopy(definitions), trusted)
+            if key is not None:
+                _registration_cache.put(key, extension)
+        self._register_prepared([extension])
+
+    def _register_prepared(self, extensions: list) -> None:
+        """Register ``(urn, functions)`` pairs from :func:`_prepare_extension`,
+        in order, as one new version of the tables."""
+        with self._lock:
+            self._check_mutable()
+            # Defaults indexed under the same URNs are registered first, as they
+            # would have been by an eager registry.
+            self._load_pending([urn for urn, _ in extensions])
+            tables = self._tables.copy()
+            names: set = set()
+            for urn, functions in extensions:
+                tables.assign_urn_anchor(urn)
+                names |= tables.add_functions(urn, functions, self._lazy)
+            # New overloads can change the outcome of any earlier resolution.
+            tables.generation += 1
+            self._publish(tables, frozenset(names))
+            self._resolution_cache.clear()
+
+    def _index_extension_yaml(self, fname: Path) -> None:
+        """Reserve a URN anchor for ``fname`` and defer loading it."""
+        match = _URN_LINE.search(fname.read_text())
+        if match is None:
+            self.register_extension_yaml(fname, trusted=True)
+            return
+        urn = validate_urn_format(match.group(1))
+        with self._lock:
+            tables = self._tables.copy()
+            if urn not in tables.pending:
+                # Reserves the URN's place in the search order too, so iteration
+                # follows index order, not the order lookups load extensions in.
+                tables.assign_urn_anchor(urn)
+            tables.pending[urn] = tables.pending.get(urn, ()) + (fname,)
+            self._publish(tables)
 
-            for function in functions_list:
-                self._function_mapping[urn][function.name].extend(
-                    [
-                        FunctionEntry(
-                            urn=urn,
-                            name=function.name,
-                            impl=impl,
-                            anchor=next(self._id_generator),
-                            function_type=func_type,
+    def _load_pending(self, urns=None) -> None:
+        """Load the indexed extensions among ``urns`` (all of them when None)."""
+        if not self._needs_loading(urns):
+            return
+        with self._lock:
+            if not self._needs_loading(urns):  # loaded by another thread
+                return
+            tables = self._tables.copy()
+            pending = tables.pending
+            for urn in list(pending) if urns is None else urns:
+                for fname in pending.pop(urn, ()):
+                    # Only the bundled default extensions are ever indexed.
+                    declared, functions = _prepare_file(fname, trusted=True)
+                    if declared != urn:
+                        raise ValueError(
+                            f"Extension file {fname} declares URN "
+                            f"{declared!r}, indexed as {urn!r}"
                         )
-                        for impl in function.impls
-                    ]
-                )
+                    tables.add_functions(urn, functions, self._lazy)
+            # Only adds overloads for URNs no cached resolution has searched,
+            # so the generation (and the resolution cache) stays valid.
+            self._publish(tables)
 
-        # Register each function type
-        register_functions_by_type(
-            simple_extensions.scalar_functions or [], FunctionType.SCALAR
-        )
-        register_functions_by_type(
-            simple_extensions.aggregate_functions or [], FunctionType.AGGREGATE
-        )
-        register_functions_by_type(
-            simple_extensions.window_functions or [], FunctionType.WINDOW
-        )
+    def _needs_loading(self, urns) -> bool:
+        pending = self._tables.pending
+        if urns is None:
+            return bool(pending)
+        return bool(pending) and any(urn in pending for urn in urns)
 
     def _find_matching_functions(
         self,
@@ -113,23 +484,145 @@ class ExtensionRegistry:
         signature: tuple[Type] | list[Type],
         urns: list[str] | None = None,
     ) -> list[tuple[FunctionEntry, Type]]:
-        """Helper method to find matching functions across specified URNs."""
-        matches = []
-        urns_to_search = (
-            urns if urns is not None else list(self._function_mapping.keys())
+        """Helper method to find matching functions across specified URNs.
+
+        Results are memoized per ``(urns, function_name, signature)``; every call
+        returns fresh copies of the output types, so callers may mutate them.
+        """
+        (matches,) = self._resolve_group(
+            function_name,
+            None if urns is None else tuple(urns),
+            [(signature, signature_fingerprint(signature))],
+        )
+        return [(entry, _copy_output(output)) for entry, output in matches]
+
+    def _resolve_group(
+        self,
+        function_name: str,
+        urns: Optional[tuple],
+        requests: list[tuple],
+        counters: Optional[ResolutionCounters] = None,
+    ) -> list[list[tuple[FunctionEntry, Type]]]:
+        """The matches of each ``(signature, fingerprint)`` in ``requests`` for
+        ``function_name`` within ``urns`` (every URN defining it when None).
+
+        Cached resolutions are reused; for the rest, the overload indexes are
+        fetched once for the whole group. The matches are shared with the
+        cache and must be copied before being handed out. ``counters``, set
+        when instrumentation is enabled, tallies the work done.
+        """
+        instrumentation = self._instrumentation
+        if instrumentation is not None and counters is None:
+            counters = ResolutionCounters()
+            start = time.perf_counter()
+            results = self._resolve_group(function_name, urns, requests, counters)
+            instrumentation.record(
+                urns[0] if urns is not None and len(urns) == 1 else None,
+                function_name,
+                len(requests),
+                counters,
+                time.perf_counter() - start,
+            )
+            return results
+        if self._parent is not None and function_name not in self._overlay_names:
+            # No URN this overlay registered defines the name: the frozen
+            # parent's answer is this overlay's answer too.
+            return self._parent._resolve_group(function_name, urns, requests, counters)
+        generation = self._tables.generation
+        results: list = [None] * len(requests)
+        misses = []
+        for position, (_, fingerprint) in enumerate(requests):
+            if fingerprint is not None:
+                key = (function_name, urns, fingerprint)
+                cached = self._resolution_cache.get(key, _MISSING)
+                if cached is not _MISSING and cached[0] == generation:
+                    results[position] = cached[1]
+                    if counters is not None:
+                        counters.cache_hits += 1
+                    continue
+            misses.append(position)
+        if not misses:
+            return results
+
+        self._load_pending(urns)
+        tables = self._tables
+        indexes = [
+            tables.overload_indexes.get((urn, function_name))
+            for urn in (
+                urns
+                if urns is not None
+                else tables.function_urns.get(function_name, ())
+            )
+        ]
+        indexes = [index for index in indexes if index is not None]
+        check = covers if counters is None else counters.covers
+        for position in misses:
+            signature, fingerprint = requests[position]
+            matches = []
+            for index in indexes:
+                candidates = index.candidates(signature)
+                if counters is not None:
+                    counters.candidates += len(candidates)
+                for f in candidates:
+                    rtn = f.satisfies_signature(signature, fingerprint, check)
+                    if rtn is not None:
+                        matches.append((f, rtn))
+            results[position] = matches
+            if fingerprint is not None:
+                self._resolution_cache.put(
+                    (function_name, urns, fingerprint), (generation, matches)
+                )
+        return results
+
+    def resolve_many(
+        self,
+        requests: Iterable[tuple[Union[str, Sequence[str], None], str, Sequence]],
+    ) -> list[Optional[tuple[FunctionEntry, Type]]]:
+        """Resolve a batch of ``(urn or urns, function_name, signature)`` requests.
+
+        Each result is what :meth:`lookup_function` (for a single URN) or
+        :meth:`find_function` (for a list of URNs, or None for all of them)
+        would return, in request order. Identical requests are resolved once,
+        requests for the same ``(urns, function_name)`` share one fetch of the
+        overload indexes, and each distinct signature is keyed only once.
+        """
+        positions: dict = {}
+        groups: dict = {}
+        order = []
+        for urns, function_name, signature in requests:
+            if isinstance(urns, str):
+                urns = (urns,)
+            elif urns is not None:
+                urns = tuple(urns)
+            fingerprint = signature_fingerprint(signature)
+            key = (urns, function_name, fingerprint)
+            if fingerprint is None or key not in positions:
+                group = groups.setdefault((urns, function_name), [])
+                if fingerprint is not None:
+                    positions[key] = ((urns, function_name), len(group))
+                order.append(((urns, function_name), len(group)))
+                group.append((signature, fingerprint))
+            else:
+                order.append(positions[key])
+
+        self._load_pending(
+            None
+            if any(urns is None for urns, _ in groups)
+            else list(dict.fromkeys(urn for urns, _ in groups for urn in urns))
         )
-        for urn in urns_to_search:
-            if (
-                urn not in self._function_mapping
-                or function_name not in self._function_mapping[urn]
-            ):
-                continue
-            functions = self._function_mapping[urn][function_name]
-            for f in functions:
-                rtn = f.satisfies_signature(signature)
-                if rtn is not None:
-                    matches.append((f, rtn))
-        return matches
+        resolved = {
+            group: self._resolve_group(group[1], group[0], group_requests)
+            for group, group_requests in groups.items()
+        }
+        results = []
+        for group, position in order:
+            matches = resolved[group][position]
+            if matches:
+                entry, output = matches[0]
+                results.append((entry, _copy_output(output)))
+            else:
+                results.append(None)
+        return results
 
     # TODO add an optional return type check
     def lookup_function(
@@ -175,8 +668,60 @@ class ExtensionRegistry:
         matches = self._find_matching_functions(function_name, signature, urns)
         return matches[0] if matches else None
 
+    def resolution_cache_info(self) -> CacheInfo:
+        """Hit/miss counters and occupancy of the overload-resolution cache."""
+        return self._resolution_cache.info()
+
+    def clear_resolution_cache(self) -> None:
+        """Drop every memoized resolution and reset the hit/miss counters."""
+        self._resolution_cache.clear(reset_stats=True)
+
+    def enable_instrumentation(
+        self, callback: Optional[StatsCallback] = None
+    ) -> RegistryInstrumentation:
+        """Start recording per-``(urn, name)`` resolution statistics.
+
+        Returns the :class:`RegistryInstrumentation` collecting them (also
+        available as :attr:`instrumentation`); ``callback`` receives the
+        statistics of each resolution call as it completes. Replaces any
+        instrumentation enabled earlier. Disabled registries pay nothing.
+        """
+        self._instrumentation = RegistryInstrumentation(callback)
+        return self._instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """Stop recording resolution statistics."""
+        self._instrumentation = None
+
+    @property
+    def instrumentation(self) -> Optional[RegistryInstrumentation]:
+        """The active :class:`RegistryInstrumentation`, or None if disabled."""
+        return self._instrumentation
+
     def lookup_urn(self, urn: str) -> Optional[int]:
-        return self._urn_mapping.get(urn, None)
+        """The anchor of ``urn``, or None if it is not registered.
+
+        Lazily indexed extensions already have their anchor, so this never
+        loads a file.
+        """
+        return self._tables.urn_anchors.get(urn, None)
+
+    def function_urns(self, function_name: str) -> list[str]:
+        """The URNs defining ``function_name``, in the order a search over
+        every URN visits them (the order the URNs were registered)."""
+        self._load_pending()
+        return list(self._tables.function_urns.get(function_name, ()))
+
+    def iter_function_names(self):
+        """Yield ``(name, urns, function_type)`` once per distinct function name.
+
+        ``urns`` lists the URNs defining the name in search order (see
+        :meth:`function_urns`); ``function_type`` is that of the last of them.
+        Read straight from the name index, without visiting every overload.
+        """
+        self._load_pending()
+        for name, urns in self._tables.function_urns.items():
+            yield name, list(urns), next(reversed(urns.values()))
 
     def iter_functions(self):
         """Yield ``(urn, name, function_type)`` for every registered function.
@@ -185,12 +730,143 @@ class ExtensionRegistry:
         discovering the full set of available functions, e.g. to build a
         function-helper namespace.
         """
-        for urn, names in self._function_mapping.items():
+        self._load_pending()
+        for urn, names in self._tables.functions.items():
             for name, entries in names.items():
                 if entries:
                     yield urn, name, entries[0].function_type
 
 
+# Prepared (urn, functions) of registered extension contents, keyed by
+# content digest; see _prepare_extension. Entries refer only to definitions
+# parsed or copied for them, never to a file or a caller's dict.
+_registration_cache = LRUCache(DEFAULT_REGISTRATION_CACHE_SIZE)
+
+
+def set_registration_cache_size(maxsize: Optional[int]) -> None:
+    """Set how many registered extension contents are remembered process-wide.
+
+    ``None`` makes the cache unbounded and ``0`` disables it.
+    """
+    _registration_cache.resize(maxsize)
+
+
+def registration_cache_info() -> CacheInfo:
+    """Hit/miss counters and occupancy of the registration cache."""
+    return _registration_cache.info()
+
+
+def clear_registration_cache() -> None:
+    """Forget every remembered extension content and reset the counters."""
+    _registration_cache.clear(reset_stats=True)
+
+
+def _content_key(kind: str, content: bytes, trusted: bool) -> tuple:
+    return (kind, hashlib.sha256(content).digest(), trusted)
+
+
+def _definitions_key(definitions: dict, trusted: bool) -> Optional[tuple]:
+    """The registration cache key of parsed definitions, or None if they do
+    not have a canonical JSON form."""
+    try:
+        canonical = json.dumps(definitions, sort_keys=True, default=repr)
+    except (TypeError, ValueError):
+        return None
+    return _content_key("dict", canonical.encode(), trusted)
+
+
+def _prepare_file(path: Union[str, Path], trusted: bool) -> tuple:
+    """:func:`_prepare_extension` for a YAML file, through the cache."""
+    content = Path(path).read_bytes()
+    key = _content_key("yaml", content, trusted)
+    extension = _registration_cache.get(key)
+    if extension is None:
+        definitions = parse_extension_yaml(content)
+        extension = _prepare_extension(definitions, trusted)
+        _registration_cache.put(key, extension)
+    return extension
+
+
+def _prepare_extension(definitions: dict, trusted: bool) -> tuple:
+    """Validate ``definitions`` and build its entries without anchors.
+
+    Returns ``(urn, functions)``, where ``functions`` holds ``(name, entries)``
+    pairs in definition order. The entries are templates, shared by every
+    registration of the same content; registries copy them with
+    ``with_anchor``, and rebuild their ``impl`` from the parsed function
+    definitions they keep. ``trusted`` definitions are not validated against
+    the schema.
+    """
+    unverified_urn = definitions.get("urn")
+    if not unverified_urn:
+        raise ValueError("Extension definitions must contain a 'urn' field")
+    urn = validate_urn_format(unverified_urn)
+    if trusted:
+        make_entry = FunctionEntry.from_dict
+        model = definitions
+    else:
+        make_entry = FunctionEntry
+        model = build_simple_extensions(definitions)
+    functions = []
+    for attribute, function_type in _FUNCTION_KINDS:
+        sources = definitions.get(attribute) or ()
+        if trusted:
+            listed = [(f["name"], f["impls"]) for f in sources]
+        else:
+            listed = [(f.name, f.impls) for f in getattr(model, attribute) or ()]
+        for source, (name, impls) in zip(sources, listed):
+            entries = tuple(
+                make_entry(
+                    urn,
+                    name,
+                    impl,
+                    None,
+                    function_type,
+                    (source, attribute, impl_index),
+                )
+                for impl_index, impl in enumerate(impls)
+            )
+            functions.append((name, entries))
+    return urn, tuple(functions)
+
+
+def default_extension_paths() -> list[Path]:
+    """The ``functions*.yaml`` files shipped with ``substrait_extensions``,
+    sorted by name so registration (and so anchor) order is reproducible."""
+    return sorted(
+        importlib_files("substrait_extensions.extensions").glob("functions*.yaml"),  # type: ignore
+        key=lambda path: path.name,
+    )
+
+
+def signature_fingerprint(signature: tuple | list) -> Optional[tuple]:
+    """A hashable, canonical key for a call signature.
+
+    Types are keyed on their :func:`~substrait.utils.type_key.type_key` and enum
+    options on the option string itself, so equal signatures always produce
+    equal keys. Returns None when the signature holds anything else, which is
+    then not cached.
+    """
+    key = []
+    for arg in signature:
+        if isinstance(arg, str):
+            key.append(arg)
+        elif isinstance(arg, Type):
+            key.append(type_key(arg))
+        else:
+            return None
+    return tuple(key)
+
+
+def _copy_output(output):
+    """A defensive copy of a resolved output type (a fresh message per caller)."""
+    if isinstance(output, Message):
+        copied = type(output)()
+        copied.CopyFrom(output)
+        return copied
+    return output
+
+
 def validate_urn_format(urn: str) -> str:
     """Validate that a URN follows the expected format.
     Expected format: extension:<organization>:<name>
@@ -1,11 +1,12 @@
 """Helper functions for extension registry."""
 
-from typing import Dict
+from typing import Dict, Optional
 
 from substrait.type_pb2 import Type
-from substrait_antlr.substrait_type.SubstraitTypeParser import SubstraitTypeParser
 
-from substrait.derivation_expression import _evaluate
+from substrait import derivation_parser as dp
+from substrait.derivation_expression import _to_node
+from substrait.utils.type_key import TypeKey, keys_equal, type_key
 
 from .exceptions import UnhandledParameterizedTypeError, UnrecognizedSubstraitTypeError
 
@@ -79,7 +80,8 @@ def _check_integer_constraint(
 
     Args:
         actual: The actual integer value to check
-        constraint: An ANTLR context for either a numeric literal or parameter name
+        constraint: A parsed number literal or parameter name (an ANTLR
+            numeric-parameter context is converted first)
         parameters: Mapping of parameter names to their resolved values
         subset: If True, checks if actual < constraint (for subset relationships).
                 If False, checks if actual == constraint (for exact match).
@@ -88,20 +90,22 @@ def _check_integer_constraint(
         True if the constraint is satisfied, False otherwise
 
     Raises:
-        TypeError: If constraint is not NumericLiteralContext or NumericParameterNameContext
+        TypeError: If constraint is neither a number literal nor a parameter name
     """
+    if not isinstance(constraint, dp.Node):
+        constraint = _to_node(constraint)
     constraint_numeric: int | None = None
-    if isinstance(constraint, SubstraitTypeParser.NumericLiteralContext):
-        constraint_numeric = int(str(constraint.Number()))
-    elif isinstance(constraint, SubstraitTypeParser.NumericParameterNameContext):
-        parameter_name = str(constraint.Identifier())
+    if isinstance(constraint, dp.Number):
+        constraint_numeric = constraint.value
+    elif isinstance(constraint, dp.ParameterName):
+        parameter_name = constraint.name
         if parameter_name not in parameters:
             parameters[parameter_name] = actual
         if isinstance(parameters[parameter_name], int):
             constraint_numeric = parameters[parameter_name]  # type:ignore
     else:
         raise TypeError(
-            f"Constraint must be either NumericLiteralContext or NumericParameterNameContext, "
+            f"Constraint must be either a number literal or a parameter name, "
             f"got {type(constraint).__name__} instead"
         )
     if constraint_numeric is None:
@@ -113,19 +117,26 @@ def _check_integer_constraint(
 
 
 def types_equal(type1: Type, type2: Type, check_nullability=False):
-    if check_nullability:
-        return type1 == type2
-    else:
-        x, y = Type(), Type()
-        x.CopyFrom(type1)
-        y.CopyFrom(type2)
-        x.__getattribute__(
-            x.WhichOneof("kind")  # type:ignore
-        ).nullability = Type.Nullability.NULLABILITY_UNSPECIFIED
-        y.__getattribute__(
-            y.WhichOneof("kind")  # type:ignore
-        ).nullability = Type.Nullability.NULLABILITY_UNSPECIFIED
-        return x == y
+    return keys_equal(type_key(type1), type_key(type2), check_nullability)
+
+
+# (kind, nullable) -> TypeKey of the parsed scalar types seen so far.
+_scalar_type_keys: Dict[tuple, TypeKey] = {}
+
+
+def scalar_type_key(node: dp.ScalarType) -> TypeKey:
+    """The :class:`TypeKey` of the type a parsed scalar type denotes."""
+    key = _scalar_type_keys.get((node.kind, node.nullable))
+    if key is None:
+        nullability = (
+            Type.Nullability.NULLABILITY_NULLABLE
+            if node.nullable
+            else Type.Nullability.NULLABILITY_REQUIRED
+        )
+        key = _scalar_type_keys[node.kind, node.nullable] = TypeKey(
+            node.kind, (), nullability, 0
+        )
+    return key
 
 
 def _bind_type_parameter(
@@ -157,18 +168,19 @@ def _bind_type_parameter(
 
 
 def _nullability_matches(
-    check_nullability: bool, parameterized_type, covered: Type, kind: str
+    check_nullability: bool, parameterized_type: dp.Node, covered: Type, kind: str
 ) -> bool:
     """Check if nullability constraints are satisfied.
 
     When check_nullability is False, any nullability is acceptable.
 
-    When check_nullability is True, the nullability declared in the ANTLR parameterized type
-    (via the ``isnull`` token) must match the nullability of the covered type's protobuf enum.
+    When check_nullability is True, the nullability declared by the parsed
+    parameterized type (a trailing ``?``) must match the nullability of the
+    covered type's protobuf enum.
 
     Args:
         check_nullability: If False, return True immediately (no constraint checking)
-        parameterized_type: ANTLR context that may have an ``isnull`` token attribute
+        parameterized_type: Parsed type node carrying a ``nullable`` flag
         covered: The protobuf Type message to check
         kind: The field name on the covered type (e.g., 'varchar', 'list')
 
@@ -178,11 +190,9 @@ def _nullability_matches(
     if not check_nullability:
         return True
 
-    # The ANTLR context stores a Token called ``isnull`` – it is
-    # present when the type is declared as nullable.
     parameterized_nullability = (
         Type.Nullability.NULLABILITY_NULLABLE
-        if getattr(parameterized_type, "isnull", None) is not None
+        if parameterized_type.nullable
         else Type.Nullability.NULLABILITY_REQUIRED
     )
 
@@ -196,19 +206,23 @@ def _nullability_matches(
     return parameterized_nullability == covered_nullability
 
 
-def check_integer_type_parameters(covered, parameterized_type, attributes, parameters):
-    for attr in attributes:
-        if not hasattr(covered, attr) and not hasattr(parameterized_type, attr):
-            return True
-        covered_attr = getattr(covered, attr)
-        param_attr = getattr(parameterized_type, attr)
-        if not _check_integer_constraint(covered_attr, param_attr, parameters):
+def check_integer_type_parameters(
+    covered, parameterized_type: dp.ParameterizedType, parameters
+) -> bool:
+    """Check each integer parameter of ``covered`` (e.g. ``covered.decimal``)
+    against the matching constraint of ``parameterized_type``."""
+    for attr, constraint in zip(
+        dp.PARAMETER_NAMES[parameterized_type.kind], parameterized_type.parameters
+    ):
+        if not _check_integer_constraint(
+            getattr(covered, attr), constraint, parameters
+        ):
             return False
     return True
 
 
 def _handle_parameterized_type(
-    parameterized_type: SubstraitTypeParser.ParameterizedTypeContext,
+    parameterized_type: dp.Node,
     covered: Type,
     parameters: dict,
     check_nullability=False,
@@ -218,77 +232,20 @@ def _handle_parameterized_type(
     if not _nullability_matches(check_nullability, parameterized_type, covered, kind):
         return False
 
-    if isinstance(parameterized_type, SubstraitTypeParser.VarCharContext):
-        return kind == "varchar" and check_integer_type_parameters(
-            covered.varchar, parameterized_type, ["length"], parameters
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.FixedCharContext):
-        return kind == "fixed_char" and check_integer_type_parameters(
-            covered.fixed_char, parameterized_type, ["length"], parameters
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.FixedBinaryContext):
-        return kind == "fixed_binary" and check_integer_type_parameters(
-            covered.fixed_binary, parameterized_type, ["length"], parameters
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.DecimalContext):
-        return kind == "decimal" and check_integer_type_parameters(
-            covered.decimal, parameterized_type, ["scale", "precision"], parameters
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.PrecisionTimeContext):
-        return kind == "precision_time" and check_integer_type_parameters(
-            covered.precision_time,
-            parameterized_type,
-            ["precision"],
-            parameters,
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.PrecisionTimestampContext):
-        return kind == "precision_timestamp" and check_integer_type_parameters(
-            covered.precision_timestamp,
-            parameterized_type,
-            ["precision"],
-            parameters,
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.PrecisionTimestampTZContext):
-        return kind == "precision_timestamp_tz" and check_integer_type_parameters(
-            covered.precision_timestamp_tz,
-            parameterized_type,
-            ["precision"],
-            parameters,
-        )
-
-    if isinstance(parameterized_type, SubstraitTypeParser.PrecisionIntervalDayContext):
-        return kind == "interval_day" and check_integer_type_parameters(
-            covered.interval_day,
-            parameterized_type,
-            ["precision"],
-            parameters,
-        )
-
-    if isinstance(
-        parameterized_type, SubstraitTypeParser.PrecisionIntervalCompoundContext
-    ):
-        return kind == "interval_compound" and check_integer_type_parameters(
-            covered.interval_compound,
-            parameterized_type,
-            ["precision"],
-            parameters,
+    if isinstance(parameterized_type, dp.ParameterizedType):
+        return kind == parameterized_type.kind and check_integer_type_parameters(
+            getattr(covered, kind), parameterized_type, parameters
         )
 
-    if isinstance(parameterized_type, SubstraitTypeParser.ListContext):
+    if isinstance(parameterized_type, dp.ListType):
         return kind == "list" and covers(
             covered.list.type,
-            parameterized_type.expr(),
+            parameterized_type.element,
             parameters,
             check_nullability,
         )
 
-    if isinstance(parameterized_type, SubstraitTypeParser.MapContext):
+    if isinstance(parameterized_type, dp.MapType):
         return (
             kind == "map"
             and covers(
@@ -302,53 +259,46 @@ def _handle_parameterized_type(
             )
         )
 
-    if isinstance(parameterized_type, SubstraitTypeParser.FuncContext):
+    if isinstance(parameterized_type, dp.FuncType):
         if kind != "func":
             return False
-        func_params = parameterized_type.funcParams()
-        param_exprs = func_params.expr()
-        if not isinstance(param_exprs, list):
-            param_exprs = [param_exprs]
         covered_params = covered.func.parameter_types
-        if len(covered_params) != len(param_exprs):
+        if len(covered_params) != len(parameterized_type.parameters):
             return False
-        for covered_param, param_expr in zip(covered_params, param_exprs):
+        for covered_param, param_expr in zip(
+            covered_params, parameterized_type.parameters
+        ):
             if not covers(covered_param, param_expr, parameters, check_nullability):
                 return False
         return covers(
             covered.func.return_type,
-            parameterized_type.returnType,
+            parameterized_type.return_type,
             parameters,
             check_nullability,
         )
 
-    if isinstance(parameterized_type, SubstraitTypeParser.StructContext):
+    if isinstance(parameterized_type, dp.StructType):
         if kind != "struct":
             return False
         covered_types = covered.struct.types
-        param_types = parameterized_type.expr() or []
-        if not isinstance(param_types, list):
-            param_types = [param_types]
-        if len(covered_types) != len(param_types):
+        if len(covered_types) != len(parameterized_type.types):
             return False
-        for covered_field, param_field_ctx in zip(covered_types, param_types):
-            if not covers(
-                covered_field,
-                param_field_ctx,
-                parameters,
-                check_nullability,  # type: ignore
-            ):
+        for covered_field, param_field in zip(covered_types, parameterized_type.types):
+            if not covers(covered_field, param_field, parameters, check_nullability):
                 return False
         return True
 
-    raise UnhandledParameterizedTypeError(f"Unhandled type {type(parameterized_type)}")
+    raise UnhandledParameterizedTypeError(
+        f"Unhandled type {type(parameterized_type).__name__}"
+    )
 
 
 def covers(
     covered: Type,
-    covering: SubstraitTypeParser.TypeLiteralContext,
+    covering: dp.Node,
     parameters: TypeParameterMapping,
     check_nullability: bool = False,
+    covered_key: Optional[TypeKey] = None,
 ) -> bool:
     """Check if a concrete type is covered by a parameterized type signature.
 
@@ -357,46 +307,44 @@ def covers(
 
     Args:
         covered: The concrete type being checked
-        covering: The parameterized type signature to check against
+        covering: The parsed type signature to check against (a
+            :mod:`substrait.derivation_parser` node; an ANTLR parse tree is
+            converted first)
         parameters: Mapping of type parameter names to their bound types
         check_nullability: If True, nullability must match exactly. If False, nullability is ignored.
+        covered_key: ``type_key(covered)``, if the caller already has it
 
     Returns:
         True if the covered type satisfies the covering type's constraints, False otherwise
     """
+    if not isinstance(covering, dp.Node):
+        covering = _to_node(covering)
+
+    # Handle scalar types
+    if isinstance(covering, dp.ScalarType):
+        if covered_key is None:
+            covered_key = type_key(covered)
+        return keys_equal(scalar_type_key(covering), covered_key, check_nullability)
+
     # Handle parameter names
-    if isinstance(covering, SubstraitTypeParser.ParameterNameContext):
-        parameter_name = str(covering.Identifier())
+    if isinstance(covering, dp.ParameterName):
         return _bind_type_parameter(
-            covered, parameter_name, parameters, check_nullability
+            covered, covering.name, parameters, check_nullability
         )
 
-    covering_typedef: SubstraitTypeParser.TypeDefContext = covering.typeDef()  # type:ignore
-
     # Handle any types
-    any_type: SubstraitTypeParser.AnyTypeContext = covering_typedef.anyType()  # type:ignore
-    if any_type:
-        if any_type.AnyVar():
+    if isinstance(covering, dp.AnyType):
+        if covering.name is not None:
             return _bind_type_parameter(
-                covered,
-                any_type.AnyVar().symbol.text,
-                parameters,
-                check_nullability,  # type:ignore
+                covered, covering.name, parameters, check_nullability
             )
         else:
             return True
 
-    # Handle scalar types
-    scalar_type = covering_typedef.scalarType()
-    if scalar_type:
-        covering_resolved = _evaluate(covering_typedef, {})
-        return types_equal(covering_resolved, covered, check_nullability)
-
-    # Handle parameterized types using singledispatch
-    parameterized_type = covering_typedef.parameterizedType()
-    if parameterized_type:
+    # Handle parameterized and nested types
+    if isinstance(covering, dp.TYPE_NODES):
         return _handle_parameterized_type(
-            parameterized_type, covered, parameters, check_nullability
+            covering, covered, parameters, check_nullability
         )
 
     return False
@@ -0,0 +1,115 @@
+"""On-disk snapshots of a fully loaded :class:`ExtensionRegistry`.
+
+A snapshot is a one-line header naming the snapshot format, the installed
+``substrait`` and ``substrait-extensions`` versions and a digest of the layouts
+of the pickled classes, followed by a pickle of the registry's URN,
+anchor and function tables, including each overload's pre-parsed argument and
+return-type nodes. Loading one skips YAML parsing, validation and expression
+parsing altogether, and neither ``yaml`` nor ``antlr4`` is imported.
+
+Snapshots are pickles: only load files written by a trusted process.
+
+Write the default registry's snapshot with
+``python -m substrait.extension_registry.snapshot PATH``.
+"""
+
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+# Bumped whenever the pickled registry layout changes.
+SNAPSHOT_FORMAT = 4
+
+_MAGIC = b"substrait-extension-registry-snapshot"
+# Upper bound on the header length, so a foreign file is rejected cheaply.
+_MAX_HEADER = 256
+
+
+def snapshot_key() -> bytes:
+    """The key a snapshot must carry to be loaded by this installation."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        own_version = version("substrait")
+    except PackageNotFoundError:  # run from a source tree
+        own_version = "unknown"
+    return (
+        f"{SNAPSHOT_FORMAT}:{own_version}:{version('substrait-extensions')}:"
+        f"{_layout_digest()}"
+    ).encode()
+
+
+def _layout_digest() -> str:
+    """A digest of the slots of every class a snapshot pickles, so a snapshot
+    written before one of them changed is not loaded even if the versions
+    (e.g. in a source tree) stayed the same."""
+    from substrait import derivation_parser as dp
+
+    from .function_entry import FunctionEntry, FunctionType
+
+    classes = [FunctionEntry, *_subclasses(dp.Node)]
+    layout = [
+        (cls.__module__, cls.__qualname__, cls.__slots__)
+        for cls in sorted(classes, key=lambda cls: cls.__qualname__)
+    ]
+    layout.append([member.value for member in FunctionType])
+    return hashlib.sha256(repr(layout).encode()).hexdigest()[:16]
+
+
+def _subclasses(cls) -> list:
+    found = []
+    for subclass in cls.__subclasses__():
+        found.append(subclass)
+        found.extend(_subclasses(subclass))
+    return found
+
+
+def write_snapshot(state: dict, path: Union[str, Path]) -> None:
+    """Atomically write ``state`` to ``path`` under the current snapshot key."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC + b" " + snapshot_key() + b"\n")
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: Union[str, Path]) -> Optional[dict]:
+    """The registry state stored at ``path``, or None if the file is missing,
+    is not a snapshot or was written by another version of ``substrait`` or
+    ``substrait-extensions``, snapshot format or class layout."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            end = buffer.find(b"\n", 0, _MAX_HEADER)
+            if end < 0 or buffer[:end] != _MAGIC + b" " + snapshot_key():
+                return None
+            with memoryview(buffer) as view, view[end + 1 :] as payload:
+                return pickle.loads(payload)
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 1:
+        print(
+            "usage: python -m substrait.extension_registry.snapshot PATH",
+            file=sys.stderr,
+        )
+        return 2
+    from .registry import ExtensionRegistry
+
+    ExtensionRegistry().save_snapshot(args[0])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import Optional, Union
 
 from substrait_extensions.extensions import simple_extensions as se
@@ -190,3 +191,18 @@ def build_simple_extensions(d: dict) -> se.SimpleExtensions:
         if "window_functions" in d
         else None,
     )
+
+
+def load_extension_yaml(path: Union[str, Path]) -> dict:
+    """Parse a simple extension YAML file, with libyaml's C loader when PyYAML
+    was built with it."""
+    return parse_extension_yaml(Path(path).read_bytes())
+
+
+def parse_extension_yaml(content: Union[bytes, str]) -> dict:
+    """Parse the content of a simple extension YAML file, as
+    :func:`load_extension_yaml` does."""
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.load(content, Loader=loader)
@@ -1,9 +1,8 @@
+from __future__ import annotations
+
 import random
 import string
-from typing import Callable
-
-from deepdiff import DeepDiff
-from sqloxide import parse_sql
+from typing import TYPE_CHECKING, Callable
 
 from substrait import algebra_pb2 as stalg
 from substrait import type_pb2 as stt
@@ -25,7 +24,9 @@ from substrait.builders.plan import (
     set,
     sort,
 )
-from substrait.extension_registry import ExtensionRegistry
+
+if TYPE_CHECKING:
+    from substrait.extension_registry import ExtensionRegistry
 
 SchemaResolver = Callable[[str], stt.NamedStruct]
 
@@ -48,6 +49,8 @@ window_function_mapping = {
 
 
 def compare_dicts(dict1, dict2):
+    from deepdiff import DeepDiff
+
     diff = DeepDiff(dict1, dict2, exclude_regex_paths=["span"])
     return len(diff) == 0
 
@@ -343,7 +346,11 @@ def convert(
     schema_resolver: SchemaResolver,
     registry: ExtensionRegistry = None,
 ):
+    from sqloxide import parse_sql
+
     ast = parse_sql(sql=query, dialect=dialect)[0]
     if not registry:
+        from substrait.extension_registry import ExtensionRegistry
+
         registry = ExtensionRegistry(load_default_extensions=True)
     return translate(ast, schema_resolver=schema_resolver, registry=registry)
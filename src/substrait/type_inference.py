@@ -9,6 +9,13 @@ import substrait.type_pb2 as stt
 from substrait.utils import iter_plan_rels, plan_subtrees, rel_anchor_of
 
 
+class SchemaNotDerivableError(ValueError):
+    """Raised when a plan's schema cannot be derived from what inference is given:
+    a relation kind it does not model (writes, DDL), an extension relation with no
+    registered schema deriver, an expand switching field with no duplicates, or an
+    outer reference that does not resolve in the current scope."""
+
+
 class _SubtreeScope:
     """The shared-subtree list a ``ReferenceRel`` resolves against, with per-ordinal
     schema memoization and cycle detection.
@@ -71,17 +78,40 @@ class _AnchorScope:
     sub-tree whose anchoring relation is not yet assembled (a lateral join's right
     input, at build or inference time). ``parent`` chains to an enclosing scope so
     nested correlations still resolve outer anchors.
+
+    Built with :meth:`for_plan`, the anchor index is only collected from the plan
+    on the first lookup it is needed for, so plans without id-based outer
+    references never pay for the whole-plan walk.
     """
 
-    __slots__ = ("_rels", "_subtrees", "_schemas", "_resolving", "_parent")
+    __slots__ = ("_rels", "_plan", "_subtrees", "_schemas", "_resolving", "_parent")
 
     def __init__(self, rels: dict, subtrees, *, parent=None):
         self._rels = rels
+        self._plan = None
         self._subtrees = subtrees
         self._schemas: dict = {}
         self._resolving: set = set()
         self._parent = parent
 
+    @classmethod
+    def for_plan(cls, plan: stp.Plan, subtrees, *, parent=None) -> "_AnchorScope":
+        """A scope indexing every ``rel_anchor`` in ``plan`` (across subtrees, the
+        root, and subquery-embedded relations), once an anchor is looked up."""
+        scope = cls(None, subtrees, parent=parent)
+        scope._plan = plan
+        return scope
+
+    def _anchored_rels(self) -> dict:
+        if self._rels is None:
+            self._rels = {
+                a: rel
+                for rel in iter_plan_rels(self._plan)
+                if (a := rel_anchor_of(rel)) is not None
+            }
+            self._plan = None
+        return self._rels
+
     def register(self, anchor, struct: stt.Type.Struct) -> None:
         """Pre-bind ``anchor`` to an already-known schema."""
         self._schemas[anchor] = struct
@@ -89,10 +119,12 @@ class _AnchorScope:
     def schema_of(self, anchor, registry) -> stt.Type.Struct:
         if anchor in self._schemas:
             return self._schemas[anchor]
-        if anchor not in self._rels:
+        if anchor not in self._anchored_rels():
             if self._parent is not None:
                 return self._parent.schema_of(anchor, registry)
-            raise Exception(f"outer reference to unknown rel_anchor {anchor}")
+            raise SchemaNotDerivableError(
+                f"outer reference to unknown rel_anchor {anchor}"
+            )
         if anchor in self._resolving:
             raise Exception(
                 f"outer reference rel_anchor {anchor} forms a resolution cycle"
@@ -135,6 +167,42 @@ anchor_scope: contextvars.ContextVar = contextvars.ContextVar(
 )
 
 
+# Relation schemas inferred in the current inference session (see
+# ``inference_session``): ``id(message) -> (message, registry, schema)`` for Rels
+# and Plans alike, or None outside a session.
+_inferred: contextvars.ContextVar = contextvars.ContextVar(
+    "inferred_schemas", default=None
+)
+
+
+@contextlib.contextmanager
+def inference_session():
+    """Memoize the schemas inferred within the block.
+
+    Each ``Rel`` (and ``Plan``) message's schema is inferred once per registry and
+    reused, by message identity, by every later ``infer_rel_schema`` /
+    ``infer_plan_schema`` call in the block -- so a workflow inferring one plan
+    several times (validating, printing and rewriting it) walks it once. The
+    memo keeps the messages alive until the block exits; they must not be
+    modified inside it. A nested session shares the enclosing one's memo.
+    """
+    if _inferred.get() is not None:
+        yield
+        return
+    token = _inferred.set({})
+    try:
+        yield
+    finally:
+        _inferred.reset(token)
+
+
+def _memoized(memo, message, registry):
+    entry = memo.get(id(message))
+    if entry is not None and entry[0] is message and entry[1] is registry:
+        return entry[2]
+    return None
+
+
 @contextlib.contextmanager
 def _outer_anchor_binding(anchor, struct):
     """Bind ``anchor`` -> ``struct`` for id-based outer references resolved within
@@ -145,15 +213,21 @@ def _outer_anchor_binding(anchor, struct):
     though the join relation is not yet in an anchor index. Nested lateral joins
     compose via the parent chain.
     """
-    scope = _AnchorScope({}, (), parent=anchor_scope.get())
-    scope.register(anchor, struct)
-    token = anchor_scope.set(scope)
+    token = _bind_outer_anchor(anchor, struct)
     try:
         yield
     finally:
         anchor_scope.reset(token)
 
 
+def _bind_outer_anchor(anchor, struct) -> contextvars.Token:
+    """Bind ``anchor`` -> ``struct`` in a scope chained to the current one, returning
+    the token that restores it."""
+    scope = _AnchorScope({}, (), parent=anchor_scope.get())
+    scope.register(anchor, struct)
+    return anchor_scope.set(scope)
+
+
 def _derive_extension_schema(detail, inputs, registry):
     """Derive a registered extension relation's output NamedStruct, or None.
 
@@ -299,9 +373,9 @@ def infer_literal_type(literal: stalg.Expression.Literal) -> stt.Type:
         raise Exception(f"Unknown literal_type {literal_type}")
 
 
-def infer_nested_type(
-    nested: stalg.Expression.Nested, parent_schema, *, registry=None, subtrees=()
-) -> stt.Type:
+def _nested_type(nested: stalg.Expression.Nested):
+    """The sub-expressions a nested expression's type is built from, and a function
+    building that type from theirs."""
     nested_type = nested.WhichOneof("nested_type")
 
     nullability = (
@@ -311,51 +385,45 @@ def infer_nested_type(
     )
 
     if nested_type == "struct":
-        return stt.Type(
-            struct=stt.Type.Struct(
-                types=[
-                    infer_expression_type(
-                        f, parent_schema, registry=registry, subtrees=subtrees
-                    )
-                    for f in nested.struct.fields
-                ],
-                nullability=nullability,
-            )
+        return (
+            lambda types: stt.Type(
+                struct=stt.Type.Struct(types=types, nullability=nullability)
+            ),
+            list(nested.struct.fields),
         )
     elif nested_type == "list":
-        return stt.Type(
-            list=stt.Type.List(
-                type=infer_expression_type(
-                    nested.list.values[0],
-                    parent_schema,
-                    registry=registry,
-                    subtrees=subtrees,
-                ),
-                nullability=nullability,
-            )
+        return (
+            lambda types: stt.Type(
+                list=stt.Type.List(type=types[0], nullability=nullability)
+            ),
+            [nested.list.values[0]],
         )
     elif nested_type == "map":
-        return stt.Type(
-            map=stt.Type.Map(
-                key=infer_expression_type(
-                    nested.map.key_values[0].key,
-                    parent_schema,
-                    registry=registry,
-                    subtrees=subtrees,
-                ),
-                value=infer_expression_type(
-                    nested.map.key_values[0].value,
-                    parent_schema,
-                    registry=registry,
-                    subtrees=subtrees,
-                ),
-                nullability=nullability,
-            )
+        key_value = nested.map.key_values[0]
+        return (
+            lambda types: stt.Type(
+                map=stt.Type.Map(key=types[0], value=types[1], nullability=nullability)
+            ),
+            [key_value.key, key_value.value],
         )
     else:
         raise Exception(f"Unknown nested_type {nested_type}")
 
 
+def infer_nested_type(
+    nested: stalg.Expression.Nested, parent_schema, *, registry=None, subtrees=()
+) -> stt.Type:
+    derive, operands = _nested_type(nested)
+    return derive(
+        [
+            infer_expression_type(
+                operand, parent_schema, registry=registry, subtrees=subtrees
+            )
+            for operand in operands
+        ]
+    )
+
+
 def infer_expression_type(
     expression: stalg.Expression,
     parent_schema: stt.Type.Struct,
@@ -363,6 +431,56 @@ def infer_expression_type(
     registry=None,
     subtrees=(),
 ) -> stt.Type:
+    """Infer the output type of ``expression`` over rows of ``parent_schema``.
+
+    Expressions typed from their sub-expressions (``if_then`` / ``switch``
+    branches, nested values, lambda bodies) are typed from an explicit stack
+    rather than by recursion, so arbitrarily deep expressions infer in bounded
+    Python stack.
+    """
+    found = _expression_type(expression, parent_schema, registry, subtrees)
+    if isinstance(found, stt.Type):
+        return found
+    types = []
+    # Entries are (derive, schema, operands) steps still to expand, (operand,
+    # schema) pairs still to type, and (derive, count) pairs building a type
+    # from the last ``count`` types once those are known.
+    stack = [found]
+    while stack:
+        entry = stack.pop()
+        if len(entry) == 3:
+            derive, schema, operands = entry
+            stack.append((derive, len(operands)))
+            stack.extend((operand, schema) for operand in reversed(operands))
+        elif isinstance(entry[0], stalg.Expression):
+            found = _expression_type(entry[0], entry[1], registry, subtrees)
+            if isinstance(found, stt.Type):
+                types.append(found)
+            else:
+                stack.append(found)
+        else:
+            derive, count = entry
+            start = len(types) - count
+            derived = derive(types[start:])
+            del types[start:]
+            types.append(derived)
+    return types[0]
+
+
+def _expression_type(expression: stalg.Expression, parent_schema, registry, subtrees):
+    """The type of ``expression`` if it is known without typing sub-expressions,
+    else a ``(derive, schema, operands)`` step: the type is ``derive`` applied to
+    the types of ``operands`` over ``schema``."""
+    found = _expression_step(expression, parent_schema, registry, subtrees)
+    # A conditional's type is that of its first branch; follow those directly.
+    while not isinstance(found, stt.Type) and found[0] is None:
+        found = _expression_step(found[2][0], found[1], registry, subtrees)
+    return found
+
+
+def _expression_step(expression: stalg.Expression, parent_schema, registry, subtrees):
+    """Like :func:`_expression_type`, but ``derive`` is None for an expression
+    typed as its single operand (a conditional's first branch)."""
     rex_type = expression.WhichOneof("rex_type")
     if rex_type == "selection":
         root_type = expression.selection.WhichOneof("root_type")
@@ -379,7 +497,7 @@ def infer_expression_type(
             if outer_ref.WhichOneof("outer_reference_type") == "rel_reference":
                 anchors = anchor_scope.get()
                 if anchors is None:
-                    raise Exception(
+                    raise SchemaNotDerivableError(
                         "rel_reference outer reference requires whole-plan context; "
                         "infer via infer_plan_schema"
                     )
@@ -395,7 +513,7 @@ def infer_expression_type(
                         "steps_out >= 1 (1 = the immediately enclosing query)"
                     )
                 if steps > len(stack):
-                    raise Exception(
+                    raise SchemaNotDerivableError(
                         "outer reference outside an enclosing (correlated) query"
                     )
                 schema = stack[len(stack) - steps].struct
@@ -424,19 +542,9 @@ def infer_expression_type(
     elif rex_type == "window_function":
         return expression.window_function.output_type
     elif rex_type == "if_then":
-        return infer_expression_type(
-            expression.if_then.ifs[0].then,
-            parent_schema,
-            registry=registry,
-            subtrees=subtrees,
-        )
+        return (None, parent_schema, [expression.if_then.ifs[0].then])
     elif rex_type == "switch_expression":
-        return infer_expression_type(
-            expression.switch_expression.ifs[0].then,
-            parent_schema,
-            registry=registry,
-            subtrees=subtrees,
-        )
+        return (None, parent_schema, [expression.switch_expression.ifs[0].then])
     elif rex_type == "cast":
         return expression.cast.type
     elif rex_type == "singular_or_list" or rex_type == "multi_or_list":
@@ -444,22 +552,22 @@ def infer_expression_type(
             bool=stt.Type.Boolean(nullability=stt.Type.Nullability.NULLABILITY_NULLABLE)
         )
     elif rex_type == "nested":
-        return infer_nested_type(
-            expression.nested, parent_schema, registry=registry, subtrees=subtrees
-        )
+        derive, operands = _nested_type(expression.nested)
+        return (derive, parent_schema, operands)
     elif rex_type == "lambda":
         # A lambda's type is func<param_types -> body_type>; the body's parameter
         # references resolve against the lambda's own parameter struct.
         lam = getattr(expression, "lambda")
-        body_type = infer_expression_type(
-            lam.body, lam.parameters, registry=registry, subtrees=subtrees
-        )
-        return stt.Type(
-            func=stt.Type.Func(
-                parameter_types=list(lam.parameters.types),
-                return_type=body_type,
-                nullability=stt.Type.NULLABILITY_REQUIRED,
-            )
+        return (
+            lambda types: stt.Type(
+                func=stt.Type.Func(
+                    parameter_types=list(lam.parameters.types),
+                    return_type=types[0],
+                    nullability=stt.Type.NULLABILITY_REQUIRED,
+                )
+            ),
+            lam.parameters,
+            [lam.body],
         )
     elif rex_type == "subquery":
         subquery_type = expression.subquery.WhichOneof("subquery_type")
@@ -684,6 +792,46 @@ def _set_output_struct(op_name: str, inputs: list) -> stt.Type.Struct:
     return stt.Type.Struct(types=types, nullability=primary.nullability)
 
 
+# The input relations each relation type's schema is inferred from, by field
+# name. A lateral join's right input is inferred with the join's anchor bound, so
+# it is scheduled separately; a ReferenceRel resolves through its _SubtreeScope.
+_RELATION_INPUTS = {
+    "filter": ("input",),
+    "fetch": ("input",),
+    "aggregate": ("input",),
+    "sort": ("input",),
+    "project": ("input",),
+    "set": ("inputs",),
+    "cross": ("left", "right"),
+    "join": ("left", "right"),
+    "lateral_join": ("left",),
+    "window": ("input",),
+    "expand": ("input",),
+    "nested_loop_join": ("left", "right"),
+    "hash_join": ("left", "right"),
+    "merge_join": ("left", "right"),
+    "exchange": ("input",),
+    "top_n": ("input",),
+    "extension_single": ("input",),
+    "extension_multi": ("inputs",),
+}
+
+
+def _relation_inputs(rel: stalg.Rel) -> list:
+    rel_type = rel.WhichOneof("rel_type")
+    fields = _RELATION_INPUTS.get(rel_type)
+    if fields is None:
+        return []
+    node = getattr(rel, rel_type)
+    inputs = []
+    for name in fields:
+        if name == "inputs":
+            inputs.extend(node.inputs)
+        else:
+            inputs.append(getattr(node, name))
+    return inputs
+
+
 def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.Struct:
     """Infer a relation's output struct.
 
@@ -691,7 +839,65 @@ def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.
     entries of a ``Plan``, extracted by :func:`infer_plan_schema`); a
     ``ReferenceRel`` resolves its schema against ``subtrees[subtree_ordinal]``. It
     defaults to ``()`` so plans without shared subtrees behave exactly as before.
+    Within an :func:`inference_session` each relation is inferred only once.
+
+    Inputs are inferred before the relations consuming them from an explicit stack
+    rather than by recursion, so arbitrarily deep relation trees infer in bounded
+    Python stack.
     """
+    memo = _inferred.get()
+    if memo is None:
+        # The walk below relies on the memo to hand each relation its inputs'
+        # schemas; outside a session it lasts for this call only.
+        with inference_session():
+            return infer_rel_schema(rel, registry=registry, subtrees=subtrees)
+    struct = _memoized(memo, rel, registry)
+    if struct is not None:
+        return struct
+    # Entries are (rel, phase): phase 0 schedules the relation's inputs, phase 1
+    # a lateral join's right input (with the join's anchor bound; the binding's
+    # token sits below it and is reset once it is inferred), and phase 2 infers
+    # the relation itself, its inputs' schemas now memoized.
+    stack = [(rel, 0)]
+    try:
+        while stack:
+            entry = stack.pop()
+            if isinstance(entry, contextvars.Token):
+                anchor_scope.reset(entry)
+                continue
+            current, phase = entry
+            if phase == 0:
+                if _memoized(memo, current, registry) is not None:
+                    continue
+                stack.append((current, 1))
+                stack.extend(
+                    (i, 0)
+                    for i in reversed(_relation_inputs(current))
+                    if _memoized(memo, i, registry) is None
+                )
+            elif phase == 1 and current.WhichOneof("rel_type") == "lateral_join":
+                stack.append((current, 2))
+                lateral_join = current.lateral_join
+                if lateral_join.common.HasField("rel_anchor"):
+                    left = infer_rel_schema(
+                        lateral_join.left, registry=registry, subtrees=subtrees
+                    )
+                    stack.append(
+                        _bind_outer_anchor(lateral_join.common.rel_anchor, left)
+                    )
+                stack.append((lateral_join.right, 0))
+            else:
+                struct = _infer_rel_schema(current, registry, subtrees)
+                memo[id(current)] = (current, registry, struct)
+    finally:
+        # Restore any anchor bindings still open if inference failed.
+        for entry in reversed(stack):
+            if isinstance(entry, contextvars.Token):
+                anchor_scope.reset(entry)
+    return memo[id(rel)][2]
+
+
+def _infer_rel_schema(rel: stalg.Rel, registry, subtrees) -> stt.Type.Struct:
     rel_type = rel.WhichOneof("rel_type")
 
     if rel_type == "read":
@@ -819,7 +1025,7 @@ def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.
             else:
                 duplicates = field.switching_field.duplicates
                 if not duplicates:
-                    raise ValueError(
+                    raise SchemaNotDerivableError(
                         "expand switching field has no duplicate expressions; its "
                         "output type cannot be inferred"
                     )
@@ -902,7 +1108,7 @@ def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.
     elif rel_type == "extension_leaf":
         derived = _derive_extension_schema(rel.extension_leaf.detail, None, registry)
         if derived is None:
-            raise Exception(
+            raise SchemaNotDerivableError(
                 "no schema deriver registered for extension leaf relation "
                 f"{rel.extension_leaf.detail.type_url!r}"
             )
@@ -928,13 +1134,13 @@ def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.
             rel.extension_multi.detail, input_structs, registry
         )
         if derived is None:
-            raise Exception(
+            raise SchemaNotDerivableError(
                 "no schema deriver registered for extension multi relation "
                 f"{rel.extension_multi.detail.type_url!r}"
             )
         (common, struct) = (rel.extension_multi.common, derived.struct)
     else:
-        raise Exception(f"Unhandled rel_type {rel_type}")
+        raise SchemaNotDerivableError(f"Unhandled rel_type {rel_type}")
 
     emit_kind = common.WhichOneof("emit_kind") or "direct"
 
@@ -948,21 +1154,33 @@ def infer_rel_schema(rel: stalg.Rel, *, registry=None, subtrees=()) -> stt.Type.
 
 
 def infer_plan_schema(plan: stp.Plan, *, registry=None) -> stt.NamedStruct:
+    # Inference runs in a session (the caller's, if any) so a relation reached
+    # more than once -- e.g. an anchored relation an outer reference points at --
+    # is inferred once.
+    with inference_session():
+        memo = _inferred.get()
+        schema = _memoized(memo, plan, registry)
+        if schema is None:
+            schema = _infer_plan_schema(plan, registry)
+            memo[id(plan)] = (plan, registry, schema)
+        return schema
+
+
+def _infer_plan_schema(plan: stp.Plan, registry) -> stt.NamedStruct:
     # A Plan carries its shared subtrees in-band as the leading ``rel`` entries of
     # ``relations`` (the query root is the trailing ``root`` entry), so a
     # ReferenceRel anywhere in the tree resolves against them by ordinal. Wrap them
     # in a _SubtreeScope so repeated references are memoized and cycles are caught.
     subtrees = _SubtreeScope(plan_subtrees(plan))
-    # Index every RelCommon.rel_anchor in the plan (across subtrees, the root, and
-    # subquery-embedded relations) so an id-based OuterReference (rel_reference)
-    # anywhere resolves against the anchored relation's output schema.
-    anchors = {
-        a: rel for rel in iter_plan_rels(plan) if (a := rel_anchor_of(rel)) is not None
-    }
-    # Chain to any enclosing anchor scope (e.g. a lateral join binding its left
-    # schema while its right input -- a separate plan being inferred here -- is
-    # built) so references to an outer anchor still resolve.
-    token = anchor_scope.set(_AnchorScope(anchors, subtrees, parent=anchor_scope.get()))
+    # Scope every RelCommon.rel_anchor in the plan (indexed on the first lookup)
+    # so an id-based OuterReference (rel_reference) anywhere resolves against the
+    # anchored relation's output schema. Chain to any enclosing anchor scope (e.g.
+    # a lateral join binding its left schema while its right input -- a separate
+    # plan being inferred here -- is built) so references to an outer anchor
+    # still resolve.
+    token = anchor_scope.set(
+        _AnchorScope.for_plan(plan, subtrees, parent=anchor_scope.get())
+    )
     try:
         root = plan.relations[-1].root
         schema = infer_rel_schema(root.input, registry=registry, subtrees=subtrees)
@@ -179,33 +179,71 @@ def _inline_reference_rels_in_place(rel: stalg.Rel, subtrees) -> None:
 def _iter_direct_subexpressions(msg):
     """Yield the immediate ``Expression`` messages owned by ``msg``.
 
-    Recurses through sub-messages that are neither ``Expression`` nor ``Rel`` (e.g.
+    Scans through sub-messages that are neither ``Expression`` nor ``Rel`` (e.g.
     ``FunctionArgument``, ``IfClause``, the ``Subquery`` wrappers), yields each
     ``Expression``-typed field without descending into it, and stops at ``Rel``
     fields (child relations / subquery inputs, handled separately). Discovered from
     the protobuf descriptor so it stays correct as the schema evolves -- a shallow
     scan of top-level ``Expression`` fields would miss e.g. an aggregate measure's
     arguments (``measures[].measure.arguments[].value``) or a sort key
-    (``sorts[].expr``).
+    (``sorts[].expr``). Sub-messages (a ``Literal`` or ``Type`` may nest
+    arbitrarily deep) are scanned from an explicit stack, in field order.
     """
-    for field in msg.DESCRIPTOR.fields:
-        if field.message_type is None:
-            continue
-        if field.message_type.GetOptions().map_entry:
-            continue
-        full = field.message_type.full_name
-        if field.is_repeated:
-            values = getattr(msg, field.name)
-            if full == "substrait.Expression":
-                yield from values
-            elif full != "substrait.Rel":
-                for value in values:
-                    yield from _iter_direct_subexpressions(value)
-        elif msg.HasField(field.name):
-            if full == "substrait.Expression":
-                yield getattr(msg, field.name)
-            elif full != "substrait.Rel":
-                yield from _iter_direct_subexpressions(getattr(msg, field.name))
+    stack = _held_messages(msg)[::-1]
+    while stack:
+        is_expression, value = stack.pop()
+        if is_expression:
+            yield value
+        else:
+            stack.extend(reversed(_held_messages(value)))
+
+
+# descriptor -> ({field name: (declaration index, is an Expression)}, whether
+# their declaration order is their field number order) for the fields of that
+# message type holding messages other than ``Rel``s and map entries.
+_SCANNED_FIELDS: dict = {}
+
+
+def _scanned_fields(descriptor):
+    fields = [
+        field
+        for field in descriptor.fields
+        if field.message_type is not None
+        and not field.message_type.GetOptions().map_entry
+        and field.message_type.full_name != "substrait.Rel"
+    ]
+    numbers = [field.number for field in fields]
+    return (
+        {
+            field.name: (index, field.message_type.full_name == "substrait.Expression")
+            for index, field in enumerate(fields)
+        },
+        numbers == sorted(numbers),
+    )
+
+
+def _held_messages(msg) -> list:
+    """``(is_expression, message)`` for each message ``msg`` holds in a field
+    :func:`_iter_direct_subexpressions` scans, in field declaration order."""
+    scanned = _SCANNED_FIELDS.get(msg.DESCRIPTOR)
+    if scanned is None:
+        scanned = _SCANNED_FIELDS[msg.DESCRIPTOR] = _scanned_fields(msg.DESCRIPTOR)
+    fields, in_number_order = scanned
+    # ListFields returns only the fields that are set, by field number.
+    found = []
+    for field, value in msg.ListFields():
+        entry = fields.get(field.name)
+        if entry is not None:
+            found.append((entry[0], entry[1], field.is_repeated, value))
+    if not in_number_order and len(found) > 1:
+        found.sort(key=lambda item: item[0])
+    held = []
+    for _, is_expression, is_repeated, value in found:
+        if is_repeated:
+            held.extend((is_expression, v) for v in value)
+        else:
+            held.append((is_expression, value))
+    return held
 
 
 def _iter_named_direct_expressions(node):
@@ -263,18 +301,27 @@ def _iter_subquery_rels(expr: stalg.Expression):
 def _iter_subquery_rels_in_expr(expr: stalg.Expression):
     """Yield every subquery input ``Rel`` reachable from ``expr`` in its own scope
     (i.e. not descending into those inner relations)."""
-    yield from _iter_subquery_rels(expr)
-    for sub in _iter_direct_subexpressions(expr):
-        yield from _iter_subquery_rels_in_expr(sub)
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        yield from _iter_subquery_rels(expr)
+        stack.extend(reversed(list(_iter_direct_subexpressions(expr))))
 
 
 def _walk_rel(rel: stalg.Rel):
-    yield rel
-    for container, key in _iter_child_rels(rel):
-        yield from _walk_rel(_child_rel(container, key))
-    for expr in _iter_rel_expressions(rel):
-        for inner in _iter_subquery_rels_in_expr(expr):
-            yield from _walk_rel(inner)
+    """Yield ``rel`` and every relation below it, pre-order: its child relations,
+    then those of the subqueries in its expressions. Walked from an explicit stack,
+    so arbitrarily deep trees walk in bounded Python stack and linear time."""
+    stack = [rel]
+    while stack:
+        rel = stack.pop()
+        yield rel
+        nested = [
+            _child_rel(container, key) for container, key in _iter_child_rels(rel)
+        ]
+        for expr in _iter_rel_expressions(rel):
+            nested.extend(_iter_subquery_rels_in_expr(expr))
+        stack.extend(reversed(nested))
 
 
 def iter_plan_rels(plan: stplan.Plan):
@@ -312,9 +359,11 @@ def _all_subexpressions(expr: stalg.Expression):
     """Yield every ``Expression`` transitively owned by ``expr`` in its own scope
     (through operators and subquery-wrapping expressions, but not into subquery
     input relations)."""
-    for sub in _iter_direct_subexpressions(expr):
+    stack = list(_iter_direct_subexpressions(expr))[::-1]
+    while stack:
+        sub = stack.pop()
         yield sub
-        yield from _all_subexpressions(sub)
+        stack.extend(reversed(list(_iter_direct_subexpressions(sub))))
 
 
 def _is_steps_out_ref(expr: stalg.Expression) -> bool:
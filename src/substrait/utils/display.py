@@ -105,7 +105,7 @@ class PlanPrinter:
         import io
 
         stream = io.StringIO()
-        self._stream_plan(plan, stream, 0)
+        self._drive(self._stream_plan(plan, stream, 0))
         return stream.getvalue()
 
     def stringify_expression(self, expression: stalg.Expression) -> str:
@@ -113,9 +113,25 @@ class PlanPrinter:
         import io
 
         stream = io.StringIO()
-        self._stream_expression(expression, stream, 0)
+        self._drive(self._stream_expression(expression, stream, 0))
         return stream.getvalue()
 
+    @staticmethod
+    def _drive(printing) -> None:
+        """Run a ``_stream_*`` generator to completion.
+
+        The ``_stream_*`` methods yield the generators printing their nested parts
+        rather than calling them; those run here from an explicit stack, in order,
+        so arbitrarily deep plans and expressions print in bounded Python stack.
+        """
+        stack = [printing]
+        while stack:
+            nested = next(stack[-1], None)
+            if nested is None:
+                stack.pop()
+            else:
+                stack.append(nested)
+
     def _stream_plan(self, plan: stp.Plan, stream, depth: int):
         """Print a plan concisely"""
         indent = " " * (depth * self.indent_size)
@@ -124,15 +140,15 @@ class PlanPrinter:
         for i, rel in enumerate(plan.relations):
             if i > 0:
                 stream.write(f"{indent}{self._indent_prefix(depth)}\n")
-            self._stream_relation(rel, stream, depth)
+            yield self._stream_relation(rel, stream, depth)
 
     def _stream_relation(self, rel: stp.PlanRel, stream, depth: int):
         """Print a plan relation concisely"""
 
         if rel.HasField("root"):
-            self._stream_rel_root(rel.root, stream, depth)
+            yield self._stream_rel_root(rel.root, stream, depth)
         elif rel.HasField("rel"):
-            self._stream_rel(rel.rel, stream, depth)
+            yield self._stream_rel(rel.rel, stream, depth)
 
     def _stream_rel_root(self, root: stalg.RelRoot, stream, depth: int):
         """Print a relation root concisely"""
@@ -145,34 +161,34 @@ class PlanPrinter:
             )
 
         # Print the input relation
-        self._stream_rel(root.input, stream, depth)
+        yield self._stream_rel(root.input, stream, depth)
 
     def _stream_rel(self, rel: stalg.Rel, stream, depth: int):
         """Print a relation concisely"""
         indent = " " * (depth * self.indent_size)
 
         if rel.HasField("read"):
-            self._stream_read_rel(rel.read, stream, depth)
+            yield self._stream_read_rel(rel.read, stream, depth)
         elif rel.HasField("filter"):
-            self._stream_filter_rel(rel.filter, stream, depth)
+            yield self._stream_filter_rel(rel.filter, stream, depth)
         elif rel.HasField("project"):
-            self._stream_project_rel(rel.project, stream, depth)
+            yield self._stream_project_rel(rel.project, stream, depth)
         elif rel.HasField("aggregate"):
-            self._stream_aggregate_rel(rel.aggregate, stream, depth)
+            yield self._stream_aggregate_rel(rel.aggregate, stream, depth)
         elif rel.HasField("sort"):
-            self._stream_sort_rel(rel.sort, stream, depth)
+            yield self._stream_sort_rel(rel.sort, stream, depth)
         elif rel.HasField("join"):
-            self._stream_join_rel(rel.join, stream, depth)
+            yield self._stream_join_rel(rel.join, stream, depth)
         elif rel.HasField("cross"):
-            self._stream_cross_rel(rel.cross, stream, depth)
+            yield self._stream_cross_rel(rel.cross, stream, depth)
         elif rel.HasField("fetch"):
-            self._stream_fetch_rel(rel.fetch, stream, depth)
+            yield self._stream_fetch_rel(rel.fetch, stream, depth)
         elif rel.HasField("extension_single"):
-            self._stream_extension_single_rel(rel.extension_single, stream, depth)
+            yield self._stream_extension_single_rel(rel.extension_single, stream, depth)
         elif rel.HasField("extension_multi"):
-            self._stream_extension_multi_rel(rel.extension_multi, stream, depth)
+            yield self._stream_extension_multi_rel(rel.extension_multi, stream, depth)
         elif rel.HasField("window"):
-            self._stream_window_rel(rel.window, stream, depth)
+            yield self._stream_window_rel(rel.window, stream, depth)
         else:
             stream.write(f"{indent}<unknown_relation>\n")
 
@@ -198,7 +214,7 @@ class PlanPrinter:
                 for i, row in enumerate(rows):
                     stream.write(f"{self._get_indent_with_arrow(depth + 2)}row[{i}]:\n")
                     for field in row.fields:
-                        self._stream_expression(field, stream, depth + 3)
+                        yield self._stream_expression(field, stream, depth + 3)
 
         if read.HasField("base_schema"):
             # Capture schema names for field resolution
@@ -216,11 +232,11 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(filter_rel.input, stream, depth + 1)
+        yield self._stream_rel(filter_rel.input, stream, depth + 1)
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('condition:', Colors.BLUE)}\n"
         )
-        self._stream_expression(filter_rel.condition, stream, depth + 1)
+        yield self._stream_expression(filter_rel.condition, stream, depth + 1)
 
     def _stream_project_rel(self, project: stalg.ProjectRel, stream, depth: int):
         """Print a project relation concisely"""
@@ -230,7 +246,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(project.input, stream, depth + 1)
+        yield self._stream_rel(project.input, stream, depth + 1)
 
         if project.expressions:
             stream.write(
@@ -240,7 +256,7 @@ class PlanPrinter:
                 stream.write(
                     f"{self._get_indent_with_arrow(depth + 2)}{self._color('expr', Colors.BLUE)}[{self._color(f'{i}', Colors.CYAN)}]:\n"
                 )
-                self._stream_expression(expr, stream, depth + 2)
+                yield self._stream_expression(expr, stream, depth + 2)
 
     def _stream_aggregate_rel(self, aggregate: stalg.AggregateRel, stream, depth: int):
         """Print an aggregate relation concisely"""
@@ -250,7 +266,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(aggregate.input, stream, depth + 1)
+        yield self._stream_rel(aggregate.input, stream, depth + 1)
 
         if aggregate.groupings:
             stream.write(
@@ -272,7 +288,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(sort.input, stream, depth + 1)
+        yield self._stream_rel(sort.input, stream, depth + 1)
 
     def _stream_join_rel(self, join: stalg.JoinRel, stream, depth: int):
         """Print a join relation concisely"""
@@ -284,17 +300,17 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('left:', Colors.BLUE)}\n"
         )
-        self._stream_rel(join.left, stream, depth + 1)
+        yield self._stream_rel(join.left, stream, depth + 1)
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('right:', Colors.BLUE)}\n"
         )
-        self._stream_rel(join.right, stream, depth + 1)
+        yield self._stream_rel(join.right, stream, depth + 1)
 
         if join.HasField("expression"):
             stream.write(
                 f"{self._get_indent_with_arrow(depth + 1)}{self._color('on:', Colors.BLUE)}\n"
             )
-            self._stream_expression(join.expression, stream, depth + 1)
+            yield self._stream_expression(join.expression, stream, depth + 1)
 
     def _stream_cross_rel(self, cross: stalg.CrossRel, stream, depth: int):
         """Print a cross relation concisely"""
@@ -304,11 +320,11 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('left:', Colors.BLUE)}\n"
         )
-        self._stream_rel(cross.left, stream, depth + 1)
+        yield self._stream_rel(cross.left, stream, depth + 1)
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('right:', Colors.BLUE)}\n"
         )
-        self._stream_rel(cross.right, stream, depth + 1)
+        yield self._stream_rel(cross.right, stream, depth + 1)
 
     @staticmethod
     def _fetch_bound_str(fetch: stalg.FetchRel, field: str, default: str) -> str:
@@ -337,7 +353,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(fetch.input, stream, depth + 1)
+        yield self._stream_rel(fetch.input, stream, depth + 1)
 
     def _stream_extension_single_rel(
         self, extension: stalg.ExtensionSingleRel, stream, depth: int
@@ -349,7 +365,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(extension.input, stream, depth + 1)
+        yield self._stream_rel(extension.input, stream, depth + 1)
 
         if extension.HasField("detail"):
             stream.write(
@@ -362,7 +378,7 @@ class PlanPrinter:
                     # Try to unpack as Expression
                     expression = stalg.Expression()
                     detail.Unpack(expression)
-                    self._stream_expression(expression, stream, depth + 2)
+                    yield self._stream_expression(expression, stream, depth + 2)
                 else:
                     stream.write(
                         f"{self._get_indent_with_arrow(depth + 2)}<binary_detail>\n"
@@ -388,7 +404,7 @@ class PlanPrinter:
                 stream.write(
                     f"{self._get_indent_with_arrow(depth + 2)}{self._color('input', Colors.BLUE)}[{self._color(f'{i}', Colors.CYAN)}]:\n"
                 )
-                self._stream_rel(input_rel, stream, depth + 3)
+                yield self._stream_rel(input_rel, stream, depth + 3)
 
         if extension.HasField("detail"):
             stream.write(
@@ -401,7 +417,7 @@ class PlanPrinter:
                     # Try to unpack as Expression
                     expression = stalg.Expression()
                     detail.Unpack(expression)
-                    self._stream_expression(expression, stream, depth + 2)
+                    yield self._stream_expression(expression, stream, depth + 2)
                 else:
                     stream.write(
                         f"{self._get_indent_with_arrow(depth + 2)}<binary_detail>\n"
@@ -424,7 +440,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input:', Colors.BLUE)}\n"
         )
-        self._stream_rel(window.input, stream, depth + 1)
+        yield self._stream_rel(window.input, stream, depth + 1)
 
         if window.partition_expressions:
             stream.write(
@@ -453,17 +469,21 @@ class PlanPrinter:
         indent = " " * (depth * self.indent_size)
 
         if expression.HasField("literal"):
-            self._stream_literal(expression.literal, stream, depth)
+            yield self._stream_literal(expression.literal, stream, depth)
         elif expression.HasField("selection"):
             self._stream_selection(expression.selection, stream, depth)
         elif expression.HasField("scalar_function"):
-            self._stream_scalar_function(expression.scalar_function, stream, depth)
+            yield self._stream_scalar_function(
+                expression.scalar_function, stream, depth
+            )
         elif expression.HasField("cast"):
-            self._stream_cast(expression.cast, stream, depth)
+            yield self._stream_cast(expression.cast, stream, depth)
         elif expression.HasField("if_then"):
-            self._stream_if_then(expression.if_then, stream, depth)
+            yield self._stream_if_then(expression.if_then, stream, depth)
         elif expression.HasField("window_function"):
-            self._stream_window_function(expression.window_function, stream, depth)
+            yield self._stream_window_function(
+                expression.window_function, stream, depth
+            )
         else:
             stream.write(f"{indent}<unknown_expression>\n")
 
@@ -487,7 +507,7 @@ class PlanPrinter:
             stream.write(f"{indent}literal: date={literal.date}\n")
         elif literal.HasField("map"):
             stream.write(f"{indent}literal: map\n")
-            self._stream_map_literal(literal.map, stream, depth + 1)
+            yield self._stream_map_literal(literal.map, stream, depth + 1)
         else:
             stream.write(f"{indent}literal: <complex>\n")
 
@@ -531,7 +551,7 @@ class PlanPrinter:
                     stream.write(
                         f"{self._get_indent_with_arrow(depth + 2)}{self._color('args', Colors.BLUE)}[{self._color(f'{i}', Colors.CYAN)}]:\n"
                     )
-                    self._stream_scalar_function(
+                    yield self._stream_scalar_function(
                         arg.value.scalar_function, stream, depth + 3
                     )
                 else:
@@ -539,7 +559,7 @@ class PlanPrinter:
                     stream.write(
                         f"{self._get_indent_with_arrow(depth + 2)}{self._color('args', Colors.BLUE)}[{self._color(f'{i}', Colors.CYAN)}]:\n"
                     )
-                    self._stream_function_argument(arg, stream, depth + 3)
+                    yield self._stream_function_argument(arg, stream, depth + 3)
 
         # Print function options if present
         if func.options:
@@ -570,7 +590,7 @@ class PlanPrinter:
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('input', Colors.BLUE)}:\n"
         )
-        self._stream_expression(cast.input, stream, depth + 1)
+        yield self._stream_expression(cast.input, stream, depth + 1)
         stream.write(
             f"{self._get_indent_with_arrow(depth + 1)}{self._color('to', Colors.BLUE)}: {self._type_to_string(cast.type)}\n"
         )
@@ -584,17 +604,17 @@ class PlanPrinter:
             stream.write(
                 f"{self._get_indent_with_arrow(depth + 1)}{self._color('if', Colors.BLUE)}:\n"
             )
-            self._stream_expression(if_then.ifs[0].if_, stream, depth + 1)
+            yield self._stream_expression(if_then.ifs[0].if_, stream, depth + 1)
             stream.write(
                 f"{self._get_indent_with_arrow(depth + 1)}{self._color('then', Colors.BLUE)}:\n"
             )
-            self._stream_expression(if_then.ifs[0].then, stream, depth + 1)
+            yield self._stream_expression(if_then.ifs[0].then, stream, depth + 1)
 
         if if_then.HasField("else_"):
             stream.write(
                 f"{self._get_indent_with_arrow(depth + 1)}{self._color('else', Colors.BLUE)}:\n"
             )
-            self._stream_expression(if_then.else_, stream, depth + 1)
+            yield self._stream_expression(if_then.else_, stream, depth + 1)
 
     def _stream_window_function(
         self, func: stalg.Expression.WindowFunction, stream, depth: int
@@ -611,7 +631,7 @@ class PlanPrinter:
                 stream.write(
                     f"{self._get_indent_with_arrow(depth + 2)}{self._color(f'{i}', Colors.CYAN)}:\n"
                 )
-                self._stream_function_argument(arg, stream, depth + 2)
+                yield self._stream_function_argument(arg, stream, depth + 2)
 
     def _get_function_argument_string(self, arg) -> str:
         """Get function argument content as a string without newlines"""
@@ -686,7 +706,9 @@ class PlanPrinter:
                 elif arg.value.literal.HasField("map"):
                     # Handle map literals with proper indentation
                     stream.write(f"{indent}literal: map\n")
-                    self._stream_map_literal(arg.value.literal.map, stream, depth + 1)
+                    yield self._stream_map_literal(
+                        arg.value.literal.map, stream, depth + 1
+                    )
                 else:
                     stream.write(f"{indent}literal: <complex>\n")
             elif arg.value.HasField("selection"):
@@ -703,7 +725,9 @@ class PlanPrinter:
                 else:
                     stream.write(f"{indent}field: root\n")
             elif arg.value.HasField("scalar_function"):
-                self._stream_scalar_function(arg.value.scalar_function, stream, depth)
+                yield self._stream_scalar_function(
+                    arg.value.scalar_function, stream, depth
+                )
             elif arg.value.HasField("enum"):
                 stream.write(f"{indent}enum: {arg.value.enum}\n")
             else:
@@ -729,7 +753,7 @@ class PlanPrinter:
                     f"{indent}    -> {self._color('key', Colors.BLUE)}: {self._color(kv.key.string, Colors.GREEN)}\n"
                 )
                 stream.write(f"{indent}    -> {self._color('value', Colors.BLUE)}:\n")
-                self._stream_literal_value(kv.value, stream, depth + 2)
+                yield self._stream_literal_value(kv.value, stream, depth + 2)
         else:
             stream.write(f"{indent}-> {self._color('empty map', Colors.YELLOW)}\n")
 
@@ -771,7 +795,7 @@ class PlanPrinter:
         elif literal.HasField("map"):
             # Recursively handle nested maps
             stream.write(f"{indent}{self._color('map', Colors.BLUE)}:\n")
-            self._stream_map_literal(literal.map, stream, depth + 1)
+            yield self._stream_map_literal(literal.map, stream, depth + 1)
         elif literal.HasField("list"):
             # Handle list literals
             stream.write(
@@ -779,7 +803,7 @@ class PlanPrinter:
             )
             for i, item in enumerate(literal.list.values):
                 stream.write(f"{indent}  -> {self._color(f'{i}', Colors.CYAN)}:\n")
-                self._stream_literal_value(item, stream, depth + 2)
+                yield self._stream_literal_value(item, stream, depth + 2)
         else:
             stream.write(
                 f"{indent}{self._color('<unknown_literal_type>', Colors.RED)}\n"
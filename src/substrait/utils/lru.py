@@ -0,0 +1,91 @@
+"""
+A small thread-safe, size-bounded LRU mapping with hit/miss counters.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, NamedTuple, Optional
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, shaped like :func:`functools.lru_cache`'s ``cache_info``."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class LRUCache:
+    """A least-recently-used mapping holding at most ``maxsize`` entries.
+
+    ``maxsize=None`` makes the cache unbounded and ``maxsize=0`` disables it
+    (every lookup misses and nothing is stored). All operations take an
+    internal lock, so one instance may be shared between threads.
+    """
+
+    __slots__ = ("_data", "_maxsize", "_hits", "_misses", "_lock")
+
+    def __init__(self, maxsize: Optional[int] = 128) -> None:
+        _check_maxsize(maxsize)
+        self._data: OrderedDict = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the value cached for ``key`` (marking it most recently used),
+        or ``default`` on a miss."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Cache ``value`` under ``key``, evicting the least recently used entry
+        when the cache is full."""
+        with self._lock:
+            if self._maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self._maxsize is not None and len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self, reset_stats: bool = False) -> None:
+        """Drop every entry; with ``reset_stats`` also zero the hit/miss counters."""
+        with self._lock:
+            self._data.clear()
+            if reset_stats:
+                self._hits = 0
+                self._misses = 0
+
+    def resize(self, maxsize: Optional[int]) -> None:
+        """Change the capacity, evicting least recently used entries as needed."""
+        _check_maxsize(maxsize)
+        with self._lock:
+            self._maxsize = maxsize
+            if maxsize is not None:
+                while len(self._data) > maxsize:
+                    self._data.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+def _check_maxsize(maxsize: Optional[int]) -> None:
+    if maxsize is not None and maxsize < 0:
+        raise ValueError(f"Cache size must be non-negative or None, got {maxsize}")
@@ -0,0 +1,109 @@
+"""
+Canonical, hashable keys for Substrait types.
+
+A :class:`TypeKey` captures everything that distinguishes one ``Type`` from
+another - its kind, its parameters (nested types included, as keys
+themselves), its nullability and its type variation - as a plain immutable
+tuple. Two types are equal exactly when their keys are, so keys can be
+compared, hashed and stored in place of the protobuf messages they describe.
+"""
+
+from collections.abc import MutableSequence
+from typing import NamedTuple, Optional
+
+import substrait.type_pb2 as stp
+from google.protobuf.descriptor import FieldDescriptor
+
+_TYPE_DESCRIPTOR = stp.Type.DESCRIPTOR
+
+# Kinds whose messages carry nothing but nullability and a type variation.
+_SIMPLE_KINDS = frozenset(
+    field.name
+    for field in _TYPE_DESCRIPTOR.oneofs_by_name["kind"].fields
+    if field.message_type is not None
+    and set(field.message_type.fields_by_name)
+    == {"nullability", "type_variation_reference"}
+)
+
+
+class TypeKey(NamedTuple):
+    """The canonical form of a ``Type``.
+
+    ``parameters`` holds ``(field name, value)`` pairs for every set field of
+    the kind's message other than nullability and variation, in field order;
+    nested types appear as their own keys.
+    """
+
+    kind: Optional[str]
+    parameters: tuple
+    nullability: int
+    variation: int
+
+
+_NO_KIND = TypeKey(None, (), 0, 0)
+
+# Builds a TypeKey without NamedTuple's argument handling, which dominates the
+# cost of keying a simple type.
+_new_key = tuple.__new__
+
+
+def type_key(typ: stp.Type) -> TypeKey:
+    """The :class:`TypeKey` of ``typ``."""
+    kind = typ.WhichOneof("kind")
+    if kind is None:
+        return _NO_KIND
+    value = getattr(typ, kind)
+    if kind in _SIMPLE_KINDS:
+        return _new_key(
+            TypeKey, (kind, (), value.nullability, value.type_variation_reference)
+        )
+    return _kind_key(kind, value)
+
+
+def struct_key(struct: stp.Type.Struct) -> TypeKey:
+    """The :class:`TypeKey` of ``Type(struct=struct)``, e.g. to compare two
+    relation schemas."""
+    return _kind_key("struct", struct)
+
+
+def keys_equal(key1: TypeKey, key2: TypeKey, check_nullability: bool = False) -> bool:
+    """Whether two keys describe the same type, optionally ignoring the
+    top-level nullability."""
+    if check_nullability:
+        return key1 == key2
+    return (
+        key1.kind == key2.kind
+        and key1.parameters == key2.parameters
+        and key1.variation == key2.variation
+    )
+
+
+def _kind_key(kind: str, value) -> TypeKey:
+    nullability = variation = 0
+    parameters = []
+    for field, field_value in value.ListFields():
+        name = field.name
+        if name == "nullability":
+            nullability = field_value
+        elif name == "type_variation_reference":
+            variation = field_value
+        else:
+            parameters.append((name, _field_key(field, field_value)))
+    return TypeKey(kind, tuple(parameters), nullability, variation)
+
+
+def _field_key(field: FieldDescriptor, value):
+    if isinstance(value, MutableSequence):  # a repeated field
+        return tuple(_value_key(field, item) for item in value)
+    return _value_key(field, value)
+
+
+def _value_key(field: FieldDescriptor, value):
+    if field.message_type is None:
+        return value
+    if field.message_type is _TYPE_DESCRIPTOR:
+        return type_key(value)
+    return tuple(
+        (nested.name, _field_key(nested, nested_value))
+        for nested, nested_value in value.ListFields()
+    )
@@ -1,10 +1,15 @@
+import pytest
 import substrait.algebra_pb2 as stalg
 import substrait.extended_expression_pb2 as stee
 import substrait.extensions.extensions_pb2 as ste
 import substrait.type_pb2 as stt
 import yaml
 
-from substrait.builders.extended_expression import literal, scalar_function
+from substrait.builders.extended_expression import (
+    literal,
+    scalar_function,
+    scalar_functions,
+)
 from substrait.extension_registry import ExtensionRegistry
 
 struct = stt.Type.Struct(
@@ -208,3 +213,34 @@ def test_nested_scalar_calls():
     )
 
     assert e == expected
+
+
+def _i8(value):
+    return literal(
+        value,
+        type=stt.Type(i8=stt.Type.I8(nullability=stt.Type.NULLABILITY_REQUIRED)),
+    )
+
+
+def test_scalar_functions_matches_individual_calls():
+    calls = [
+        ("extension:test:urn", "test_func", [_i8(1), _i8(2)]),
+        ("extension:test:urn", "is_positive", [_i8(3)], "positive"),
+        ("extension:test:urn", "test_func", [_i8(4), _i8(5)], None, {"a": "b"}),
+    ]
+    batched = scalar_functions(calls)(named_struct, registry)
+    individual = [scalar_function(*call)(named_struct, registry) for call in calls]
+
+    assert list(batched.referred_expr) == [e.referred_expr[0] for e in individual]
+    assert [d.extension_function.name for d in batched.extensions] == [
+        "test_func:i8",
+        "is_positive:i8",
+    ]
+    assert len(batched.extension_urns) == 1
+
+
+def test_scalar_functions_reports_unknown_functions():
+    with pytest.raises(Exception, match="Unknown function is_positive"):
+        scalar_functions([("extension:test:urn", "is_positive", [_i8(1), _i8(2)])])(
+            named_struct, registry
+        )
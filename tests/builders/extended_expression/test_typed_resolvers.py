@@ -0,0 +1,81 @@
+import pytest
+import substrait.type_pb2 as stt
+
+import substrait.builders.extended_expression as extended_expression
+from substrait.builders.extended_expression import (
+    alias,
+    cast,
+    column,
+    if_then,
+    literal,
+    multi_or_list,
+    scalar_function,
+    singular_or_list,
+    switch,
+)
+from substrait.builders.type import boolean, fp64, i8, i64
+from substrait.extension_registry import ExtensionRegistry
+from substrait.type_inference import infer_extended_expression_schema
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+
+named_struct = stt.NamedStruct(
+    names=["id", "flag"],
+    struct=stt.Type.Struct(
+        types=[i64(nullable=False), boolean()],
+        nullability=stt.Type.NULLABILITY_REQUIRED,
+    ),
+)
+
+registry = ExtensionRegistry(load_default_extensions=True)
+
+
+def _add(left, right):
+    return scalar_function(ARITHMETIC, "add", [left, right])
+
+
+EXPRESSIONS = {
+    "column": column("flag"),
+    "literal": literal(2, i8()),
+    "scalar_function": _add(column("id"), column("id")),
+    "alias": alias(_add(column("id"), literal(1, i64())), "plus_one"),
+    "if_then": if_then([(column("flag"), column("id"))], literal(0, i64())),
+    "switch": switch(
+        literal(1, i8()), [(literal(1, i8()), column("id"))], literal(0, i64())
+    ),
+    "cast": cast(column("id"), fp64()),
+    "singular_or_list": singular_or_list(column("id"), [literal(1, i64())]),
+    "multi_or_list": multi_or_list([column("id")], [[literal(1, i64())]]),
+}
+
+
+@pytest.mark.parametrize("name", EXPRESSIONS)
+def test_recorded_types_match_inferred_types(name):
+    resolver = EXPRESSIONS[name]
+    bound, types = resolver.typed(named_struct, registry)
+    assert bound == resolver(named_struct, registry)
+    inferred = infer_extended_expression_schema(bound, registry=registry).types
+    assert types == list(inferred)
+
+
+def test_deep_expression_binds_without_inference(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("bound types should not be re-inferred")
+
+    monkeypatch.setattr(extended_expression, "infer_extended_expression_schema", fail)
+    # Deeper than protobuf's nesting limit for messages copied via constructors.
+    expression = column("id")
+    for _ in range(60):
+        expression = if_then(
+            [(column("flag"), _add(expression, column("id")))], literal(0, i64())
+        )
+    bound, types = expression.typed(named_struct, registry)
+    assert types[0].WhichOneof("kind") == "i64"
+
+
+def test_untyped_arguments_are_inferred():
+    def untyped(base_schema, registry):
+        return column("id")(base_schema, registry)
+
+    bound = _add(untyped, column("id"))(named_struct, registry)
+    assert bound == _add(column("id"), column("id"))(named_struct, registry)
@@ -0,0 +1,89 @@
+import substrait.algebra_pb2 as stalg
+import substrait.type_pb2 as stt
+from google.protobuf import any_pb2
+
+import substrait.type_inference as type_inference
+from substrait.builders.extended_expression import column, literal
+from substrait.builders.plan import (
+    cross,
+    exchange,
+    extension_leaf,
+    filter,
+    plan_schema,
+    project,
+    read_named_table,
+    schema_session,
+    select,
+    set,
+)
+from substrait.builders.type import boolean, i64
+from substrait.extension_registry import ExtensionRegistry
+from substrait.type_inference import infer_plan_schema
+
+registry = ExtensionRegistry(load_default_extensions=False)
+
+named_struct = stt.NamedStruct(
+    names=["id", "is_applicable"],
+    struct=stt.Type.Struct(
+        types=[i64(nullable=False), boolean()],
+        nullability=stt.Type.NULLABILITY_REQUIRED,
+    ),
+)
+
+
+def _chain(depth):
+    plan = read_named_table("table", named_struct)
+    for i in range(depth):
+        if i % 3 == 0:
+            plan = filter(plan, literal(True, boolean()))
+        elif i % 3 == 1:
+            plan = project(plan, [column("id", alias="copy")])
+        else:
+            plan = select(plan, [column("id"), column("is_applicable")])
+    return plan
+
+
+def test_chain_infers_a_constant_number_of_relations_per_step(monkeypatch):
+    inferred = []
+    infer_rel_schema = type_inference.infer_rel_schema
+
+    def counting(rel, **kwargs):
+        inferred.append(rel.WhichOneof("rel_type"))
+        return infer_rel_schema(rel, **kwargs)
+
+    monkeypatch.setattr(type_inference, "infer_rel_schema", counting)
+    for depth in (30, 300):
+        inferred.clear()
+        _chain(depth)(registry)
+        assert len(inferred) <= 3 * depth
+
+
+def test_deep_chain_builds_and_matches_full_inference():
+    # Deeper than protobuf's nesting limit for messages copied via constructors.
+    plan = _chain(150)
+    with schema_session(registry):
+        bound = plan(registry)
+        assert plan_schema(bound, registry) == infer_plan_schema(
+            bound, registry=registry
+        )
+    assert len(bound.relations[-1].root.names) == 2
+
+
+def test_two_input_builders_derive_from_both_sides():
+    left, right = _chain(4), _chain(5)
+    with schema_session(registry):
+        bound = cross(left, right)(registry)
+        derived = plan_schema(bound, registry)
+    assert derived == infer_plan_schema(bound, registry=registry)
+    assert list(derived.names) == ["id", "is_applicable"] * 2 + ["copy"]
+
+
+def test_builders_not_needing_schemas_accept_underivable_inputs():
+    # No schema deriver is registered for this extension leaf.
+    leaf = extension_leaf(any_pb2.Any(type_url="example.com/Unknown"), names=["a"])
+    unioned = set([leaf, leaf], stalg.SetRel.SET_OP_UNION_ALL)(registry)
+    assert len(unioned.relations[-1].root.input.set.inputs) == 2
+    broadcast = exchange(leaf, broadcast=True)(registry)
+    exchanged = broadcast.relations[-1].root.input.exchange
+    assert exchanged.input.WhichOneof("rel_type") == "extension_leaf"
+    assert list(broadcast.relations[-1].root.names) == ["a"]
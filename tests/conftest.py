@@ -17,3 +17,22 @@ def find_reference():
         return None
 
     return _find_reference
+
+
+@pytest.fixture
+def deep_call():
+    """Return a helper calling a function on a very deep message, failing the
+    test with just the error if it raises.
+
+    A traceback through such a message would overflow the C stack while pytest
+    formats it (the frames' arguments are repr-ed), crashing the run."""
+
+    def _deep_call(function, *args, **kwargs):
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        # Outside the handler, so the failure does not chain the traceback.
+        pytest.fail(error, pytrace=False)
+
+    return _deep_call
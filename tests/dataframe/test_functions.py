@@ -8,7 +8,12 @@ import substrait.dataframe as sub
 from substrait.builders.plan import consistent_partition_window
 from substrait.builders.plan import read_named_table as b_read
 from substrait.builders.type import fp64, i64, named_struct, string, struct
-from substrait.dataframe.functions import _safe_name
+from substrait.dataframe import frame, function_catalog
+from substrait.dataframe.functions import (
+    _FunctionNamespace,
+    _registry_functions,
+    _safe_name,
+)
 from substrait.extension_registry import ExtensionRegistry
 
 registry = ExtensionRegistry(load_default_extensions=True)
@@ -192,3 +197,37 @@ def test_dataframe_f_is_bound_to_its_registry():
 def test_dataframe_f_is_cached():
     df = sub.read_named_table("t", {"x": sub.i64.non_null})
     assert df.f is df.f
+
+
+# ---------------------------------------------------------------------------
+# Generated catalog
+# ---------------------------------------------------------------------------
+
+
+def test_catalog_is_up_to_date():
+    # Regenerate with `python -m substrait.dataframe.function_catalog`.
+    assert function_catalog.CATALOG_PATH.read_text() == (
+        function_catalog.generate_catalog(registry)
+    )
+    assert function_catalog.catalog_functions() == sorted(_registry_functions(registry))
+
+
+def test_namespace_from_catalog_constructs_no_registry(monkeypatch):
+    def no_registry():
+        raise AssertionError("default registry constructed")
+
+    monkeypatch.setattr(frame, "default_registry", no_registry)
+    namespace = _FunctionNamespace()
+    assert callable(namespace.add)
+    assert sorted(dir(namespace)) == sorted(dir(sub.f))
+
+
+def test_stale_catalog_falls_back_to_the_default_registry(monkeypatch):
+    monkeypatch.setattr(function_catalog, "extensions_digest", lambda: "stale")
+    assert function_catalog.catalog_functions() is None
+    constructed = []
+    monkeypatch.setattr(
+        frame, "default_registry", lambda: constructed.append(1) or registry
+    )
+    assert callable(_FunctionNamespace().add)
+    assert constructed == [1]
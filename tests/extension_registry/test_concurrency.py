@@ -0,0 +1,146 @@
+import sys
+import threading
+
+import pytest
+
+from substrait.builders.type import boolean, decimal, fp64, i8, i32, string
+from substrait.extension_registry import ExtensionRegistry
+
+PREFIX = "extension:io.substrait:functions_"
+
+CALLS = [
+    (PREFIX + "arithmetic", "add", [i32(nullable=False), i32(nullable=False)]),
+    (PREFIX + "arithmetic", "multiply", [fp64(nullable=True), fp64(nullable=False)]),
+    (PREFIX + "arithmetic_decimal", "add", [decimal(2, 10, nullable=False)] * 2),
+    (PREFIX + "comparison", "equal", [string(nullable=False)] * 2),
+    (PREFIX + "comparison", "coalesce", [i8(nullable=False), i8(nullable=True)]),
+    (PREFIX + "boolean", "and", [boolean(nullable=False)] * 3),
+    (PREFIX + "string", "upper", [string(nullable=True)]),
+    (None, "subtract", [i8(nullable=False), i8(nullable=False)]),
+]
+
+THREADS = 8
+LOOKUPS_PER_THREAD = 4000
+EXTENSIONS_REGISTERED = 40
+
+
+def _lookup(registry, urn, name, signature):
+    if urn is None:
+        return registry.find_function(name, signature)
+    return registry.lookup_function(urn, name, signature)
+
+
+def _key(result):
+    entry, output = result
+    return entry.urn, entry.anchor, output.SerializeToString()
+
+
+def _extension(number: int) -> dict:
+    impl = {"args": [{"name": "a", "value": "i8"}], "return": "i8"}
+    return {
+        "urn": f"extension:test:concurrent{number}",
+        "scalar_functions": [
+            {"name": "subtract", "impls": [impl]},
+            {"name": f"only_{number}", "impls": [impl]},
+        ],
+    }
+
+
+@pytest.fixture(scope="module")
+def expected():
+    registry = ExtensionRegistry(lazy=True)
+    return [_key(_lookup(registry, *call)) for call in CALLS]
+
+
+@pytest.fixture
+def frequent_thread_switches():
+    # Switch threads far more often than the default 5 ms to shake out races.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_lookups_while_registering(expected, frequent_thread_switches):
+    # Lazy, so the readers also race to load the default extensions.
+    registry = ExtensionRegistry(lazy=True)
+    errors = []
+    start = threading.Barrier(THREADS + 1)
+
+    def read(offset):
+        start.wait()
+        try:
+            for i in range(LOOKUPS_PER_THREAD):
+                index = (i + offset) % len(CALLS)
+                result = _lookup(registry, *CALLS[index])
+                assert _key(result) == expected[index]
+        except BaseException as e:  # reported by the main thread
+            errors.append(e)
+
+    def write():
+        start.wait()
+        try:
+            for number in range(EXTENSIONS_REGISTERED):
+                registry.register_extension_dict(_extension(number))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read, args=(n,)) for n in range(THREADS)]
+    threads.append(threading.Thread(target=write))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors[0]
+    anchors = [
+        entry.anchor
+        for names in registry._tables.functions.values()
+        for entries in names.values()
+        for entry in entries
+    ]
+    assert len(anchors) == len(set(anchors))
+    for number in range(EXTENSIONS_REGISTERED):
+        assert registry.find_function(f"only_{number}", [i8(nullable=False)])
+
+
+def test_concurrent_registrations_are_serialized(frequent_thread_switches):
+    registry = ExtensionRegistry(load_default_extensions=False)
+    threads = [
+        threading.Thread(
+            target=lambda n=n: registry.register_extension_dict(_extension(n))
+        )
+        for n in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(registry.function_urns("subtract")) == 16
+    urn_anchors = list(registry._tables.urn_anchors.values())
+    assert sorted(urn_anchors) == list(range(1, 17))
+
+
+def test_lookups_do_not_modify_tables():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(_extension(0))
+    tables = registry._tables
+    functions = {urn: dict(names) for urn, names in tables.functions.items()}
+
+    assert registry.lookup_function("extension:test:unknown", "x", []) is None
+    assert registry.lookup_function("extension:test:concurrent0", "x", []) is None
+    assert registry.find_function("missing", [i8(nullable=False)]) is None
+    assert registry._tables is tables
+    assert {urn: dict(names) for urn, names in tables.functions.items()} == functions
+
+
+def test_resolution_does_not_modify_the_signature():
+    registry = ExtensionRegistry(lazy=True)
+    signature = [i8(nullable=False), i8(nullable=True)]
+    _, output = registry.find_function("coalesce", signature)
+    output.i8.type_variation_reference = 7
+
+    assert signature == [i8(nullable=False), i8(nullable=True)]
+    again = registry.find_function("coalesce", signature)[1]
+    assert again == i8(nullable=True)
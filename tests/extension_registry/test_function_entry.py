@@ -0,0 +1,204 @@
+import pickle
+
+import yaml
+from substrait.type_pb2 import Type
+from substrait_extensions.extensions import simple_extensions as se
+
+from substrait.builders.type import decimal, i8, i16, i64
+from substrait.derivation_expression import parse
+from substrait.extension_registry import (
+    ExtensionRegistry,
+    FunctionEntry,
+    ReturnKind,
+    function_entry,
+)
+from substrait.simple_extension_utils import build_simple_extensions
+from substrait.utils.lru import LRUCache
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:entry
+scalar_functions:
+  - name: "plus"
+    description: "Adds two numbers"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+      - args:
+          - name: a
+            value: i16
+          - name: b
+            value: i16
+        options:
+          overflow:
+            values: [SILENT, ERROR]
+        return: i16
+aggregate_functions:
+  - name: "total"
+    impls:
+      - args:
+          - name: a
+            value: i8
+        return: i8
+"""
+
+URN = "extension:test:entry"
+
+
+def _entries(registry, name):
+    return registry._tables.functions[URN][name]
+
+
+def _expected_impls(attribute):
+    definitions = build_simple_extensions(yaml.safe_load(CONTENT))
+    return [impl for f in getattr(definitions, attribute) for impl in f.impls]
+
+
+def test_entries_are_compact():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+    entry = _entries(registry, "plus")[0]
+
+    assert not hasattr(entry, "__dict__")
+    assert entry._impl is None
+    assert entry.arguments[0] is parse("i8")
+    assert entry._return_program is _entries(registry, "total")[0]._return_program
+
+
+def test_impl_is_rebuilt_from_a_registered_dict():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+
+    assert [e.impl for e in _entries(registry, "plus")] == _expected_impls(
+        "scalar_functions"
+    )
+    assert [e.impl for e in _entries(registry, "total")] == _expected_impls(
+        "aggregate_functions"
+    )
+
+
+def test_impl_is_rebuilt_from_a_yaml_file(tmp_path):
+    path = tmp_path / "entry.yaml"
+    path.write_text(CONTENT)
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_yaml(path)
+
+    entry = _entries(registry, "plus")[1]
+    assert entry.impl == _expected_impls("scalar_functions")[1]
+    assert entry.impl.options["overflow"].values == ["SILENT", "ERROR"]
+
+
+def test_impl_does_not_read_the_file_again(tmp_path):
+    path = tmp_path / "entry.yaml"
+    path.write_text(CONTENT)
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_yaml(path)
+    path.write_text(CONTENT.replace("return: i8", "return: i16"))
+
+    entry = _entries(registry, "plus")[0]
+    assert entry.impl.return_ == "i8"
+    assert entry.satisfies_signature([i8(nullable=False)] * 2) == i8(nullable=False)
+    path.unlink()
+    assert entry.impl == _expected_impls("scalar_functions")[0]
+
+
+def test_impl_survives_pickling():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+    entry = pickle.loads(pickle.dumps(_entries(registry, "plus")[0]))
+
+    assert entry.impl == _expected_impls("scalar_functions")[0]
+    assert str(entry) == "plus:i8_i8"
+    assert entry.satisfies_signature([i8(nullable=False)] * 2) == i8(nullable=False)
+
+
+def test_entries_built_directly_keep_their_impl():
+    impl = _expected_impls("scalar_functions")[0]
+    entry = FunctionEntry(URN, "plus", impl, anchor=1)
+    assert entry.impl is impl
+    assert entry.nullability == se.NullabilityHandling.MIRROR
+
+
+def test_default_extension_impls_are_available():
+    registry = ExtensionRegistry(lazy=True)
+    entry, _ = registry.lookup_function(
+        "extension:io.substrait:functions_arithmetic", "add", [i8(nullable=False)] * 2
+    )
+    assert entry.impl.return_ == "i8"
+    assert [arg.name for arg in entry.impl.args] == ["x", "y"]
+
+
+def test_overloads_are_classified_by_return_type():
+    registry = ExtensionRegistry(lazy=True)
+    arithmetic = "extension:io.substrait:functions_arithmetic"
+    entry, _ = registry.lookup_function(arithmetic, "add", [i8(nullable=False)] * 2)
+    assert entry.return_kind is ReturnKind.MIRRORED
+    entry, _ = registry.lookup_function(
+        arithmetic + "_decimal", "add", [decimal(2, 10, nullable=False)] * 2
+    )
+    assert entry.return_kind is ReturnKind.DERIVED
+    entry, output = registry.lookup_function(
+        "extension:io.substrait:functions_aggregate_approx",
+        "approx_count_distinct",
+        [i8(nullable=True)],
+    )
+    assert entry.return_kind is ReturnKind.CONSTANT
+    assert output == i64(nullable=False)
+
+
+def test_precomputed_outputs_match_derived_ones():
+    registry = ExtensionRegistry()
+    for entries in registry._tables.functions.values():
+        for entry in (e for overloads in entries.values() for e in overloads):
+            if entry.return_kind is ReturnKind.DERIVED:
+                continue
+            for nullability in (Type.NULLABILITY_REQUIRED, Type.NULLABILITY_NULLABLE):
+                derived = entry._return_program({})
+                if entry.return_kind is ReturnKind.MIRRORED:
+                    kind = derived.WhichOneof("kind")
+                    getattr(derived, kind).nullability = nullability
+                    precomputed = entry._return_templates[
+                        nullability == Type.NULLABILITY_NULLABLE
+                    ]
+                else:
+                    precomputed = entry._return_templates[0]
+                assert precomputed == derived, entry
+
+
+def test_precomputed_outputs_are_copies():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+    entry = _entries(registry, "plus")[0]
+    signature = [i8(nullable=False)] * 2
+
+    output = entry.satisfies_signature(signature)
+    output.i8.nullability = i8(nullable=True).i8.nullability
+    assert entry.satisfies_signature(signature) == i8(nullable=False)
+    assert entry.satisfies_signature([i8(nullable=True)] * 2) == i8(nullable=True)
+    restored = pickle.loads(pickle.dumps(entry))
+    assert restored.return_kind is ReturnKind.MIRRORED
+    assert restored._return_templates is entry._return_templates
+
+
+def test_shared_return_caches_are_bounded(monkeypatch):
+    for name in ("_return_programs", "_templates"):
+        monkeypatch.setattr(function_entry, name, LRUCache(4))
+    registry = ExtensionRegistry(load_default_extensions=False)
+    for precision in range(1, 20):
+        registry.register_extension_dict(
+            yaml.safe_load(
+                CONTENT.replace("entry", f"entry{precision}").replace(
+                    "return: i16", f"return: decimal<{precision}, 0>"
+                )
+            )
+        )
+    assert len(function_entry._return_programs) <= 4
+    assert len(function_entry._templates) <= 4
+    entry = registry._tables.functions["extension:test:entry1"]["plus"][1]
+    assert entry.satisfies_signature([i16(nullable=False)] * 2) == decimal(
+        scale=0, precision=1, nullable=False
+    )
@@ -0,0 +1,111 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i16, string
+from substrait.extension_registry import ExtensionRegistry, FunctionStats
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:instrumented
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+      - args:
+          - name: a
+            value: i16
+          - name: b
+            value: i16
+        return: i16
+      - args:
+          - name: a
+            value: any1
+          - name: b
+            value: any1
+        return: any1
+"""
+
+URN = "extension:test:instrumented"
+
+
+@pytest.fixture
+def registry():
+    reg = ExtensionRegistry(load_default_extensions=False)
+    reg.register_extension_dict(yaml.safe_load(CONTENT))
+    return reg
+
+
+def test_disabled_by_default(registry):
+    assert registry.instrumentation is None
+    registry.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+    assert registry.instrumentation is None
+
+
+def test_counts_lookups_candidates_covers_and_cache_hits(registry):
+    instrumentation = registry.enable_instrumentation()
+    registry.lookup_function(URN, "plus", [i16(nullable=False)] * 2)
+    registry.lookup_function(URN, "plus", [i16(nullable=False)] * 2)
+
+    stats = instrumentation.snapshot()[URN, "plus"]
+    # i16 matches the i16 and any1 overloads (i8 is skipped by the index);
+    # each fully checks both arguments, once: the second lookup is cached.
+    assert stats._replace(seconds=0) == FunctionStats(
+        lookups=2, candidates=2, covers_calls=4, cache_hits=1, seconds=0
+    )
+    assert stats.seconds > 0
+
+
+def test_lookups_across_urns_are_keyed_without_a_urn(registry):
+    instrumentation = registry.enable_instrumentation()
+    registry.find_function("plus", [string(nullable=False)] * 2)
+    registry.find_function("plus", [i8(nullable=False)] * 2, urns=[URN])
+
+    snapshot = instrumentation.snapshot()
+    assert snapshot[None, "plus"].lookups == 1
+    assert snapshot[URN, "plus"].lookups == 1
+
+
+def test_reset_and_disable(registry):
+    instrumentation = registry.enable_instrumentation()
+    registry.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
+
+    registry.disable_instrumentation()
+    registry.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+    assert instrumentation.snapshot() == {}
+    assert registry.instrumentation is None
+
+
+def test_callback_receives_each_resolution(registry):
+    events = []
+    registry.enable_instrumentation(
+        lambda urn, name, stats: events.append((urn, name, stats))
+    )
+    registry.resolve_many(
+        [
+            (URN, "plus", [i8(nullable=False)] * 2),
+            (URN, "plus", [i16(nullable=False)] * 2),
+            (URN, "minus", [i8(nullable=False)] * 2),
+        ]
+    )
+    assert [(urn, name, stats.lookups) for urn, name, stats in events] == [
+        (URN, "plus", 2),
+        (URN, "minus", 1),
+    ]
+    total = registry.instrumentation.snapshot()[URN, "plus"]
+    assert total == events[0][2]
+
+
+def test_overlay_records_delegated_lookups(registry):
+    overlay = registry.overlay()
+    instrumentation = overlay.enable_instrumentation()
+    overlay.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+
+    assert instrumentation.snapshot()[URN, "plus"].candidates == 2
+    assert registry.instrumentation is None
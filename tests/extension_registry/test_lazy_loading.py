@@ -0,0 +1,115 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i32
+from substrait.extension_registry import ExtensionRegistry
+from substrait.extension_registry.registry import LAZY_ANCHOR_BLOCK_SIZE
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+COMPARISON = "extension:io.substrait:functions_comparison"
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:lazy
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+"""
+
+
+def _anchors(registry):
+    return {
+        (urn, name): [entry.anchor for entry in entries]
+        for urn, names in registry._tables.functions.items()
+        for name, entries in names.items()
+    }
+
+
+def test_construction_only_indexes_urns():
+    registry = ExtensionRegistry(lazy=True)
+
+    assert registry.lookup_urn(ARITHMETIC) is not None
+    assert ARITHMETIC in registry._tables.pending
+    assert not any(registry._tables.functions.values())
+
+
+def test_lookup_loads_only_the_needed_extension():
+    registry = ExtensionRegistry(lazy=True)
+    entry, output = registry.lookup_function(
+        ARITHMETIC, "add", [i8(nullable=False), i8(nullable=False)]
+    )
+
+    assert entry.urn == ARITHMETIC
+    assert output == i8(nullable=False)
+    assert ARITHMETIC not in registry._tables.pending
+    assert COMPARISON in registry._tables.pending
+
+
+def test_urn_anchors_match_eager_registry():
+    lazy, eager = ExtensionRegistry(lazy=True), ExtensionRegistry()
+
+    for urn in eager._tables.urn_anchors:
+        assert lazy.lookup_urn(urn) == eager.lookup_urn(urn)
+
+
+def test_anchors_do_not_depend_on_load_order():
+    signature = [i32(nullable=False), i32(nullable=False)]
+    first = ExtensionRegistry(lazy=True)
+    first.lookup_function(ARITHMETIC, "add", signature)
+    first.lookup_function(COMPARISON, "equal", signature)
+    second = ExtensionRegistry(lazy=True)
+    second.lookup_function(COMPARISON, "equal", signature)
+    second.lookup_function(ARITHMETIC, "add", signature)
+
+    assert _anchors(first) == _anchors(second)
+    assert list(first.iter_functions()) == list(second.iter_functions())
+
+
+def test_function_anchors_are_allocated_per_urn_block():
+    registry = ExtensionRegistry(lazy=True)
+    entry, _ = registry.lookup_function(
+        COMPARISON, "equal", [i32(nullable=False), i32(nullable=False)]
+    )
+    block = registry.lookup_urn(COMPARISON)
+
+    assert block * LAZY_ANCHOR_BLOCK_SIZE < entry.anchor
+    assert entry.anchor < (block + 1) * LAZY_ANCHOR_BLOCK_SIZE
+
+
+def test_lazy_registry_matches_eager_registry():
+    lazy, eager = ExtensionRegistry(lazy=True), ExtensionRegistry()
+
+    assert list(lazy.iter_functions()) == list(eager.iter_functions())
+    assert not lazy._tables.pending
+    signature = [i8(nullable=False), i8(nullable=False)]
+    assert (
+        lazy.find_function("add", signature)[0].urn
+        == eager.find_function("add", signature)[0].urn
+    )
+
+
+def test_custom_extensions_register_eagerly():
+    registry = ExtensionRegistry(lazy=True)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+
+    entry, _ = registry.lookup_function(
+        "extension:test:lazy", "plus", [i8(nullable=False), i8(nullable=False)]
+    )
+    assert entry.anchor == (
+        registry.lookup_urn("extension:test:lazy") * LAZY_ANCHOR_BLOCK_SIZE + 1
+    )
+
+
+def test_invalid_indexed_urn_is_rejected(tmp_path):
+    path = tmp_path / "functions_mismatch.yaml"
+    path.write_text(CONTENT.replace("urn: extension:test:lazy", "urn: 'bogus'"))
+    registry = ExtensionRegistry(load_default_extensions=False, lazy=True)
+
+    with pytest.raises(ValueError, match="Invalid URN format"):
+        registry._index_extension_yaml(path)
@@ -0,0 +1,77 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i32
+from substrait.extension_registry import ExtensionRegistry
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+DATETIME = "extension:io.substrait:functions_datetime"
+
+
+def _extension(urn: str, name: str) -> dict:
+    return yaml.safe_load(
+        f"""%YAML 1.2
+---
+urn: {urn}
+scalar_functions:
+  - name: "{name}"
+    impls:
+      - args:
+          - name: a
+            value: i8
+        return: i8
+"""
+    )
+
+
+@pytest.fixture(scope="module")
+def default_registry():
+    return ExtensionRegistry()
+
+
+def _grouped(registry) -> dict:
+    grouped: dict = {}
+    for urn, name, function_type in registry.iter_functions():
+        grouped.setdefault(name, ([], []))
+        grouped[name][0].append(urn)
+        grouped[name][1].append(function_type)
+    return {name: (urns, types[-1]) for name, (urns, types) in grouped.items()}
+
+
+def test_name_index_agrees_with_full_scan(default_registry):
+    indexed = {
+        name: (urns, function_type)
+        for name, urns, function_type in default_registry.iter_function_names()
+    }
+
+    assert indexed == _grouped(default_registry)
+    assert default_registry.function_urns("add")[0] == ARITHMETIC
+    assert default_registry.function_urns("no_such_function") == []
+
+
+def test_lazy_registry_keeps_search_order():
+    lazy = ExtensionRegistry(lazy=True)
+    lazy.lookup_function(DATETIME, "add", [i32(nullable=False)])
+
+    assert lazy.function_urns("add") == ExtensionRegistry().function_urns("add")
+
+
+def test_search_visits_defining_urns_in_registration_order():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    for number in range(20):
+        registry.register_extension_dict(
+            _extension(f"extension:test:pack{number}", "g")
+        )
+    registry.register_extension_dict(_extension("extension:test:second", "f"))
+    registry.register_extension_dict(_extension("extension:test:first", "f"))
+
+    assert registry.function_urns("f") == [
+        "extension:test:second",
+        "extension:test:first",
+    ]
+    entry, _ = registry.find_function("f", [i8(nullable=False)])
+    assert entry.urn == "extension:test:second"
+    assert [
+        entry.urn
+        for entry, _ in registry.list_functions_across_urns("f", [i8(nullable=False)])
+    ] == ["extension:test:second", "extension:test:first"]
@@ -0,0 +1,134 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i32
+from substrait.extension_registry import ExtensionRegistry, FrozenRegistryError
+
+ARITHMETIC = "extension:io.substrait:functions_arithmetic"
+
+TENANT = """%YAML 1.2
+---
+urn: extension:test:tenant
+scalar_functions:
+  - name: "add"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i32
+  - name: "tenant_only"
+    impls:
+      - args:
+          - name: a
+            value: i8
+        return: i8
+"""
+
+
+class Detail:
+    type_url = "type.googleapis.com/test.Detail"
+
+
+@pytest.fixture(scope="module")
+def base():
+    registry = ExtensionRegistry()
+    registry.register_extension_relation(Detail)
+    registry.freeze()
+    return registry
+
+
+def _anchors(registry) -> set:
+    return {
+        entry.anchor
+        for names in registry._tables.functions.values()
+        for entries in names.values()
+        for entry in entries
+    }
+
+
+def test_overlay_freezes_parent():
+    parent = ExtensionRegistry(load_default_extensions=False)
+    child = ExtensionRegistry(parent=parent)
+
+    assert parent.frozen and not child.frozen
+    assert child.parent is parent
+    with pytest.raises(FrozenRegistryError):
+        parent.register_extension_dict(yaml.safe_load(TENANT))
+    with pytest.raises(FrozenRegistryError):
+        parent.register_extension_relation(Detail)
+
+
+def test_overlay_shares_parent_tables_until_it_registers(base):
+    overlay = base.overlay()
+    assert overlay._tables is base._tables
+
+    overlay.register_extension_dict(yaml.safe_load(TENANT))
+    assert overlay._tables is not base._tables
+    assert base.lookup_urn("extension:test:tenant") is None
+    assert base.find_function("tenant_only", [i8(nullable=False)]) is None
+
+
+def test_overlay_sees_parent_and_own_functions(base):
+    overlay = base.overlay()
+    overlay.register_extension_dict(yaml.safe_load(TENANT))
+    signature = [i8(nullable=False), i8(nullable=False)]
+
+    assert overlay.lookup_function(ARITHMETIC, "add", signature)[0].urn == ARITHMETIC
+    assert overlay.function_urns("add")[-1] == "extension:test:tenant"
+    entry, output = overlay.lookup_function("extension:test:tenant", "add", signature)
+    assert output == i32(nullable=False)
+    assert overlay.lookup_extension_relation(Detail.type_url) is Detail
+
+
+def test_overlay_anchors_do_not_collide(base):
+    overlay = base.overlay()
+    overlay.register_extension_dict(yaml.safe_load(TENANT))
+    own = _anchors(overlay) - _anchors(base)
+
+    assert own and min(own) > max(_anchors(base))
+    assert overlay.lookup_urn("extension:test:tenant") > max(
+        base._tables.urn_anchors.values()
+    )
+
+
+def test_overlay_of_lazy_registry_uses_anchor_blocks():
+    base = ExtensionRegistry(lazy=True)
+    overlay = base.overlay()
+    overlay.register_extension_dict(yaml.safe_load(TENANT))
+
+    assert not base._tables.pending
+    assert not _anchors(base) & (_anchors(overlay) - _anchors(base))
+
+
+def test_overlay_delegates_unregistered_names_to_parent_cache(base):
+    base.clear_resolution_cache()
+    signature = [i32(nullable=False), i32(nullable=False)]
+    for _ in range(3):
+        base.overlay().find_function("subtract", signature)
+
+    info = base.resolution_cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_reregistering_a_parent_urn_extends_it_in_the_overlay(base):
+    overlay = base.overlay()
+    definitions = yaml.safe_load(TENANT)
+    definitions["urn"] = ARITHMETIC
+    overlay.register_extension_dict(definitions)
+
+    assert overlay.find_function("tenant_only", [i8(nullable=False)])[0].urn == (
+        ARITHMETIC
+    )
+    assert "tenant_only" not in base._tables.functions[ARITHMETIC]
+    assert overlay.lookup_urn(ARITHMETIC) != base.lookup_urn(ARITHMETIC)
+
+
+def test_overlays_can_be_nested(base):
+    child = base.overlay()
+    child.register_extension_dict(yaml.safe_load(TENANT))
+    grandchild = ExtensionRegistry(parent=child)
+
+    assert child.frozen
+    assert grandchild.find_function("tenant_only", [i8(nullable=False)]) is not None
@@ -0,0 +1,112 @@
+import pytest
+import yaml
+
+from substrait.builders.type import (
+    boolean,
+    decimal,
+    fp64,
+    i8,
+    i32,
+    precision_timestamp,
+    string,
+)
+from substrait.builders.type import (
+    list as list_,
+)
+from substrait.extension_registry import ExtensionRegistry
+from substrait.extension_registry.overload_index import OverloadIndex
+
+VARIADIC = """%YAML 1.2
+---
+urn: extension:test:overloads
+scalar_functions:
+  - name: "f"
+    impls:
+      - args:
+          - name: a
+            value: i8
+        return: i8
+      - args:
+          - name: a
+            value: any1
+        variadic:
+          min: 2
+        return: any1
+      - args:
+          - name: a
+            value: string
+          - name: b
+            value: i8
+        return: string
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+"""
+
+KINDS = [
+    i8(nullable=False),
+    i32(nullable=True),
+    fp64(nullable=False),
+    string(nullable=False),
+    boolean(nullable=False),
+    decimal(2, 10, nullable=False),
+    precision_timestamp(6, nullable=False),
+    list_(i32(nullable=False), nullable=False),
+]
+
+SIGNATURES = (
+    [[t] for t in KINDS]
+    + [[t, t] for t in KINDS]
+    + [[t, i32(nullable=False)] for t in KINDS]
+)
+
+
+def _matches(entries, signature):
+    return [e for e in entries if e.satisfies_signature(signature) is not None]
+
+
+@pytest.fixture(scope="module")
+def default_registry():
+    return ExtensionRegistry()
+
+
+def test_candidates_preserve_matches_and_order(default_registry):
+    for names in default_registry._tables.functions.values():
+        for entries in names.values():
+            index = OverloadIndex(entries)
+            for signature in SIGNATURES:
+                try:
+                    expected = _matches(entries, signature)
+                except Exception:
+                    continue
+                assert _matches(index.candidates(signature), signature) == expected
+
+
+@pytest.fixture
+def overloads():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_dict(yaml.safe_load(VARIADIC))
+    return registry._tables.functions["extension:test:overloads"]["f"]
+
+
+def test_candidates_filter_on_arity_and_leading_kind(overloads):
+    index = OverloadIndex(overloads)
+    one, variadic, string_i8, i8_i8 = overloads
+
+    assert index.candidates([i8(nullable=False)]) == [one]
+    assert index.candidates([i8(nullable=False)] * 2) == [variadic, i8_i8]
+    assert index.candidates([string(nullable=False), i8(nullable=False)]) == [
+        variadic,
+        string_i8,
+    ]
+    assert index.candidates([i8(nullable=False)] * 5) == [variadic]
+    assert index.candidates([]) == []
+
+
+def test_non_type_arguments_are_not_filtered_on_kind(overloads):
+    index = OverloadIndex(overloads)
+
+    assert index.candidates(["option", i8(nullable=False)]) == overloads[1:]
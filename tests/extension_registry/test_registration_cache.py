@@ -0,0 +1,151 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8
+from substrait.extension_registry import (
+    ExtensionRegistry,
+    clear_registration_cache,
+    registration_cache_info,
+    set_registration_cache_size,
+)
+from substrait.extension_registry.registry import DEFAULT_REGISTRATION_CACHE_SIZE
+
+URN = "extension:test:registration_cache"
+
+CONTENT = f"""%YAML 1.2
+---
+urn: {URN}
+scalar_functions:
+  - name: "plus"
+    description: "Add two values"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+  - name: "minus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_registration_cache()
+    yield
+    set_registration_cache_size(DEFAULT_REGISTRATION_CACHE_SIZE)
+    clear_registration_cache()
+
+
+def _plus(registry):
+    entry, output = registry.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+    return entry, output
+
+
+def test_repeated_content_reuses_entries_with_fresh_anchors():
+    first = ExtensionRegistry()
+    second = ExtensionRegistry(load_default_extensions=False)
+    first.register_extension_bytes(CONTENT.encode())
+    second.register_extension_bytes(CONTENT)
+
+    assert registration_cache_info().hits == 1
+    entry, output = _plus(first)
+    other, other_output = _plus(second)
+    assert other.arguments is entry.arguments
+    assert other._return_program is entry._return_program
+    assert other.anchor != entry.anchor
+    assert other_output == output
+
+
+def test_registering_twice_in_one_registry_adds_new_overloads():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_bytes(CONTENT.encode())
+    registry.register_extension_bytes(CONTENT.encode())
+
+    entries = registry._tables.functions[URN]["plus"]
+    assert len(entries) == 2
+    assert entries[0].anchor != entries[1].anchor
+
+
+def test_files_bytes_and_dicts_share_entries_by_content(tmp_path):
+    path = tmp_path / "functions.yaml"
+    path.write_text(CONTENT)
+    from_file = ExtensionRegistry(load_default_extensions=False)
+    from_file.register_extension_yaml(path)
+    from_file.register_extension_yaml(path)
+    from_bytes = ExtensionRegistry(load_default_extensions=False)
+    from_bytes.register_extension_bytes(path.read_bytes())
+    from_dict = ExtensionRegistry(load_default_extensions=False)
+    from_dict.register_extension_dict(yaml.safe_load(CONTENT))
+    from_dict.register_extension_dict(yaml.safe_load(CONTENT))
+
+    info = registration_cache_info()
+    assert (info.hits, info.misses) == (3, 2)
+    assert _plus(from_file)[0].arguments is _plus(from_bytes)[0].arguments
+
+
+def test_shared_entries_do_not_depend_on_the_first_registrant(tmp_path):
+    first_path, second_path = tmp_path / "first.yaml", tmp_path / "second.yaml"
+    first_path.write_text(CONTENT)
+    second_path.write_text(CONTENT)
+    ExtensionRegistry(load_default_extensions=False).register_extension_yaml(first_path)
+    from_file = ExtensionRegistry(load_default_extensions=False)
+    from_file.register_extension_yaml(second_path)
+    first_path.unlink()
+
+    definitions = yaml.safe_load(CONTENT)
+    ExtensionRegistry(load_default_extensions=False).register_extension_dict(
+        definitions
+    )
+    from_dict = ExtensionRegistry(load_default_extensions=False)
+    from_dict.register_extension_dict(yaml.safe_load(CONTENT))
+    definitions["scalar_functions"][0]["impls"][0]["return"] = "i16"
+
+    assert registration_cache_info().hits == 2
+    assert _plus(from_file)[0].impl.return_ == "i8"
+    assert _plus(from_dict)[0].impl.return_ == "i8"
+
+
+def test_trusted_and_validated_registrations_are_cached_apart():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_bytes(CONTENT.encode(), trusted=True)
+    registry.register_extension_bytes(CONTENT.encode())
+
+    assert registration_cache_info().hits == 0
+    assert registration_cache_info().currsize == 2
+
+
+def test_bytes_registrations_rebuild_their_impl():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_bytes(CONTENT.encode(), trusted=True)
+
+    entry, _ = _plus(registry)
+    assert entry._impl is None
+    assert entry.impl.return_ == "i8"
+
+
+def test_invalid_content_is_not_cached():
+    content = CONTENT.replace(URN, "not-a-urn")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            ExtensionRegistry(load_default_extensions=False).register_extension_bytes(
+                content.encode()
+            )
+    assert registration_cache_info().currsize == 0
+
+
+def test_disabled_cache_still_registers():
+    set_registration_cache_size(0)
+    registry = ExtensionRegistry(load_default_extensions=False)
+    registry.register_extension_bytes(CONTENT.encode())
+    registry.register_extension_bytes(CONTENT.encode())
+
+    assert registration_cache_info().hits == 0
+    assert len(registry._tables.functions[URN]["plus"]) == 2
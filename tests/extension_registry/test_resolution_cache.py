@@ -0,0 +1,143 @@
+import pytest
+import yaml
+from substrait.type_pb2 import Type
+
+from substrait.builders.type import i8, i16
+from substrait.extension_registry import ExtensionRegistry
+from substrait.utils.lru import LRUCache
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:cache
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+"""
+
+EXTRA = """%YAML 1.2
+---
+urn: extension:test:cache_extra
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i16
+          - name: b
+            value: i16
+        return: i16
+"""
+
+
+@pytest.fixture
+def registry():
+    reg = ExtensionRegistry(load_default_extensions=False)
+    reg.register_extension_dict(yaml.safe_load(CONTENT))
+    return reg
+
+
+def test_repeated_lookup_hits_cache(registry):
+    signature = [i8(nullable=False), i8(nullable=False)]
+    first = registry.lookup_function("extension:test:cache", "plus", signature)
+    second = registry.lookup_function("extension:test:cache", "plus", signature)
+
+    assert first == second
+    info = registry.resolution_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_nullability_is_part_of_the_key(registry):
+    registry.lookup_function(
+        "extension:test:cache", "plus", [i8(nullable=False), i8(nullable=False)]
+    )
+    output = registry.lookup_function(
+        "extension:test:cache", "plus", [i8(nullable=True), i8(nullable=False)]
+    )[1]
+
+    assert output == i8(nullable=True)
+    assert registry.resolution_cache_info().misses == 2
+
+
+def test_failed_resolution_is_cached(registry):
+    signature = [i16(nullable=False), i16(nullable=False)]
+    assert registry.lookup_function("extension:test:cache", "plus", signature) is None
+    assert registry.lookup_function("extension:test:cache", "plus", signature) is None
+    assert registry.resolution_cache_info().hits == 1
+
+
+def test_returns_defensive_copies(registry):
+    signature = [i8(nullable=False), i8(nullable=False)]
+    output = registry.lookup_function("extension:test:cache", "plus", signature)[1]
+    output.i8.nullability = Type.NULLABILITY_NULLABLE
+
+    again = registry.lookup_function("extension:test:cache", "plus", signature)[1]
+    assert again == i8(nullable=False)
+    assert again is not output
+
+
+def test_registration_invalidates_cache(registry):
+    signature = [i16(nullable=False), i16(nullable=False)]
+    assert registry.find_function("plus", signature) is None
+
+    registry.register_extension_dict(yaml.safe_load(EXTRA))
+
+    entry, output = registry.find_function("plus", signature)
+    assert entry.urn == "extension:test:cache_extra"
+    assert output == i16(nullable=False)
+
+
+def test_cache_is_bounded():
+    reg = ExtensionRegistry(load_default_extensions=False, resolution_cache_size=2)
+    reg.register_extension_dict(yaml.safe_load(CONTENT))
+    for nullable_a in (False, True):
+        for nullable_b in (False, True):
+            reg.lookup_function(
+                "extension:test:cache",
+                "plus",
+                [i8(nullable=nullable_a), i8(nullable=nullable_b)],
+            )
+
+    assert reg.resolution_cache_info().currsize == 2
+
+
+def test_cache_can_be_disabled():
+    reg = ExtensionRegistry(load_default_extensions=False, resolution_cache_size=0)
+    reg.register_extension_dict(yaml.safe_load(CONTENT))
+    signature = [i8(nullable=False), i8(nullable=False)]
+    reg.lookup_function("extension:test:cache", "plus", signature)
+    reg.lookup_function("extension:test:cache", "plus", signature)
+
+    info = reg.resolution_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (0, 2, 0)
+
+
+def test_clear_resolution_cache_resets_counters(registry):
+    signature = [i8(nullable=False), i8(nullable=False)]
+    registry.lookup_function("extension:test:cache", "plus", signature)
+    registry.lookup_function("extension:test:cache", "plus", signature)
+    registry.clear_resolution_cache()
+
+    assert tuple(registry.resolution_cache_info()) == (0, 0, 4096, 0)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+
+
+def test_lru_cache_rejects_negative_size():
+    with pytest.raises(ValueError):
+        LRUCache(-1)
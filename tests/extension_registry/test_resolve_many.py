@@ -0,0 +1,116 @@
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i16, i32, string
+from substrait.extension_registry import ExtensionRegistry
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:many
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+      - args:
+          - name: a
+            value: i16
+          - name: b
+            value: i16
+        return: i16
+  - name: "negate"
+    impls:
+      - args:
+          - name: a
+            value: i8
+        return: i8
+"""
+
+URN = "extension:test:many"
+
+
+@pytest.fixture
+def registry():
+    reg = ExtensionRegistry(load_default_extensions=False)
+    reg.register_extension_dict(yaml.safe_load(CONTENT))
+    return reg
+
+
+def _requests():
+    return [
+        (URN, "plus", [i8(nullable=False)] * 2),
+        (URN, "plus", [i16(nullable=False)] * 2),
+        ([URN], "negate", [i8(nullable=False)]),
+        (URN, "plus", [i8(nullable=False)] * 2),
+        (None, "plus", [i16(nullable=False)] * 2),
+        (URN, "plus", [string(nullable=False)] * 2),
+        (URN, "missing", [i8(nullable=False)]),
+    ]
+
+
+def _single(registry, urns, name, signature):
+    if isinstance(urns, str):
+        return registry.lookup_function(urns, name, signature)
+    return registry.find_function(name, signature, urns)
+
+
+def test_results_match_individual_lookups(registry):
+    results = registry.resolve_many(_requests())
+    expected = [_single(registry, *request) for request in _requests()]
+    assert [r and (r[0].anchor, r[1]) for r in results] == [
+        e and (e[0].anchor, e[1]) for e in expected
+    ]
+    assert results[5] is None and results[6] is None
+
+
+def test_identical_requests_are_resolved_once(registry):
+    signature = [i8(nullable=False)] * 2
+    results = registry.resolve_many([(URN, "plus", signature)] * 50)
+    assert len(results) == 50
+    info = registry.resolution_cache_info()
+    assert (info.misses, info.currsize) == (1, 1)
+
+    # Each result gets its own output type.
+    results[0][1].i8.nullability = i8(nullable=True).i8.nullability
+    assert results[1][1] == i8(nullable=False)
+
+
+def test_batch_reuses_and_fills_the_resolution_cache(registry):
+    registry.lookup_function(URN, "plus", [i8(nullable=False)] * 2)
+    registry.resolve_many(_requests())
+    hits = registry.resolution_cache_info().hits
+    assert hits == 1
+
+    registry.resolve_many(_requests())
+    assert registry.resolution_cache_info().hits == hits + 6
+
+
+def test_uncacheable_signatures_are_still_resolved(registry):
+    signature = [i8(nullable=False), i8(nullable=False), bool()]
+    results = registry.resolve_many([(URN, "plus", signature)] * 2)
+    assert results == [None, None]
+    assert registry.resolution_cache_info().currsize == 0
+
+
+def test_lazy_registry_loads_requested_urns(tmp_path):
+    registry = ExtensionRegistry(lazy=True)
+    results = registry.resolve_many(
+        [
+            ("extension:io.substrait:functions_arithmetic", "add", [i32(False)] * 2),
+            ("extension:io.substrait:functions_string", "concat", [string(False)] * 2),
+        ]
+    )
+    assert [entry.name for entry, _ in results] == ["add", "concat"]
+
+
+def test_overlay_delegates_to_its_parent(registry):
+    overlay = registry.overlay()
+    (result,) = overlay.resolve_many([(URN, "negate", [i8(nullable=False)])])
+    assert (
+        result[0].anchor
+        == registry.lookup_function(URN, "negate", [i8(nullable=False)])[0].anchor
+    )
@@ -0,0 +1,141 @@
+import os
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+from substrait.builders.type import i8, i32
+from substrait.extension_registry import ExtensionRegistry, snapshot
+
+CONTENT = """%YAML 1.2
+---
+urn: extension:test:snapshot
+scalar_functions:
+  - name: "plus"
+    impls:
+      - args:
+          - name: a
+            value: i8
+          - name: b
+            value: i8
+        return: i8
+"""
+
+
+@pytest.fixture(scope="module")
+def default_registry():
+    return ExtensionRegistry()
+
+
+@pytest.fixture(scope="module")
+def default_snapshot(default_registry, tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "registry.snapshot"
+    default_registry.save_snapshot(path)
+    return path
+
+
+def _anchors(registry):
+    return {
+        (urn, name): [entry.anchor for entry in entries]
+        for urn, names in registry._tables.functions.items()
+        for name, entries in names.items()
+    }
+
+
+def test_snapshot_round_trips(default_registry, default_snapshot):
+    restored = ExtensionRegistry.from_snapshot(default_snapshot)
+
+    assert restored._tables.urn_anchors == default_registry._tables.urn_anchors
+    assert _anchors(restored) == _anchors(default_registry)
+    assert list(restored.iter_functions()) == list(default_registry.iter_functions())
+    for signature in ([i8(nullable=False)] * 2, [i32(nullable=True)] * 2):
+        entry, output = restored.find_function("add", signature)
+        expected_entry, expected_output = default_registry.find_function(
+            "add", signature
+        )
+        assert (entry.urn, entry.anchor) == (expected_entry.urn, expected_entry.anchor)
+        assert output == expected_output
+
+
+def test_restored_registry_keeps_allocating_anchors(default_snapshot):
+    restored = ExtensionRegistry.from_snapshot(default_snapshot)
+    taken = {anchor for anchors in _anchors(restored).values() for anchor in anchors}
+    urn_anchors = set(restored._tables.urn_anchors.values())
+    restored.register_extension_dict(yaml.safe_load(CONTENT))
+
+    entry, _ = restored.lookup_function(
+        "extension:test:snapshot", "plus", [i8(nullable=False)] * 2
+    )
+    assert entry.anchor not in taken
+    assert restored.lookup_urn("extension:test:snapshot") not in urn_anchors
+
+
+def test_lazy_registry_snapshot_includes_custom_extensions(tmp_path):
+    registry = ExtensionRegistry(load_default_extensions=False, lazy=True)
+    registry.register_extension_dict(yaml.safe_load(CONTENT))
+    registry.save_snapshot(tmp_path / "custom.snapshot")
+
+    restored = ExtensionRegistry.from_snapshot(tmp_path / "custom.snapshot")
+    assert restored._lazy
+    assert _anchors(restored) == _anchors(registry)
+
+
+def test_loading_imports_neither_yaml_nor_antlr(default_snapshot):
+    code = (
+        "import sys\n"
+        "from substrait.extension_registry import ExtensionRegistry\n"
+        f"ExtensionRegistry.from_snapshot({str(default_snapshot)!r})\n"
+        "print(sorted({'yaml', 'antlr4'} & set(sys.modules)))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    assert out.strip() == "[]"
+
+
+def test_stale_snapshot_falls_back_to_yaml(default_snapshot, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOT_FORMAT", snapshot.SNAPSHOT_FORMAT + 1)
+    assert snapshot.read_snapshot(default_snapshot) is None
+
+    registry = ExtensionRegistry.from_snapshot(default_snapshot)
+    assert registry.find_function("add", [i8(nullable=False)] * 2) is not None
+
+
+def test_snapshot_of_another_package_version_is_stale(default_snapshot, monkeypatch):
+    import importlib.metadata
+
+    version = importlib.metadata.version
+    monkeypatch.setattr(
+        importlib.metadata,
+        "version",
+        lambda name: "0.0.1" if name == "substrait" else version(name),
+    )
+    assert snapshot.read_snapshot(default_snapshot) is None
+
+
+def test_snapshot_of_another_class_layout_is_stale(default_snapshot, monkeypatch):
+    from substrait import derivation_parser as dp
+
+    monkeypatch.setattr(dp.ScalarType, "__slots__", ("kind", "nullable", "extra"))
+    assert snapshot.read_snapshot(default_snapshot) is None
+
+
+@pytest.mark.parametrize("content", [None, b"", b"not a snapshot\n"])
+def test_missing_or_foreign_files_are_not_snapshots(tmp_path, content):
+    path = tmp_path / "registry.snapshot"
+    if content is not None:
+        path.write_bytes(content)
+    assert snapshot.read_snapshot(path) is None
+
+
+def test_command_line_writes_default_snapshot(tmp_path):
+    path = tmp_path / "cli.snapshot"
+    assert snapshot.main([str(path)]) == 0
+    assert snapshot.read_snapshot(path)["urns"]
+    assert snapshot.main([]) == 2
@@ -0,0 +1,101 @@
+import pytest
+import yaml
+
+from substrait.builders.type import boolean, i8, i16, string, var_char
+from substrait.extension_registry import ExtensionRegistry
+
+URN = "extension:test:variadic"
+
+CONTENT = f"""%YAML 1.2
+---
+urn: {URN}
+scalar_functions:
+  - name: "bounded"
+    impls:
+      - args:
+          - value: i8
+        variadic:
+          min: 2
+          max: 3
+        return: i8
+  - name: "same_length"
+    impls:
+      - args:
+          - value: varchar<L1>
+        variadic:
+          min: 1
+        return: varchar<L1>
+  - name: "any_length"
+    impls:
+      - args:
+          - value: varchar<L1>
+        variadic:
+          min: 1
+          parameterConsistency: INCONSISTENT
+        return: varchar<L1>
+  - name: "join"
+    impls:
+      - args:
+          - value: string
+          - value: any1
+        variadic:
+          min: 1
+        return: any1
+  - name: "all"
+    impls:
+      - args:
+          - value: boolean?
+        variadic:
+          min: 0
+        return: boolean?
+"""
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["validated", "trusted"])
+def registry(request):
+    reg = ExtensionRegistry(load_default_extensions=False)
+    reg.register_extension_dict(yaml.safe_load(CONTENT), trusted=request.param)
+    return reg
+
+
+def _output(registry, name, signature):
+    match = registry.lookup_function(URN, name, signature)
+    return None if match is None else match[1]
+
+
+def test_min_and_max_bound_the_argument_count(registry):
+    for count, accepted in [(1, False), (2, True), (3, True), (4, False)]:
+        output = _output(registry, "bounded", [i8(nullable=False)] * count)
+        assert (output is not None) == accepted, count
+
+
+def test_consistent_parameters_bind_across_arguments(registry):
+    signature = [var_char(5, nullable=False)] * 3
+    assert _output(registry, "same_length", signature) == var_char(5, nullable=False)
+    mixed = signature + [var_char(7, nullable=False)]
+    assert _output(registry, "same_length", mixed) is None
+
+
+def test_inconsistent_parameters_bind_per_argument(registry):
+    signature = [var_char(5, nullable=False), var_char(7, nullable=False)]
+    assert _output(registry, "any_length", signature) == var_char(5, nullable=False)
+    assert _output(registry, "any_length", signature + [i8(nullable=False)]) is None
+
+
+def test_only_the_last_argument_repeats(registry):
+    strings = [string(nullable=False)] * 3
+    assert _output(registry, "join", strings) == string(nullable=False)
+    assert _output(registry, "join", [string(nullable=False)]) is None
+    assert _output(registry, "join", [i16(nullable=False)] * 3) is None
+    mixed = [string(nullable=False), i16(nullable=False), i8(nullable=False)]
+    assert _output(registry, "join", mixed) is None
+
+
+def test_long_chains_check_each_distinct_type_once(registry):
+    registry.enable_instrumentation()
+    signature = [boolean(nullable=False)] * 999 + [boolean(nullable=True)]
+    assert _output(registry, "all", signature) == boolean(nullable=True)
+    assert _output(registry, "all", []) is not None
+    stats = registry.instrumentation.snapshot()[URN, "all"]
+    registry.disable_instrumentation()
+    assert stats.covers_calls == 2
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import yaml
+
+from substrait.extension_registry import ExtensionRegistry
+from substrait.extension_registry.registry import default_extension_paths
+from substrait.simple_extension_utils import load_extension_yaml
+
+
+def _entries(registry):
+    return [
+        (
+            entry.urn,
+            entry.name,
+            entry.anchor,
+            entry.function_type,
+            entry.arguments,
+            entry.normalized_inputs,
+            entry.nullability,
+            entry.variadic_min,
+            entry._return_node,
+        )
+        for names in registry._tables.functions.values()
+        for entries in names.values()
+        for entry in entries
+    ]
+
+
+def test_loader_matches_safe_load():
+    for path in default_extension_paths():
+        with open(path) as f:
+            assert load_extension_yaml(path) == yaml.safe_load(f)
+
+
+def test_trusted_entries_match_validated_entries():
+    validated = ExtensionRegistry(load_default_extensions=False)
+    trusted = ExtensionRegistry(load_default_extensions=False)
+    for path in default_extension_paths():
+        validated.register_extension_yaml(path)
+        trusted.register_extension_yaml(path, trusted=True)
+
+    assert _entries(trusted) == _entries(validated)
+    assert [e[2] for e in _entries(trusted)] == sorted(e[2] for e in _entries(trusted))
+
+
+def test_trusted_entries_rebuild_their_impl():
+    registry = ExtensionRegistry(load_default_extensions=False)
+    path = default_extension_paths()[0]
+    registry.register_extension_yaml(path, trusted=True)
+    entry = next(iter(next(iter(registry._tables.functions.values())).values()))[0]
+    assert entry.impl.return_
+
+
+def test_only_untrusted_definitions_are_validated():
+    impl = {"args": [{"value": "i8"}], "decomposable": "SOMETIMES", "return": "i8"}
+    definitions = {
+        "urn": "extension:test:invalid",
+        "aggregate_functions": [{"name": "f", "impls": [impl]}],
+    }
+    registry = ExtensionRegistry(load_default_extensions=False)
+    with pytest.raises(ValueError, match="SOMETIMES"):
+        registry.register_extension_dict(definitions)
+    registry.register_extension_dict(definitions, trusted=True)
+    assert registry.lookup_urn("extension:test:invalid") is not None
+
+
+@pytest.mark.parametrize("executor", [None, ThreadPoolExecutor(4)])
+def test_bulk_registration_is_deterministic(executor):
+    paths = list(reversed(default_extension_paths()))
+    sequential = ExtensionRegistry(load_default_extensions=False)
+    for path in paths:
+        sequential.register_extension_yaml(path)
+
+    bulk = ExtensionRegistry(load_default_extensions=False)
+    bulk.register_extension_yamls(paths, trusted=True, executor=executor)
+
+    assert bulk._tables.urn_anchors == sequential._tables.urn_anchors
+    assert _entries(bulk) == _entries(sequential)
+    assert bulk._tables.generation == 1
+
+
+def test_bulk_registration_rejects_invalid_urns(tmp_path):
+    path = tmp_path / "bad.yaml"
+    path.write_text("urn: not-a-urn\nscalar_functions: []\n")
+    registry = ExtensionRegistry(load_default_extensions=False)
+    with pytest.raises(ValueError, match="Invalid URN format"):
+        registry.register_extension_yamls([default_extension_paths()[0], path])
+    assert registry._tables.urn_anchors == {}
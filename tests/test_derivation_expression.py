@@ -3,7 +3,15 @@ import re
 import pytest
 from substrait.type_pb2 import NamedStruct, Type
 
-from substrait.derivation_expression import DerivationExpressionParseError, evaluate
+from substrait.derivation_expression import (
+    DerivationExpressionParseError,
+    _parse,
+    clear_parse_cache,
+    compile_expression,
+    evaluate,
+    parse_cache_info,
+    set_parse_cache_size,
+)
 
 
 def test_simple_arithmetic():
@@ -210,3 +218,63 @@ def test_nstruct_nested():
         ),
     )
     assert result == expected
+
+
+def test_compiled_program_is_reusable():
+    program = compile_expression(
+        """temp = min(var, 7) + max(var, 7)
+decimal<temp + 1, temp - 1>"""
+    )
+    for var in (5, 9):
+        assert program({"var": var}) == evaluate(
+            """temp = min(var, 7) + max(var, 7)
+decimal<temp + 1, temp - 1>""",
+            {"var": var},
+        )
+
+
+def test_compiled_program_returns_fresh_types():
+    program = compile_expression("i8?")
+    first = program({})
+    first.i8.nullability = Type.NULLABILITY_REQUIRED
+    assert program({}) == Type(i8=Type.I8(nullability=Type.NULLABILITY_NULLABLE))
+
+
+def test_compiled_program_defers_evaluation_errors():
+    program = compile_expression("unknown(1)")
+    with pytest.raises(Exception, match="Unknown function unknown"):
+        program({})
+
+
+@pytest.fixture
+def fresh_parse_cache():
+    clear_parse_cache()
+    yield
+    set_parse_cache_size(1024)
+    clear_parse_cache()
+
+
+def test_parse_cache_reuses_trees(fresh_parse_cache):
+    first = _parse("DECIMAL<P1,S1>")
+    assert _parse("DECIMAL<P1,S1>") is first
+    info = parse_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_parse_cache_does_not_keep_failures(fresh_parse_cache):
+    for _ in range(2):
+        with pytest.raises(DerivationExpressionParseError):
+            _parse("decimal<")
+    assert parse_cache_info().currsize == 0
+
+
+def test_parse_cache_capacity(fresh_parse_cache):
+    set_parse_cache_size(2)
+    for expression in ("i8", "i16", "i32"):
+        _parse(expression)
+    assert parse_cache_info().currsize == 2
+    assert parse_cache_info().maxsize == 2
+
+    set_parse_cache_size(0)
+    assert _parse("i64") is not _parse("i64")
+    assert parse_cache_info().currsize == 0
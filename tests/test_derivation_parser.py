@@ -0,0 +1,206 @@
+from importlib.resources import files
+
+import pytest
+import yaml
+from substrait.type_pb2 import Type
+
+from substrait import derivation_parser as dp
+from substrait.derivation_expression import (
+    DerivationExpressionParseError,
+    _parse_uncached,
+    _to_node,
+    evaluate,
+    get_parser_backend,
+    parse,
+    set_parser_backend,
+)
+
+
+def _bundled_type_strings() -> list:
+    """Every argument, return, intermediate and structure type string in the
+    YAML files shipped with substrait_extensions."""
+    strings = set()
+    for path in files("substrait_extensions.extensions").iterdir():
+        if not path.name.endswith(".yaml") or "schema" in path.name:
+            continue
+        with open(path) as f:
+            definitions = yaml.safe_load(f)
+        for key in ("scalar_functions", "aggregate_functions", "window_functions"):
+            for function in definitions.get(key) or []:
+                for impl in function.get("impls") or []:
+                    for arg in impl.get("args") or []:
+                        if "value" in arg:
+                            strings.add(arg["value"])
+                    for field in ("return", "intermediate"):
+                        if field in impl:
+                            strings.add(impl[field])
+        for extension_type in definitions.get("types") or []:
+            structure = extension_type.get("structure")
+            if isinstance(structure, dict):
+                strings.update(structure.values())
+            elif isinstance(structure, str):
+                strings.add(structure)
+    return sorted(strings)
+
+
+BUNDLED_TYPE_STRINGS = _bundled_type_strings()
+
+GRAMMAR_CASES = [
+    "i8?",
+    "BOOLEAN",
+    "Decimal?<P1, S1>",
+    "T?",
+    "any",
+    "any1?",
+    "ANY2",
+    "any12",
+    "a ? b : c",
+    "a > 3 ? 1 : 0",
+    "i8 ? 1 : 2",
+    "!a and b",
+    "a or b and c",
+    "a AND b OR c",
+    "if a then b else c",
+    "if a then b else c ? d : e",
+    "1 + 2 * 3 - 4 / 2",
+    "(1 + 2) * 3",
+    "a - 1",
+    "a - 1 + 2",
+    "x = 1",
+    "x = 1\n",
+    "a != b",
+    "a <= b = c >= d",
+    "min(a, b) + max(1, 2, 3)",
+    "f()",
+    "list<i8 > 1>",
+    "map<string, list<i8>>",
+    "struct<i8, struct<i16?, fp32>>",
+    "nstruct<a: i32, b: struct<i32, fp32>>",
+    "func<i8 -> i8>",
+    "func<(i8) -> i8>",
+    "func<(i8, any1) -> any1?>",
+    "u!geometry",
+    "U!foo?<i8, 1>",
+    "alias.u!b?<i8>",
+    "varchar<L1>",
+    "FIXEDCHAR?<38>",
+    "precision_timestamp_tz<P>",
+    "interval_compound<P>",
+    "i8 // trailing comment",
+    "i8 /*x*/",
+    "x = 1\r\ny = x + 1\r\ndecimal<x, y>",
+    "x = 1\n\ny = 2\ndecimal<x, y>\n\n",
+]
+
+INVALID_CASES = [
+    "",
+    "decimal",
+    "decimal<1>",
+    "decimal<",
+    "struct<>",
+    "nstruct<>",
+    "u!foo<>",
+    "list<i8",
+    "i8 +",
+    "-a",
+    "bool",
+    "a && b",
+    "'a'",
+    "i8 /* unterminated",
+]
+
+
+def test_bundled_type_strings_are_collected():
+    assert len(BUNDLED_TYPE_STRINGS) > 50
+    assert any("\n" in s for s in BUNDLED_TYPE_STRINGS)
+
+
+@pytest.mark.parametrize("expression", BUNDLED_TYPE_STRINGS + GRAMMAR_CASES)
+def test_native_parser_matches_antlr(expression):
+    assert dp.parse(expression) == _to_node(_parse_uncached(expression))
+
+
+@pytest.mark.parametrize("expression", INVALID_CASES)
+def test_both_parsers_reject(expression):
+    with pytest.raises(DerivationExpressionParseError):
+        dp.parse(expression)
+    with pytest.raises(DerivationExpressionParseError):
+        _to_node(_parse_uncached(expression))
+
+
+# The generated ANTLR lexer only skips block comments with a one-character
+# body, so these are compared with the same expressions without comments.
+COMMENTED_CASES = [
+    ("i8 /* a longer comment */", "i8"),
+    ("decimal</* precision */ 10, /**/ 2>", "decimal<10, 2>"),
+    ("x = 1 /* spans\nlines */\ndecimal<x, 2> /* a * b */", "x = 1\ndecimal<x, 2>"),
+]
+
+
+@pytest.mark.parametrize("expression, uncommented", COMMENTED_CASES)
+def test_native_parser_skips_block_comments(expression, uncommented):
+    assert dp.parse(expression) == _to_node(_parse_uncached(uncommented))
+
+
+def test_lines_are_counted_across_block_comments():
+    with pytest.raises(DerivationExpressionParseError, match="line 3:3"):
+        dp.parse("x = 1 /* one\ntwo */\ni8 i16")
+
+
+def test_native_parser_rejects_trailing_input():
+    with pytest.raises(DerivationExpressionParseError, match="line 1:3"):
+        dp.parse("i8 i16")
+
+
+def test_parse_error_reports_position():
+    with pytest.raises(DerivationExpressionParseError, match="at line 2:"):
+        dp.parse("x = 1\ndecimal<x,")
+
+
+def test_nodes_are_immutable_and_hashable():
+    node = dp.parse("decimal?<P1 + 1, 2>")
+    assert node == dp.ParameterizedType(
+        "decimal",
+        True,
+        (dp.BinaryOp("+", dp.ParameterName("P1", False), dp.Number(1)), dp.Number(2)),
+    )
+    assert hash(node) == hash(dp.parse("decimal?<P1 + 1, 2>"))
+    with pytest.raises(AttributeError):
+        node.nullable = False
+
+
+@pytest.fixture
+def antlr_backend():
+    previous = get_parser_backend()
+    set_parser_backend("antlr")
+    yield
+    set_parser_backend(previous)
+
+
+@pytest.mark.parametrize(
+    "expression, values",
+    [
+        ("1 + var", {"var": 2}),
+        ("var > 3 ? 1 : 0", {"var": 5}),
+        ("!(a = 1) and b", {"a": 2, "b": True}),
+        ("decimal<P1 + 1, min(S1, 3)>", {"P1": 10, "S1": 5}),
+        ("x = max(P, 2)\nvarchar?<x * 2>", {"P": 4}),
+        ("map<i8, list<string?>>", {}),
+        ("nstruct<a: i32, b: fp64?>", {}),
+    ],
+)
+def test_backends_evaluate_alike(expression, values, antlr_backend):
+    antlr_result = evaluate(expression, dict(values))
+    set_parser_backend("native")
+    assert evaluate(expression, dict(values)) == antlr_result
+
+
+def test_parse_uses_selected_backend(antlr_backend):
+    assert get_parser_backend() == "antlr"
+    assert parse("i8?") == dp.ScalarType("i8", True)
+    assert evaluate("i8?") == Type(i8=Type.I8(nullability=Type.NULLABILITY_NULLABLE))
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        set_parser_backend("yacc")
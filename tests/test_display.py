@@ -1,3 +1,5 @@
+import substrait.algebra_pb2 as stalg
+import substrait.plan_pb2 as stp
 import substrait.type_pb2 as stt
 
 from substrait.builders.extended_expression import literal
@@ -53,3 +55,42 @@ def test_stringify_fetch_unset_offset_and_count():
     out = _printer().stringify_plan(plan)
 
     assert "fetch: offset=0, count=all" in out
+
+
+# Deeper than any recursion limit: built in place, as protobuf cannot copy it.
+DEEP = 100_000
+
+
+def test_stringify_very_deep_plan(deep_call):
+    plan = stp.Plan()
+    rel = plan.relations.add().root.input
+    for _ in range(DEEP):
+        rel.filter.condition.literal.boolean = True
+        rel = rel.filter.input
+    rel.read.named_table.names.append("t")
+
+    # Without indentation the output stays linear in the depth.
+    out = deep_call(PlanPrinter(indent_size=0, use_colors=False).stringify_plan, plan)
+
+    lines = out.splitlines()
+    assert lines[: 2 * DEEP] == ["filter", "-> input:"] * DEEP
+    assert lines[2 * DEEP] == "read: t"
+    assert lines[2 * DEEP + 1 :] == ["-> condition:", "literal: True"] * DEEP
+
+
+def test_stringify_very_deep_expression(deep_call):
+    expression = stalg.Expression()
+    current = expression
+    for _ in range(DEEP):
+        function = current.scalar_function
+        function.function_reference = 1
+        current = function.arguments.add().value
+    current.literal.i64 = 7
+
+    out = deep_call(
+        PlanPrinter(indent_size=0, use_colors=False).stringify_expression, expression
+    )
+
+    lines = out.splitlines()
+    assert lines.count("function: 1") == DEEP
+    assert lines[-1] == "literal: 7"
@@ -0,0 +1,56 @@
+"""Dependencies the package's entry points must not import eagerly.
+
+Each module is imported in a fresh interpreter, which then reports which of the
+deferred modules ended up in ``sys.modules``. Import times are measured by
+``benchmarks/bench_import_time.py``.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+MODULES = [
+    "substrait.dataframe",
+    "substrait.extension_registry",
+    "substrait.type_inference",
+    "substrait.builders.extended_expression",
+    "substrait.builders.plan",
+    "substrait.narwhals",
+    "substrait.sql.sql_to_substrait",
+    "substrait.extension_registry.registry",
+]
+
+# Imported only once they are needed: parsing extension YAML, parsing
+# derivations with ANTLR, translating SQL, reading package metadata.
+DEFERRED = {"yaml", "antlr4", "sqloxide", "deepdiff", "importlib.metadata"}
+
+REGISTRY = "substrait.extension_registry.registry"
+
+
+def _loaded(module: str) -> set:
+    """The modules among ``DEFERRED`` and the registry that importing ``module``
+    loads."""
+    watched = sorted(DEFERRED | {REGISTRY})
+    statement = (
+        f"import sys, {module}\n"
+        f"print('\\n'.join(m for m in {watched!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    stdout = subprocess.run(
+        [sys.executable, "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=env,
+    ).stdout
+    return set(stdout.split())
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_heavy_dependencies_are_deferred(module):
+    loaded = _loaded(module)
+    assert not DEFERRED & loaded
+    if not module.startswith("substrait.extension_registry"):
+        assert REGISTRY not in loaded
@@ -3,11 +3,13 @@ import substrait.algebra_pb2 as stalg
 import substrait.plan_pb2 as stp
 import substrait.type_pb2 as stt
 
+import substrait.type_inference as type_inference
 from substrait.type_inference import (
     infer_expression_type,
     infer_nested_type,
     infer_plan_schema,
     infer_rel_schema,
+    inference_session,
 )
 
 _REQ = stt.Type.NULLABILITY_REQUIRED
@@ -903,3 +905,182 @@ def test_infer_rel_reference_anchor_zero_is_a_distinct_anchor():
         + [stt.Type(fp32=stt.Type.FP32(nullability=stt.Type.NULLABILITY_NULLABLE))]
     )
     assert infer_plan_schema(plan).struct == expected
+
+
+@pytest.fixture
+def inferred(monkeypatch):
+    """The relation types ``infer_rel_schema`` actually inferred."""
+    rel_types = []
+    infer = type_inference._infer_rel_schema
+
+    def counting(rel, registry, subtrees):
+        rel_types.append(rel.WhichOneof("rel_type"))
+        return infer(rel, registry, subtrees)
+
+    monkeypatch.setattr(type_inference, "_infer_rel_schema", counting)
+    return rel_types
+
+
+def _filtered_plan():
+    filtered = stalg.Rel(
+        filter=stalg.FilterRel(
+            input=read_rel,
+            condition=stalg.Expression(literal=stalg.Expression.Literal(boolean=True)),
+        )
+    )
+    return stp.Plan(
+        relations=[
+            stp.PlanRel(
+                root=stalg.RelRoot(input=filtered, names=list(named_struct.names))
+            )
+        ]
+    )
+
+
+def test_inference_session_infers_each_relation_once(inferred):
+    plan = _filtered_plan()
+    with inference_session():
+        first = infer_plan_schema(plan)
+        assert infer_plan_schema(plan) == first
+        assert infer_rel_schema(plan.relations[-1].root.input) == first.struct
+        assert infer_rel_schema(plan.relations[-1].root.input.filter.input) == struct
+    assert inferred == ["read", "filter"]
+
+
+def test_join_inputs_inferred_once_per_plan(inferred):
+    join = stalg.Rel(
+        join=stalg.JoinRel(
+            left=read_rel,
+            right=right_read_rel,
+            type=stalg.JoinRel.JOIN_TYPE_INNER,
+            common=stalg.RelCommon(rel_anchor=1),
+        )
+    )
+    plan = stp.Plan(
+        relations=[
+            stp.PlanRel(
+                root=stalg.RelRoot(
+                    input=stalg.Rel(
+                        project=stalg.ProjectRel(
+                            input=join, expressions=[_outer_ref(0, rel_reference=1)]
+                        )
+                    )
+                )
+            )
+        ]
+    )
+    infer_plan_schema(plan)
+    assert sorted(inferred) == ["join", "project", "read", "read"]
+
+
+def test_no_memoization_outside_a_session(inferred):
+    plan = _filtered_plan()
+    infer_plan_schema(plan)
+    plan.relations[-1].root.input.filter.input.read.base_schema.struct.types.pop()
+    assert len(infer_plan_schema(plan).struct.types) == len(struct.types) - 1
+    assert inferred == ["read", "filter"] * 2
+
+
+@pytest.fixture
+def anchor_walks(monkeypatch):
+    """The plans whose relations were walked to index their rel_anchors."""
+    walked = []
+    iter_plan_rels = type_inference.iter_plan_rels
+
+    def counting(plan):
+        walked.append(plan)
+        return iter_plan_rels(plan)
+
+    monkeypatch.setattr(type_inference, "iter_plan_rels", counting)
+    return walked
+
+
+def test_plans_without_rel_references_are_not_indexed(anchor_walks):
+    assert infer_plan_schema(_filtered_plan()).struct == struct
+    assert anchor_walks == []
+
+
+def test_anchors_are_indexed_once_on_the_first_rel_reference(anchor_walks):
+    join = stalg.Rel(
+        join=stalg.JoinRel(
+            left=stalg.Rel(read=stalg.ReadRel(common=stalg.RelCommon(rel_anchor=1))),
+            right=stalg.Rel(read=stalg.ReadRel(common=stalg.RelCommon(rel_anchor=2))),
+            type=stalg.JoinRel.JOIN_TYPE_INNER,
+        )
+    )
+    join.join.left.read.MergeFrom(read_rel.read)
+    join.join.right.read.MergeFrom(right_read_rel.read)
+    project = stalg.Rel(
+        project=stalg.ProjectRel(
+            input=join,
+            expressions=[_outer_rel_reference(1, 2), _outer_rel_reference(2, 1)],
+        )
+    )
+    plan = stp.Plan(relations=[stp.PlanRel(root=stalg.RelRoot(input=project))])
+    schema = infer_plan_schema(plan)
+    assert list(schema.struct.types)[-2:] == [struct.types[2], right_struct.types[1]]
+    assert anchor_walks == [plan]
+
+
+# Deeper than any recursion limit: built in place, as protobuf cannot copy it.
+DEEP = 100_000
+
+
+def test_infer_plan_schema_of_very_deep_plan(deep_call):
+    plan = stp.Plan()
+    root = plan.relations.add().root
+    root.names.extend(named_struct.names)
+    rel = root.input
+    for i in range(DEEP):
+        if i % 2:
+            rel.fetch.count_expr.literal.i64 = 10
+            rel = rel.fetch.input
+        else:
+            rel.filter.condition.literal.boolean = True
+            rel = rel.filter.input
+    rel.CopyFrom(read_rel)
+    schema = deep_call(infer_plan_schema, plan)
+    assert schema.struct == struct
+
+
+def test_infer_rel_schema_of_very_deep_lateral_join_right_input(deep_call):
+    rel = stalg.Rel()
+    lateral_join = rel.lateral_join
+    lateral_join.common.rel_anchor = 7
+    lateral_join.left.CopyFrom(read_rel)
+    right = lateral_join.right
+    for _ in range(DEEP):
+        right.filter.condition.literal.boolean = True
+        right = right.filter.input
+    right.project.input.CopyFrom(right_read_rel)
+    right.project.expressions.append(_outer_rel_reference(7, 2))
+    schema = deep_call(infer_rel_schema, rel)
+    assert list(schema.types) == list(struct.types) + list(right_struct.types) + [
+        struct.types[2]
+    ]
+
+
+def test_failed_inference_restores_the_anchor_scope():
+    rel = stalg.Rel()
+    lateral_join = rel.lateral_join
+    lateral_join.common.rel_anchor = 7
+    lateral_join.left.CopyFrom(read_rel)
+    lateral_join.right.project.input.CopyFrom(right_read_rel)
+    lateral_join.right.project.expressions.append(_outer_rel_reference(99, 0))
+    with pytest.raises(Exception, match="unknown rel_anchor 99"):
+        infer_rel_schema(rel)
+    assert type_inference.anchor_scope.get() is None
+
+
+def test_infer_expression_type_of_very_deep_case_ladder(deep_call):
+    expression = stalg.Expression()
+    current = expression
+    for _ in range(DEEP):
+        clause = current.if_then.ifs.add()
+        getattr(clause, "if").literal.boolean = True
+        getattr(current.if_then, "else").literal.i64 = 0
+        current = clause.then
+    current.selection.root_reference.SetInParent()
+    current.selection.direct_reference.struct_field.field = 2
+    inferred = deep_call(infer_expression_type, expression, struct)
+    assert inferred == struct.types[2]
@@ -0,0 +1,111 @@
+import itertools
+
+import pytest
+import substrait.type_pb2 as stt
+
+from substrait.builders.type import (
+    decimal,
+    fixed_char,
+    i8,
+    i32,
+    precision_timestamp,
+    string,
+    struct,
+    var_char,
+)
+from substrait.builders.type import list as list_
+from substrait.builders.type import map as map_
+from substrait.derivation_expression import parse
+from substrait.extension_registry import covers, types_equal
+from substrait.extension_registry.registry import signature_fingerprint
+from substrait.utils.type_key import TypeKey, keys_equal, struct_key, type_key
+
+TYPES = [
+    stt.Type(),
+    i8(nullable=False),
+    i8(nullable=True),
+    stt.Type(i8=stt.Type.I8(nullability=stt.Type.NULLABILITY_REQUIRED)),
+    stt.Type(i8=stt.Type.I8(type_variation_reference=1)),
+    i32(nullable=False),
+    string(nullable=False),
+    decimal(2, 10, nullable=False),
+    decimal(10, 2, nullable=False),
+    decimal(2, 10, nullable=True),
+    var_char(5, nullable=False),
+    fixed_char(5, nullable=False),
+    precision_timestamp(6, nullable=False),
+    stt.Type(interval_day=stt.Type.IntervalDay()),
+    stt.Type(interval_day=stt.Type.IntervalDay(precision=0)),
+    list_(i32(nullable=False), nullable=False),
+    list_(i32(nullable=True), nullable=False),
+    map_(string(nullable=False), i32(nullable=False), nullable=False),
+    map_(i32(nullable=False), string(nullable=False), nullable=False),
+    struct([i8(nullable=False), i32(nullable=False)], nullable=False),
+    struct([i32(nullable=False), i8(nullable=False)], nullable=False),
+    struct([], nullable=False),
+    stt.Type(user_defined=stt.Type.UserDefined(type_reference=3)),
+    stt.Type(
+        user_defined=stt.Type.UserDefined(
+            type_reference=3,
+            type_parameters=[stt.Type.Parameter(data_type=i8(nullable=False))],
+        )
+    ),
+]
+
+
+def test_keys_are_equal_exactly_when_types_are():
+    for a, b in itertools.product(TYPES, repeat=2):
+        assert (type_key(a) == type_key(b)) == (a == b), (a, b)
+
+
+def test_keys_are_hashable_tuples():
+    distinct = {t.SerializeToString(deterministic=True) for t in TYPES}
+    assert len({type_key(t) for t in TYPES}) == len(distinct)
+    key = type_key(list_(i32(nullable=False), nullable=True))
+    assert isinstance(key, tuple)
+    assert key == TypeKey(
+        "list",
+        (("type", TypeKey("i32", (), stt.Type.NULLABILITY_REQUIRED, 0)),),
+        stt.Type.NULLABILITY_NULLABLE,
+        0,
+    )
+
+
+def test_ignoring_nullability_only_affects_the_top_level():
+    assert keys_equal(type_key(i8(nullable=False)), type_key(i8(nullable=True)))
+    assert not keys_equal(
+        type_key(i8(nullable=False)), type_key(i8(nullable=True)), True
+    )
+    assert not keys_equal(
+        type_key(list_(i8(nullable=False), nullable=False)),
+        type_key(list_(i8(nullable=True), nullable=False)),
+    )
+    assert types_equal(
+        list_(i8(nullable=False), nullable=False),
+        list_(i8(nullable=False), nullable=True),
+    )
+
+
+def test_struct_key_matches_the_struct_type_key():
+    schema = struct([i8(nullable=False), string(nullable=True)], nullable=False)
+    assert struct_key(schema.struct) == type_key(schema)
+
+
+def test_signature_fingerprint_uses_type_keys():
+    assert signature_fingerprint([i8(nullable=False), "option"]) == (
+        type_key(i8(nullable=False)),
+        "option",
+    )
+    assert signature_fingerprint([i8(nullable=False)]) != signature_fingerprint(
+        [i8(nullable=True)]
+    )
+    assert signature_fingerprint([True]) is None
+
+
+@pytest.mark.parametrize("check_nullability", [False, True])
+def test_covers_accepts_a_precomputed_key(check_nullability):
+    covered = i8(nullable=True)
+    for covering in (parse("i8"), parse("i8?"), parse("i16")):
+        assert covers(
+            covered, covering, {}, check_nullability, type_key(covered)
+        ) == covers(covered, covering, {}, check_nullability)
@@ -488,3 +488,36 @@ def test_convert_is_idempotent():
     once = to_id_based_outer_references(plan)
     twice = to_id_based_outer_references(once)
     assert twice == once
+
+
+# Deeper than any recursion limit: built in place, as protobuf cannot copy it.
+DEEP = 100_000
+
+
+def test_iter_plan_rels_walks_very_deep_plans(deep_call):
+    plan = _plan(stalg.Rel())
+    rel = plan.relations[-1].root.input
+    for _ in range(DEEP):
+        rel.filter.condition.literal.boolean = True
+        rel = rel.filter.input
+    rel.CopyFrom(_read("t"))
+    kinds = deep_call(lambda: [r.WhichOneof("rel_type") for r in iter_plan_rels(plan)])
+    assert kinds == ["filter"] * DEEP + ["read"]
+
+
+def test_very_deep_expressions_are_walked_for_subqueries(deep_call):
+    plan = _plan(_filter(_read("o"), stalg.Expression()))
+    condition = plan.relations[-1].root.input.filter.condition
+    for _ in range(DEEP):
+        function = condition.scalar_function
+        function.arguments.add().value.literal.boolean = True
+        condition = function.arguments.add().value
+    condition.CopyFrom(_exists(_read("i")))
+    walked = deep_call(
+        lambda: [
+            (r.WhichOneof("rel_type"), list(r.read.named_table.names))
+            for r in iter_plan_rels(plan)
+        ]
+    )
+    assert walked == [("filter", []), ("read", ["o"]), ("read", ["i"])]
+    assert deep_call(to_id_based_outer_references, plan) is plan